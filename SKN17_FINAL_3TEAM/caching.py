@@ -0,0 +1,148 @@
+"""
+공용 캐시 헬퍼
+
+- 공유 캐시(settings.CACHES['default'], 운영은 Redis)를 모든 gunicorn 워커/컨테이너가 같이 쓴다.
+- get_version / bump_version: 네임스페이스 버전 스탬프. 버전을 바꾸면 해당 네임스페이스 키 전체가 무효화된다.
+- TieredCache: 프로세스 로컬 LRU(짧은 TTL) + 공유 캐시 2단 구성
+  * 로컬 LRU 히트는 네트워크 왕복 없이 반환 (값은 읽기 전용으로 취급해야 한다)
+  * 공유 캐시 미스 시 cache.add 락으로 한 곳에서만 다시 계산 (캐시 스탬피드 방지)
+"""
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from django.core.cache import cache
+
+_MISSING = object()
+VERSION_KEY = "{}:version"
+LOCK_WAIT_INTERVAL = 0.05
+
+
+def get_version(namespace):
+    """네임스페이스 버전 스탬프 조회 (없으면 새로 발급)"""
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """네임스페이스 버전 갱신 -> 이전 버전으로 저장된 키는 모두 무시된다."""
+    cache.set(VERSION_KEY.format(namespace), uuid.uuid4().hex, timeout=None)
+
+
+class _LocalLRU:
+    """프로세스 로컬 LRU (스레드 안전, 항목별 만료 시각)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    namespace: 키 접두사 (versioned=True 이면 버전 스탬프 포함)
+    timeout: 공유 캐시 TTL(초)
+    local_ttl: 로컬 LRU TTL(초). 다른 워커의 무효화가 이 시간만큼 늦게 반영될 수 있다. 0이면 로컬 캐시 사용 안 함
+    """
+
+    def __init__(self, namespace, timeout, local_ttl=5, local_maxsize=256, versioned=True,
+                 lock_timeout=30, lock_wait=5):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local_ttl = local_ttl
+        self.versioned = versioned
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self._local = _LocalLRU(local_maxsize)
+        self._version = (0.0, None)  # (확인 시각, 버전) - 로컬 TTL 동안 공유 캐시 조회 생략
+
+    def _current_version(self):
+        checked_at, version = self._version
+        if version is None or time.monotonic() - checked_at > self.local_ttl:
+            version = get_version(self.namespace)
+            self._version = (time.monotonic(), version)
+        return version
+
+    def _full_key(self, key):
+        if self.versioned:
+            return f"{self.namespace}:{self._current_version()}:{key}"
+        return f"{self.namespace}:{key}"
+
+    def get_or_set(self, key, builder, timeout=None):
+        """캐시된 값을 반환하고, 없으면 builder()로 계산해서 저장"""
+        full_key = self._full_key(key)
+        timeout = self.timeout if timeout is None else timeout
+
+        if self.local_ttl:
+            value = self._local.get(full_key)
+            if value is not _MISSING:
+                return value
+
+        value = cache.get(full_key, _MISSING)
+        if value is _MISSING:
+            value = self._build(full_key, builder, timeout)
+
+        if self.local_ttl:
+            self._local.set(full_key, value, min(self.local_ttl, timeout) if timeout else self.local_ttl)
+        return value
+
+    def _build(self, full_key, builder, timeout):
+        lock_key = f"{full_key}:lock"
+        if cache.add(lock_key, 1, timeout=self.lock_timeout):
+            try:
+                value = builder()
+                cache.set(full_key, value, timeout=timeout)
+                return value
+            finally:
+                cache.delete(lock_key)
+
+        # 다른 워커가 계산 중이면 결과가 저장될 때까지 잠시 대기, 시간 초과 시 직접 계산
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_WAIT_INTERVAL)
+            value = cache.get(full_key, _MISSING)
+            if value is not _MISSING:
+                return value
+        return builder()
+
+    def delete(self, key):
+        full_key = self._full_key(key)
+        self._local.delete(full_key)
+        cache.delete(full_key)
+
+    def invalidate(self):
+        """네임스페이스 전체 무효화 (versioned 전용)"""
+        bump_version(self.namespace)
+        self._version = (0.0, None)
+        self._local.clear()
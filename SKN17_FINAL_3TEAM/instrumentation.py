@@ -0,0 +1,287 @@
+"""
+요청 단위 계측 (쿼리 수 / DB 시간 / 외부 HTTP 시간 / 전체 지연 시간)
+
+- RequestMetricsMiddleware: 요청마다 측정해서 Server-Timing 헤더로 내려주고 URL 이름별로 집계
+- external_call('kakao' | 'runpod' | 's3' | 'smtp'): 외부 API 호출 구간을 감싸서 시간 측정
+- metrics_view: 모든 워커의 집계 결과를 합산해서 Prometheus 텍스트 포맷으로 노출 (/metrics)
+- VIEW_QUERY_BUDGETS: URL 이름별 쿼리 수 상한. 초과 시 경고 로그, QUERY_BUDGET_STRICT 이면 예외 (테스트용)
+
+집계는 프로세스(gunicorn 워커) 단위로 하고, 각 워커가 METRICS_FLUSH_INTERVAL 마다 METRICS_DIR/<pid>.json 에 기록한다.
+/metrics 는 어느 워커가 받든 디렉터리의 파일을 모두 더해서 응답한다. (종료된 워커의 파일도 남겨서 카운터가 줄어들지 않게 한다)
+디렉터리는 gunicorn 시작 시 비운다. (gunicorn.conf.py)
+"""
+import os
+import json
+import time
+import logging
+import threading
+import contextlib
+from contextvars import ContextVar
+from collections import defaultdict
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """뷰의 쿼리 수가 VIEW_QUERY_BUDGETS 상한을 넘은 경우 (QUERY_BUDGET_STRICT 일 때만 발생)"""
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_time', 'external')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.external = defaultdict(float)  # 서비스명 -> 누적 시간(초)
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def external_call(service):
+    """외부 HTTP 호출 시간 측정. 요청 밖(워커 등)에서는 프로세스 누적값에만 반영된다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.external[service] += elapsed
+        registry.observe_external(service, elapsed)
+
+
+class MetricsRegistry:
+    """URL 이름별 누적 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)             # (view, method, status)
+        self._latency_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self._latency_sum = defaultdict(float)
+        self._latency_count = defaultdict(int)
+        self._queries = defaultdict(int)
+        self._db_time = defaultdict(float)
+        self._view_external = defaultdict(float)      # (view, service)
+        self._external_calls = defaultdict(int)
+        self._external_time = defaultdict(float)
+        self._external_errors = defaultdict(int)      # (service, reason)
+        self._budget_exceeded = defaultdict(int)
+
+    def observe_request(self, view, method, status, elapsed, metrics, over_budget):
+        with self._lock:
+            self._requests[(view, method, status)] += 1
+            buckets = self._latency_buckets[view]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    buckets[i] += 1
+            self._latency_sum[view] += elapsed
+            self._latency_count[view] += 1
+            self._queries[view] += metrics.queries
+            self._db_time[view] += metrics.db_time
+            for service, seconds in metrics.external.items():
+                self._view_external[(view, service)] += seconds
+            if over_budget:
+                self._budget_exceeded[view] += 1
+
+    def observe_external(self, service, elapsed):
+        with self._lock:
+            self._external_calls[service] += 1
+            self._external_time[service] += elapsed
+
+    def observe_external_error(self, service, reason):
+        with self._lock:
+            self._external_errors[(service, reason)] += 1
+
+    # 파일 기록용 (필드명, 키가 튜플인지)
+    _FIELDS = (
+        ('_requests', True), ('_latency_buckets', False), ('_latency_sum', False), ('_latency_count', False),
+        ('_queries', False), ('_db_time', False), ('_view_external', True), ('_external_calls', False),
+        ('_external_time', False), ('_external_errors', True), ('_budget_exceeded', False),
+    )
+
+    def snapshot(self):
+        """JSON으로 저장할 수 있는 누적값 {필드명: [[키, 값], ...]}"""
+        with self._lock:
+            return {
+                field: [[list(key) if is_tuple else key, value] for key, value in getattr(self, field).items()]
+                for field, is_tuple in self._FIELDS
+            }
+
+    def merge(self, snapshot):
+        """다른 워커의 누적값을 더한다."""
+        with self._lock:
+            for field, is_tuple in self._FIELDS:
+                data = getattr(self, field)
+                for key, value in snapshot.get(field, []):
+                    key = tuple(key) if is_tuple else key
+                    if isinstance(value, list):
+                        data[key] = [a + b for a, b in zip(data[key], value)]
+                    else:
+                        data[key] += value
+
+    def render(self):
+        """Prometheus 텍스트 포맷"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_str = ','.join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f'{name}{{{label_str}}} {value}')
+
+        with self._lock:
+            metric('http_requests_total', 'counter', '처리한 요청 수', [
+                ((('view', v), ('method', m), ('status', s)), n) for (v, m, s), n in self._requests.items()
+            ])
+
+            lines.append('# HELP http_request_duration_seconds 요청 처리 시간(초)')
+            lines.append('# TYPE http_request_duration_seconds histogram')
+            for view, buckets in self._latency_buckets.items():
+                for bound, n in zip(LATENCY_BUCKETS, buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {n}')
+                count = self._latency_count[view]
+                lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {count}')
+                lines.append(f'http_request_duration_seconds_sum{{view="{view}"}} {round(self._latency_sum[view], 6)}')
+                lines.append(f'http_request_duration_seconds_count{{view="{view}"}} {count}')
+
+            metric('db_queries_total', 'counter', '뷰에서 실행한 SQL 쿼리 수', [
+                ((('view', v),), n) for v, n in self._queries.items()
+            ])
+            metric('db_duration_seconds_total', 'counter', '뷰에서 SQL 실행에 쓴 시간(초)', [
+                ((('view', v),), round(t, 6)) for v, t in self._db_time.items()
+            ])
+            metric('view_external_http_seconds_total', 'counter', '뷰에서 외부 HTTP 호출에 쓴 시간(초)', [
+                ((('view', v), ('service', s)), round(t, 6)) for (v, s), t in self._view_external.items()
+            ])
+            metric('external_http_requests_total', 'counter', '외부 HTTP 호출 수', [
+                ((('service', s),), n) for s, n in self._external_calls.items()
+            ])
+            metric('external_http_seconds_total', 'counter', '외부 HTTP 호출 시간 합계(초)', [
+                ((('service', s),), round(t, 6)) for s, t in self._external_time.items()
+            ])
+            metric('external_http_errors_total', 'counter', '외부 HTTP 호출 실패 수 (timeout / connect / http_5xx / circuit_open)', [
+                ((('service', s), ('reason', r)), n) for (s, r), n in self._external_errors.items()
+            ])
+            metric('query_budget_exceeded_total', 'counter', '쿼리 수 상한을 넘은 요청 수', [
+                ((('view', v),), n) for v, n in self._budget_exceeded.items()
+            ])
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+_last_flush = 0.0
+
+
+def flush_metrics(force=False):
+    """이 워커의 누적값을 METRICS_DIR/<pid>.json 에 기록 (METRICS_FLUSH_INTERVAL 마다, 임시 파일 교체로 원자적으로)"""
+    global _last_flush
+    now = time.monotonic()
+    if not force and now - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    _last_flush = now
+    try:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = os.path.join(settings.METRICS_DIR, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ 지표 파일 기록 실패: {e}")
+
+
+def collect_metrics():
+    """모든 워커(종료된 워커 포함)의 누적값을 합산한 레지스트리"""
+    flush_metrics(force=True)
+    total = MetricsRegistry()
+    try:
+        names = os.listdir(settings.METRICS_DIR)
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(settings.METRICS_DIR, name)) as f:
+                total.merge(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 지표 파일 읽기 실패 ({name}): {e}")
+    return total
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match._func_path
+
+
+def _server_timing(metrics, elapsed):
+    parts = [f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"']
+    for service, seconds in metrics.external.items():
+        parts.append(f'{service};dur={seconds * 1000:.1f}')
+    parts.append(f'total;dur={elapsed * 1000:.1f}')
+    return ', '.join(parts)
+
+
+class RequestMetricsMiddleware:
+    """요청별 쿼리 수/DB 시간/외부 HTTP 시간/전체 지연 시간 측정"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with contextlib.ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        elapsed = time.perf_counter() - started
+        view = _view_name(request)
+        budget = settings.VIEW_QUERY_BUDGETS.get(view)
+        over_budget = budget is not None and metrics.queries > budget
+
+        registry.observe_request(view, request.method, response.status_code, elapsed, metrics, over_budget)
+        flush_metrics()
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = _server_timing(metrics, elapsed)
+
+        if over_budget:
+            message = f"쿼리 수 상한 초과: {view} ({metrics.queries} > {budget}, {request.path})"
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus 수집용 엔드포인트 (METRICS_ALLOWED_IPS 에서만 접근 가능)
+    nginx 를 거치면 REMOTE_ADDR 가 nginx 주소가 되므로 web:8000/metrics 를 직접 수집하고 수집기 주소를 허용 목록에 넣는다.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(collect_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -27,6 +27,11 @@ CSRF_COOKIE_SECURE = False
 SESSION_COOKIE_SAMESITE = "Lax"
 CSRF_COOKIE_SAMESITE = "Lax"
 
+# 세션은 공유 캐시(Redis)에서 읽고 변경 시에만 DB에 함께 저장 (users/sessions.py)
+# 만료 세션 정리: python manage.py purge_sessions
+SESSION_ENGINE = "users.sessions"
+SESSION_SAVE_EVERY_REQUEST = False
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -42,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'SKN17_FINAL_3TEAM.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -49,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.middleware.UserContextMiddleware',
 ]
 
 ROOT_URLCONF = 'SKN17_FINAL_3TEAM.urls'
@@ -73,18 +80,30 @@ TEMPLATES = [
 WSGI_APPLICATION = 'SKN17_FINAL_3TEAM.wsgi.application'
 
 
-# Database
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.mysql",
-        "NAME": os.getenv("DB_NAME"),
-        "USER": os.getenv("DB_USER"),
-        "PASSWORD": os.getenv("DB_PASSWORD"),
-        "HOST": os.getenv("DB_HOST", "127.0.0.1"),
-        "PORT": os.getenv("DB_PORT", "3306"),
-        "OPTIONS": {"charset": "utf8mb4"},
+# Database - DB_NAME이 없으면(로컬 개발/테스트) SQLite 사용
+if os.getenv("DB_NAME"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.mysql",
+            "NAME": os.getenv("DB_NAME"),
+            "USER": os.getenv("DB_USER"),
+            "PASSWORD": os.getenv("DB_PASSWORD"),
+            "HOST": os.getenv("DB_HOST", "127.0.0.1"),
+            "PORT": os.getenv("DB_PORT", "3306"),
+            "OPTIONS": {"charset": "utf8mb4"},
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # 쓰기 트랜잭션을 시작할 때 잠금을 잡아서 동시 요청이 기다렸다가 순서대로 실행되게 한다
+            "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+            # 동시성 테스트의 스레드들이 같은 DB를 쓰도록 테스트 DB도 파일로 만든다 (python manage.py test)
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        }
     }
-}
 
 
 # Password validation
@@ -105,6 +124,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# 비밀번호 해싱 (users.passwords) - 기존 pbkdf2_sha256 해시도 같은 알고리즘 이름이라 이 hasher 하나로 검증/교체된다
+# 반복 횟수는 benchmark_password_hashing 결과를 보고 워커당 목표 로그인 처리량에 맞춰 조절
+PASSWORD_HASHERS = [
+    "users.hashers.TunablePBKDF2PasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -121,16 +147,31 @@ USE_TZ = True
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email
+# 로컬 테스트: python manage.py fake_smtp_server 실행 후 EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
-if not EMAIL_HOST_USER or not EMAIL_HOST_PASSWORD:
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER or "no-reply@bais.local"
+if EMAIL_HOST == "smtp.gmail.com" and (not EMAIL_HOST_USER or not EMAIL_HOST_PASSWORD):
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# 메일 발송 대기열 (users.mailer) - 발송은 run_mail_worker 프로세스가 담당
+AUTH_CODE_TTL = 300                                  # 인증번호 유효시간(초), 이 시간 안에 발송하지 못한 메일은 버린다
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "50"))
+MAIL_POLL_INTERVAL = float(os.getenv("MAIL_POLL_INTERVAL", "1.0"))
+MAIL_LEASE_SECONDS = int(os.getenv("MAIL_LEASE_SECONDS", "60"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BACKOFF = int(os.getenv("MAIL_RETRY_BACKOFF", "5"))
+MAIL_CONNECTION_IDLE_TIMEOUT = int(os.getenv("MAIL_CONNECTION_IDLE_TIMEOUT", "60"))
+MAIL_MIN_INTERVAL = int(os.getenv("MAIL_MIN_INTERVAL", "30"))            # 같은 주소 재요청 최소 간격(초)
+MAIL_RATE_LIMIT_COUNT = int(os.getenv("MAIL_RATE_LIMIT_COUNT", "5"))     # MAIL_RATE_LIMIT_WINDOW 동안 주소당 최대 건수
+MAIL_RATE_LIMIT_WINDOW = int(os.getenv("MAIL_RATE_LIMIT_WINDOW", "3600"))
+MAIL_OUTBOX_RETENTION_DAYS = int(os.getenv("MAIL_OUTBOX_RETENTION_DAYS", "7"))
+
 # --- S3 Uploads (영상 저장소) ---
 USE_S3_UPLOADS = True
 STORAGES = {
@@ -176,10 +217,72 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # RunPod
 RUNPOD_API_URL = os.getenv('RUNPOD_API_URL')
 
+# Cache - 모든 워커/컨테이너가 공유하는 Redis. REDIS_URL이 없으면(로컬 개발/테스트) 프로세스 메모리 캐시 사용
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "bais",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "bais-local",
+        }
+    }
+
+# Upload job queue (python manage.py run_upload_worker)
+UPLOAD_JOB_CONCURRENCY = int(os.getenv("UPLOAD_JOB_CONCURRENCY", "4"))
+UPLOAD_JOB_MAX_IN_FLIGHT = int(os.getenv("UPLOAD_JOB_MAX_IN_FLIGHT", "200"))
+UPLOAD_JOB_LEASE_SECONDS = int(os.getenv("UPLOAD_JOB_LEASE_SECONDS", "120"))
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+UPLOAD_JOB_RETRY_BACKOFF = int(os.getenv("UPLOAD_JOB_RETRY_BACKOFF", "30"))
+
+# 저장공간 예약 / 사용량 정기 점검 (videos.quota) - 점검은 업로드 워커가 STORAGE_RECONCILE_INTERVAL 마다 실행
+STORAGE_RESERVATION_TTL = int(os.getenv("STORAGE_RESERVATION_TTL", str(60 * 60 * 6)))   # 직접 업로드 presigned URL 유효시간과 같게
+STORAGE_RECONCILE_INTERVAL = int(os.getenv("STORAGE_RECONCILE_INTERVAL", "3600"))
+
+# 요청별 유저/구독 정보 캐시 (users.context) - 유저/구독 변경 시 즉시 무효화
+USER_CONTEXT_CACHE_TTL = int(os.getenv("USER_CONTEXT_CACHE_TTL", "30"))
+
+# 요청 계측 (SKN17_FINAL_3TEAM.instrumentation)
+# Server-Timing 헤더에 요청별 쿼리 수/시간이 그대로 노출되므로 운영에서는 기본으로 끈다
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", str(DEBUG)) == "True"
+# /metrics 는 nginx 를 거치지 않고 web:8000/metrics 로 수집 (수집기 주소를 METRICS_ALLOWED_IPS 에 추가)
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1").split(",")
+METRICS_DIR = os.getenv("METRICS_DIR", "/tmp/bais-metrics")        # 워커별 지표 파일 (gunicorn 시작 시 비움)
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False") == "True"  # 테스트에서 True로 설정
+# URL 이름별 쿼리 수 상한
+# 캐시가 비어 있고 구독 상태(SUBSCRIPTION_STATE)를 다시 계산해야 하는 최악의 경우 기준 (SKN17_FINAL_3TEAM/tests.py 에서 확인)
+VIEW_QUERY_BUDGETS = {
+    'videos:home': 12,
+    'videos:get_video_list': 6,
+    'videos:play': 10,
+    'videos:play_user_video': 9,
+    'videos:myvideos': 7,
+    'videos:subtitle_json': 7,
+    'users:setting': 7,
+    'chatbot:chat_api': 3,
+}
+
 
 # Kakaopay
 KAKAO_ADMIN_KEY = os.getenv("KAKAO_ADMIN_KEY", "")
-KAKAO_API_BASE_URL = "https://kapi.kakao.com"
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://kapi.kakao.com")  # 로컬 부하 테스트: fake_kakao_server 주소
+KAKAO_CALLBACK_BASE_URL = os.getenv("KAKAO_CALLBACK_BASE_URL", "http://54.116.12.113:8080")  # approval/cancel/fail URL
+KAKAO_CONNECT_TIMEOUT = float(os.getenv("KAKAO_CONNECT_TIMEOUT", "3"))
+KAKAO_READ_TIMEOUT = float(os.getenv("KAKAO_READ_TIMEOUT", "10"))
+KAKAO_MAX_RETRIES = int(os.getenv("KAKAO_MAX_RETRIES", "2"))
+KAKAO_RETRY_BACKOFF = float(os.getenv("KAKAO_RETRY_BACKOFF", "0.2"))
+KAKAO_POOL_SIZE = int(os.getenv("KAKAO_POOL_SIZE", "10"))
+KAKAO_CIRCUIT_FAILURES = int(os.getenv("KAKAO_CIRCUIT_FAILURES", "5"))   # 연속 실패 횟수
+KAKAO_CIRCUIT_RESET = int(os.getenv("KAKAO_CIRCUIT_RESET", "30"))        # circuit open 유지 시간(초)
 
 
 # Logging
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from chatbot.models import Chatbot
+from payments.subscription_state import refresh_subscription_state, mark_stale
+from users.tests.fixtures import (
+    TEST_STORAGES, create_codes, create_user, subscribe, create_highlight_versions, create_upload, login, clear_caches,
+)
+from videos.models import SubtitleInfo
+from . import instrumentation
+from .instrumentation import QueryBudgetExceeded, MetricsRegistry, RequestMetrics
+
+
+@override_settings(STORAGES=TEST_STORAGES, QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """VIEW_QUERY_BUDGETS 는 캐시가 비어 있고 구독 상태를 다시 계산하는 최악의 경우에도 넘지 않아야 한다."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.user = create_user()
+        subscribe(cls.user)
+        cls.highlights = create_highlight_versions('LG vs 한화')
+        create_highlight_versions('KT vs NC')
+        create_highlight_versions('K-BASEBALL 평가전', category_id=12)
+        cls.uploads = [create_upload(cls.user, f'직관 {i}') for i in range(3)]
+        Chatbot.objects.create(rule='구독', response='구독 안내')
+
+    def setUp(self):
+        login(self.client, self.user.pk)
+
+    def budgeted_requests(self):
+        """(URL 이름, 요청 함수)"""
+        subtitle_id = SubtitleInfo.objects.filter(video_file=self.highlights[0]).values_list('pk', flat=True).first()
+        return [
+            ('videos:home', lambda: self.client.get('/videos/home')),
+            ('videos:home', lambda: self.client.get('/videos/home', {'q': 'LG'})),
+            ('videos:get_video_list', lambda: self.client.get('/videos/list/', {'type': 'other', 'page': 1})),
+            ('videos:get_video_list', lambda: self.client.get('/videos/list/', {'type': 'my_team', 'cursor': ''})),
+            ('videos:play', lambda: self.client.get(f'/videos/play/{self.highlights[0].pk}/')),
+            ('videos:play_user_video', lambda: self.client.get(f'/videos/play/user/{self.uploads[0].pk}/')),
+            ('videos:myvideos', lambda: self.client.get('/videos/myvideos')),
+            ('videos:subtitle_json', lambda: self.client.get(f'/videos/subtitles/{subtitle_id}.json')),
+            ('users:setting', lambda: self.client.get('/setting')),
+            ('chatbot:chat_api', lambda: self.client.post(
+                '/chatbot/api/chat/', json.dumps({'message': '구독 해지'}), content_type='application/json',
+            )),
+        ]
+
+    def test_every_budget_is_exercised(self):
+        self.assertEqual({name for name, _ in self.budgeted_requests()}, set(settings.VIEW_QUERY_BUDGETS))
+
+    def test_views_within_budget_on_cold_cache(self):
+        for name, request in self.budgeted_requests():
+            with self.subTest(view=name):
+                refresh_subscription_state(self.user.pk)
+                clear_caches()
+                response = request()
+                self.assertEqual(response.status_code, 200)
+
+    def test_views_within_budget_when_subscription_state_is_stale(self):
+        for name, request in self.budgeted_requests():
+            with self.subTest(view=name):
+                refresh_subscription_state(self.user.pk)
+                mark_stale(self.user.pk)
+                clear_caches()
+                response = request()
+                self.assertEqual(response.status_code, 200)
+
+    def test_play_query_count_does_not_grow_with_versions(self):
+        refresh_subscription_state(self.user.pk)
+        clear_caches()
+        with self.assertNumQueries(6):
+            self.client.get(f'/videos/play/{self.highlights[0].pk}/')
+
+        create_highlight_versions('LG vs 한화', commentator_ids=(17, 18, 19, 17, 18))
+        clear_caches()
+        with self.assertNumQueries(6):
+            self.client.get(f'/videos/play/{self.highlights[0].pk}/')
+
+    def test_strict_mode_raises_over_budget(self):
+        with override_settings(VIEW_QUERY_BUDGETS={'videos:myvideos': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/videos/myvideos')
+
+    def test_non_strict_mode_logs_over_budget(self):
+        with override_settings(VIEW_QUERY_BUDGETS={'videos:myvideos': 0}, QUERY_BUDGET_STRICT=False):
+            with self.assertLogs('SKN17_FINAL_3TEAM.instrumentation', 'WARNING') as logs:
+                response = self.client.get('/videos/myvideos')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('videos:myvideos', logs.output[0])
+
+
+class MetricsAggregationTests(SimpleTestCase):
+    """/metrics 는 모든 gunicorn 워커의 지표 파일을 합산한다."""
+
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        override = override_settings(METRICS_DIR=self.metrics_dir, METRICS_ALLOWED_IPS=['127.0.0.1'])
+        override.enable()
+        self.addCleanup(override.disable)
+        # 이 프로세스(다른 테스트)의 지표가 섞이지 않도록 빈 레지스트리로 교체
+        patcher = mock.patch.object(instrumentation, 'registry', MetricsRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_worker(self, pid, status=200):
+        metrics = RequestMetrics()
+        metrics.queries = 3
+        metrics.external['runpod'] = 0.5
+        worker = MetricsRegistry()
+        worker.observe_request('videos:home', 'GET', status, 0.2, metrics, False)
+        with open(os.path.join(self.metrics_dir, f'{pid}.json'), 'w') as f:
+            json.dump(worker.snapshot(), f)
+
+    def test_metrics_sum_all_worker_files(self):
+        self.write_worker(1)
+        self.write_worker(2)
+        self.write_worker(3, status=500)
+
+        total = instrumentation.collect_metrics()
+
+        self.assertEqual(total._requests[('videos:home', 'GET', 200)], 2)
+        self.assertEqual(total._requests[('videos:home', 'GET', 500)], 1)
+        self.assertEqual(total._latency_count['videos:home'], 3)
+        self.assertEqual(total._queries['videos:home'], 9)
+        self.assertEqual(total._view_external[('videos:home', 'runpod')], 1.5)
+
+    def test_metrics_view_renders_without_pid_label(self):
+        self.write_worker(1)
+        self.write_worker(2)
+
+        response = self.client.get('/metrics')
+
+        body = response.content.decode()
+        self.assertIn('http_requests_total{view="videos:home",method="GET",status="200"} 2', body)
+        self.assertNotIn('pid=', body)
+
+    def test_metrics_view_rejects_other_addresses(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, 403)
+
+    def test_server_timing_is_off_by_default(self):
+        self.assertFalse(settings.DEBUG)
+        self.assertFalse(settings.SERVER_TIMING_ENABLED)
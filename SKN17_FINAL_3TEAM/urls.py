@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+from .instrumentation import metrics_view
 
 urlpatterns = [
     path('', include('users.urls')),
@@ -26,6 +27,7 @@ urlpatterns = [
     path('payments/', include('payments.urls')),
     path('videos/', include('videos.urls')),
     path("admin/", admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
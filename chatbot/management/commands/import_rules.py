@@ -1,35 +1,145 @@
 import os
-import pandas as pd
-from django.core.management.base import BaseCommand
+import csv
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from chatbot.models import Chatbot
+from chatbot.services import invalidate_rule_cache
 from django.conf import settings
 
+RULE_MAX_LENGTH = Chatbot._meta.get_field('rule').max_length
+RESPONSE_MAX_LENGTH = Chatbot._meta.get_field('response').max_length
+
+
+def _clean(value):
+    if value is None:
+        return ''
+    value = str(value).strip()
+    return '' if value.lower() == 'nan' else value
+
+
+def iter_xlsx_rows(file_path):
+    """엑셀 파일을 read-only 모드로 한 행씩 읽는다."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [_clean(h) for h in next(rows, [])]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def iter_csv_rows(file_path):
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_jsonl_rows(file_path):
+    with open(file_path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+READERS = {
+    '.xlsx': iter_xlsx_rows,
+    '.csv': iter_csv_rows,
+    '.jsonl': iter_jsonl_rows,
+}
+
+
 class Command(BaseCommand):
-    help = '엑셀 파일에서 챗봇 규칙을 가져와 DB에 저장합니다.'
+    help = '엑셀(CSV/JSONL) 파일에서 챗봇 규칙을 가져와 DB에 일괄 저장합니다.'
 
-    def handle(self, *args, **kwargs):
-        file_path = os.path.join(settings.BASE_DIR, 'static', 'data', 'word_rag.xlsx')
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file', dest='file_path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data', 'word_rag.xlsx'),
+            help='규칙 파일 경로 (.xlsx / .csv / .jsonl)',
+        )
+        parser.add_argument('--upsert', action='store_true', help='이미 있는 규칙의 답변도 파일 기준으로 갱신')
+        parser.add_argument('--prune', action='store_true', help='파일에 없는 규칙은 삭제')
+        parser.add_argument('--dry-run', action='store_true', help='DB에 반영하지 않고 변경 예정 건수만 출력')
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk 쿼리 / 트랜잭션 단위')
+
+    def handle(self, *args, **options):
+        file_path = options['file_path']
+        batch_size = options['batch_size']
 
         if not os.path.exists(file_path):
             self.stdout.write(self.style.ERROR(f'파일을 찾을 수 없습니다: {file_path}'))
             return
 
-        try:
-            df = pd.read_excel(file_path)
-            
-            count = 0
-            for _, row in df.iterrows():
-                rule = str(row['rule']).strip()
-                response = str(row['response']).strip()
-
-                obj, created = Chatbot.objects.get_or_create(
-                    rule=rule,
-                    defaults={'response': response}
-                )
-                if created:
-                    count += 1
-            
-            self.stdout.write(self.style.SUCCESS(f'총 {count}개의 새로운 규칙이 등록되었습니다!'))
-
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'에러 발생: {str(e)}'))
\ No newline at end of file
+        reader = READERS.get(os.path.splitext(file_path)[1].lower())
+        if reader is None:
+            raise CommandError(f'지원하지 않는 파일 형식입니다: {file_path}')
+
+        started = time.perf_counter()
+
+        # 1. 파일 스트리밍 (같은 규칙이 여러 번 나오면 마지막 행 기준)
+        # MySQL 콜레이션과 rule unique 제약이 대소문자를 구분하지 않으므로 casefold 한 값으로 비교한다
+        incoming = {}
+        skipped = 0
+        for row in reader(file_path):
+            rule = _clean(row.get('rule'))
+            response = _clean(row.get('response'))
+            if not rule or not response or len(rule) > RULE_MAX_LENGTH:
+                skipped += 1
+                continue
+            incoming[rule.casefold()] = (rule, response[:RESPONSE_MAX_LENGTH])
+        read_done = time.perf_counter()
+
+        # 2. 기존 규칙과 한 번의 쿼리로 비교
+        existing = {}
+        for pk, rule, response in Chatbot.objects.values_list('pk', 'rule', 'response').order_by('pk').iterator(chunk_size=batch_size):
+            existing.setdefault(rule.casefold(), (pk, rule, response))
+
+        to_create = [Chatbot(rule=rule, response=resp) for key, (rule, resp) in incoming.items() if key not in existing]
+        to_update = []
+        if options['upsert']:
+            # 대소문자만 다른 규칙은 같은 행이므로 표기도 파일 기준으로 맞춘다
+            to_update = [
+                Chatbot(pk=existing[key][0], rule=rule, response=resp)
+                for key, (rule, resp) in incoming.items()
+                if key in existing and existing[key][1:] != (rule, resp)
+            ]
+        to_delete = []
+        if options['prune']:
+            to_delete = [pk for key, (pk, _, _) in existing.items() if key not in incoming]
+        diff_done = time.perf_counter()
+
+        summary = f'신규 {len(to_create)}건 / 수정 {len(to_update)}건 / 삭제 {len(to_delete)}건 / 건너뜀 {skipped}건'
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'[DRY-RUN] {summary}'))
+            self._report_timings(started, read_done, diff_done, diff_done)
+            return
+
+        # 3. 배치 단위 트랜잭션으로 반영
+        for i in range(0, len(to_create), batch_size):
+            with transaction.atomic():
+                Chatbot.objects.bulk_create(to_create[i:i + batch_size])
+        for i in range(0, len(to_update), batch_size):
+            with transaction.atomic():
+                Chatbot.objects.bulk_update(to_update[i:i + batch_size], ['rule', 'response'])
+        for i in range(0, len(to_delete), batch_size):
+            with transaction.atomic():
+                Chatbot.objects.filter(pk__in=to_delete[i:i + batch_size]).delete()
+        write_done = time.perf_counter()
+
+        # bulk 쿼리는 시그널을 발생시키지 않으므로 직접 매처 캐시를 무효화
+        if to_create or to_update or to_delete:
+            invalidate_rule_cache()
+
+        self.stdout.write(self.style.SUCCESS(f'규칙 반영 완료: {summary}'))
+        self._report_timings(started, read_done, diff_done, write_done)
+
+    def _report_timings(self, started, read_done, diff_done, write_done):
+        self.stdout.write(
+            f'소요 시간 - 읽기 {read_done - started:.2f}s, 비교 {diff_done - read_done:.2f}s, '
+            f'저장 {write_done - diff_done:.2f}s, 전체 {write_done - started:.2f}s'
+        )
@@ -0,0 +1,82 @@
+from collections import deque
+
+
+class RuleMatcher:
+    """
+    챗봇 키워드 매칭용 Aho–Corasick 오토마톤
+    모든 규칙을 한 번에 컴파일해 두고, 메시지 길이에 비례하는 시간으로
+    메시지에 포함된 규칙 중 가장 긴 규칙(동일 길이는 먼저 등록된 규칙)을 찾는다.
+    """
+
+    def __init__(self, rules):
+        # rules: (rule, response) 순서쌍의 iterable. 먼저 나온 규칙이 동점 시 우선한다.
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]   # 노드별 (길이, 순번, 응답) - 실패 링크를 따라 도달 가능한 최선의 규칙
+        self._empty = None    # 빈 문자열 규칙은 모든 메시지에 매칭된다
+        self.size = 0
+
+        for order, (rule, response) in enumerate(rules):
+            self._add(rule, order, response)
+        self._build()
+
+    def _add(self, rule, order, response):
+        self.size += 1
+        candidate = (len(rule), order, response)
+
+        if not rule:
+            if self._empty is None:
+                self._empty = candidate
+            return
+
+        node = 0
+        for ch in rule:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = nxt
+
+        if self._best[node] is None:
+            self._best[node] = candidate
+
+    @staticmethod
+    def _better(a, b):
+        """더 긴 규칙, 길이가 같으면 먼저 등록된 규칙을 선택"""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if a[0] != b[0]:
+            return a if a[0] > b[0] else b
+        return a if a[1] < b[1] else b
+
+    def _build(self):
+        # BFS 순서로 실패 링크를 계산하고, 각 노드의 best에 접미사 규칙을 합친다.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._best[child] = self._better(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+
+    def match(self, text):
+        """text에 포함된 최선의 규칙 응답을 반환, 없으면 None"""
+        goto, fail = self._goto, self._fail
+        best = self._empty
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if self._best[node] is not None:
+                best = self._better(best, self._best[node])
+        return best[2] if best else None
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='chatbot',
+            constraint=models.UniqueConstraint(fields=('rule',), name='chatbot_rule_uq'),
+        ),
+    ]
@@ -13,4 +13,7 @@ class Chatbot(models.Model):
 
     class Meta:
         db_table = 'CHATBOT'
-        verbose_name = '챗봇'
\ No newline at end of file
+        verbose_name = '챗봇'
+        constraints = [
+            models.UniqueConstraint(fields=['rule'], name='chatbot_rule_uq'),
+        ]
\ No newline at end of file
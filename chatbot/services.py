@@ -1,17 +1,58 @@
+import threading
+from SKN17_FINAL_3TEAM.caching import get_version, bump_version
 from .models import Chatbot
+from .matcher import RuleMatcher
+
+RULES_NAMESPACE = "chatbot:rules"
+
+_matcher_lock = threading.Lock()
+_compiled = None   # {'version', 'matcher', 'exact'} - 통째로 교체하여 스레드 간 일관성 유지
+
+
+def get_rules_version() -> str:
+    """규칙 버전 스탬프 조회 (없으면 새로 발급)"""
+    return get_version(RULES_NAMESPACE)
+
+
+def invalidate_rule_cache():
+    """규칙 변경 시 버전을 갱신하여 모든 프로세스의 매처를 재빌드하게 함"""
+    bump_version(RULES_NAMESPACE)
+
+
+def _get_matcher():
+    """프로세스 단위로 컴파일된 매처 반환 (버전이 바뀌었을 때만 DB 조회)"""
+    global _compiled
+    version = get_rules_version()
+    state = _compiled
+    if state is not None and state['version'] == version:
+        return state
+
+    with _matcher_lock:
+        state = _compiled
+        if state is not None and state['version'] == version:
+            return state
+
+        rules = list(Chatbot.objects.order_by('pk').values_list('rule', 'response'))
+        exact = {}
+        for rule, response in rules:
+            exact.setdefault(rule.casefold(), response)
+
+        state = {'version': version, 'matcher': RuleMatcher(rules), 'exact': exact}
+        _compiled = state
+        return state
+
 
 def get_chatbot_response(user_msg: str) -> str:
     default_response = "죄송합니다. 제가 답변할 수 없는 내용입니다. 다른 질문을 해주세요."
 
-    exact_match = Chatbot.objects.filter(rule=user_msg).first()
-    if exact_match:
-        return exact_match.response
+    state = _get_matcher()
 
-    rules = Chatbot.objects.all()
-    sorted_rules = sorted(rules, key=lambda x: len(x.rule), reverse=True)
+    exact_match = state['exact'].get(user_msg.casefold())
+    if exact_match is not None:
+        return exact_match
 
-    for r in sorted_rules:
-        if r.rule in user_msg:
-            return r.response
+    response = state['matcher'].match(user_msg)
+    if response is not None:
+        return response
 
-    return default_response
\ No newline at end of file
+    return default_response
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Chatbot
+from .services import invalidate_rule_cache
+
+
+@receiver([post_save, post_delete], sender=Chatbot)
+def chatbot_rules_changed(sender, **kwargs):
+    """규칙 추가/수정/삭제 시 매처 캐시 무효화"""
+    invalidate_rule_cache()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from chatbot.models import Chatbot
+
+
+class ImportRulesTests(TestCase):
+    def import_csv(self, rows, *flags):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as f:
+            f.write('rule,response\n')
+            for rule, response in rows:
+                f.write(f'{rule},{response}\n')
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command('import_rules', '--file', f.name, *flags, stdout=out)
+        return out.getvalue()
+
+    def rules(self):
+        return list(Chatbot.objects.order_by('pk').values_list('rule', 'response'))
+
+    def test_rules_differing_only_in_case_are_the_same_rule(self):
+        Chatbot.objects.create(rule='KBO', response='리그 안내')
+
+        output = self.import_csv([('kbo', '리그 안내'), ('Kbo', '새 안내')])
+
+        self.assertIn('신규 0건', output)
+        self.assertEqual(self.rules(), [('KBO', '리그 안내')])
+
+    def test_upsert_updates_case_variant_in_place(self):
+        Chatbot.objects.create(rule='KBO', response='리그 안내')
+
+        output = self.import_csv([('kbo', '새 안내')], '--upsert')
+
+        self.assertIn('수정 1건', output)
+        self.assertEqual(self.rules(), [('kbo', '새 안내')])
+
+    def test_prune_keeps_case_variant_of_incoming_rule(self):
+        Chatbot.objects.create(rule='KBO', response='리그 안내')
+        Chatbot.objects.create(rule='구독', response='구독 안내')
+
+        output = self.import_csv([('kbo', '리그 안내')], '--prune')
+
+        self.assertIn('삭제 1건', output)
+        self.assertEqual(self.rules(), [('KBO', '리그 안내')])
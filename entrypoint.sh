@@ -1,7 +1,7 @@
 #!/bin/sh
 
 # Apply database migrations
-python manage.py migrate
+python manage.py migrate --fake-initial
 
 # Start Gunicorn server
 gunicorn project4.wsgi:application --bind 0.0.0.0:8000
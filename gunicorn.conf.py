@@ -1,2 +1,10 @@
+import os
+import shutil
+
 bind = "0.0.0.0:8000"
-workers = 3
\ No newline at end of file
+workers = 3
+
+
+def on_starting(server):
+    # 워커별 지표 파일(/metrics 합산 대상)은 이번 실행 것만 남긴다 - settings.METRICS_DIR 과 같은 경로
+    shutil.rmtree(os.getenv("METRICS_DIR", "/tmp/bais-metrics"), ignore_errors=True)
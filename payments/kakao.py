@@ -0,0 +1,178 @@
+"""
+카카오페이 API 클라이언트
+
+- 프로세스당 Session 하나를 재사용 (keep-alive 커넥션 풀, 매 요청 TLS 핸드셰이크 생략)
+- 모든 요청에 connect/read timeout 적용 (KAKAO_CONNECT_TIMEOUT / KAKAO_READ_TIMEOUT)
+- 재시도는 안전한 경우에만 (KAKAO_MAX_RETRIES)
+  * 연결 실패: 요청이 전달되지 않았으므로 ready/approve 모두 재시도
+  * 응답 대기 중 timeout / 5xx: ready만 재시도 (승인되지 않은 tid는 버려지므로 중복돼도 무해)
+    approve는 이미 승인되었을 수 있으므로 재시도하지 않는다
+- CircuitBreaker: 연속 실패가 KAKAO_CIRCUIT_FAILURES 번이면 KAKAO_CIRCUIT_RESET 초 동안 호출하지 않고 바로 실패
+  (성공/실패를 기록하지 않고 빠져나가는 경로가 없어야 half-open 상태가 풀린다)
+- KAKAO_API_BASE_URL 을 fake_kakao_server 주소로 바꾸면 로컬에서 결제 흐름 전체를 부하 테스트할 수 있다
+"""
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from django.conf import settings
+from SKN17_FINAL_3TEAM.instrumentation import external_call, registry
+
+logger = logging.getLogger(__name__)
+
+SERVICE = 'kakao'
+CID = "TCSUBSCRIP"
+
+
+class PaymentGatewayError(ConnectionError):
+    """카카오페이 API 호출 실패 (timeout, 연결 실패, 5xx)"""
+
+
+class GatewayUnavailable(PaymentGatewayError):
+    """circuit이 열려 있어 호출하지 않은 경우"""
+
+
+def _request_not_sent(error):
+    """연결 자체를 맺지 못한 경우 (요청이 전달되지 않았으므로 재시도해도 안전)"""
+    cause = error.args[0] if error.args else None
+    return isinstance(getattr(cause, 'reason', None), NewConnectionError)
+
+
+class CircuitBreaker:
+    """
+    closed -> (연속 실패 failure_threshold 번) -> open -> (reset_timeout 경과) -> half-open
+    half-open 상태에서는 요청 하나만 통과시키고, 성공하면 closed / 실패하면 다시 open
+    상태는 프로세스(gunicorn 워커) 단위로 관리한다.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(f"⚡ 카카오페이 circuit open ({self._failures}회 연속 실패, {self.reset_timeout}초)")
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class KakaoPayClient:
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.KAKAO_POOL_SIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.breaker = CircuitBreaker(settings.KAKAO_CIRCUIT_FAILURES, settings.KAKAO_CIRCUIT_RESET)
+
+    def _headers(self):
+        admin_key = settings.KAKAO_ADMIN_KEY
+        if not admin_key:
+            raise EnvironmentError("Kakao Admin Key가 설정되지 않았습니다.")
+        return {
+            "Authorization": f"KakaoAK {admin_key}",
+            "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
+        }
+
+    def _post(self, path, data, retry_after_send):
+        """
+        POST 후 (status_code, 응답 JSON) 반환. 4xx는 결제 업무 오류이므로 그대로 반환한다.
+        retry_after_send: 요청이 전달된 뒤의 실패(read timeout, 5xx)도 재시도할지 여부
+        """
+        url = f"{settings.KAKAO_API_BASE_URL}{path}"
+        headers = self._headers()
+        timeout = (settings.KAKAO_CONNECT_TIMEOUT, settings.KAKAO_READ_TIMEOUT)
+
+        for attempt in range(settings.KAKAO_MAX_RETRIES + 1):
+            if not self.breaker.allow():
+                registry.observe_external_error(SERVICE, 'circuit_open')
+                raise GatewayUnavailable("결제 서비스에 일시적으로 연결할 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+            retryable = True
+            try:
+                with external_call(SERVICE):
+                    res = self.session.post(url, headers=headers, data=data, timeout=timeout)
+                if res.status_code < 500:
+                    self.breaker.record_success()
+                    return res.status_code, res.json()
+                reason, error = 'http_5xx', f"HTTP {res.status_code}"
+                retryable = retry_after_send
+            except requests.ConnectTimeout as e:
+                reason, error = 'connect', e
+            except requests.Timeout as e:
+                reason, error = 'timeout', e
+                retryable = retry_after_send
+            except requests.ConnectionError as e:
+                reason, error = 'connect', e
+                # 연결이 맺어진 뒤 끊긴 경우는 요청이 전달되었을 수 있다
+                retryable = retry_after_send or _request_not_sent(e)
+            except requests.RequestException as e:
+                # 응답 수신 중 끊김(ChunkedEncodingError), 잘못된 URL, 응답 JSON 파싱 실패 등
+                reason, error = 'request', e
+                retryable = False
+            except BaseException:
+                # 예상하지 못한 예외도 실패로 기록해야 half-open 시험 요청 표시가 풀린다
+                self.breaker.record_failure()
+                raise
+
+            self.breaker.record_failure()
+            registry.observe_external_error(SERVICE, reason)
+            logger.warning(f"⚠️ 카카오페이 {path} 실패 ({attempt + 1}회차, {reason}): {error}")
+            if not retryable or attempt == settings.KAKAO_MAX_RETRIES:
+                raise PaymentGatewayError(f"카카오페이 응답 오류 ({reason})")
+            time.sleep(settings.KAKAO_RETRY_BACKOFF * (2 ** attempt))
+
+    def ready(self, partner_order_id, partner_user_id, item_name, total_amount):
+        """결제 준비 - 응답에 tid, next_redirect_pc_url 포함"""
+        callback = settings.KAKAO_CALLBACK_BASE_URL
+        status, result = self._post("/v1/payment/ready", {
+            "cid": CID,
+            "partner_order_id": partner_order_id,
+            "partner_user_id": partner_user_id,
+            "item_name": item_name,
+            "quantity": "1",
+            "total_amount": str(total_amount),
+            "tax_free_amount": "0",
+            "approval_url": f"{callback}/payments/approve/",
+            "cancel_url": f"{callback}/payments/cancel/",
+            "fail_url": f"{callback}/payments/fail/",
+        }, retry_after_send=True)
+        if 'next_redirect_pc_url' not in result:
+            raise ConnectionError(f"Kakao API Error: {result}")
+        return result
+
+    def approve(self, tid, partner_order_id, partner_user_id, pg_token):
+        """결제 승인 - (status_code, 응답 JSON)"""
+        return self._post("/v1/payment/approve", {
+            "cid": CID,
+            "tid": tid,
+            "partner_order_id": partner_order_id,
+            "partner_user_id": partner_user_id,
+            "pg_token": pg_token,
+        }, retry_after_send=False)
+
+
+kakao_client = KakaoPayClient()
@@ -0,0 +1,118 @@
+import json
+import time
+import uuid
+import random
+import threading
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+
+
+class FakeKakaoState:
+    """ready로 발급한 tid와 승인 여부를 기억하는 가짜 카카오페이 저장소"""
+
+    def __init__(self, latency, fail_rate, hang_rate, hang_seconds):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.payments = {}
+        self.lock = threading.Lock()
+
+    def delay(self):
+        """응답 지연 / 장애 주입. 5xx로 응답해야 하면 True"""
+        if random.random() < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        elif self.latency:
+            time.sleep(random.uniform(self.latency * 0.5, self.latency * 1.5))
+        return random.random() < self.fail_rate
+
+    def ready(self, form):
+        tid = f"T{uuid.uuid4().hex[:19]}"
+        pg_token = uuid.uuid4().hex[:20]
+        with self.lock:
+            self.payments[tid] = {'form': form, 'pg_token': pg_token, 'approved': False}
+        return 200, {
+            'tid': tid,
+            'next_redirect_pc_url': f"{form.get('approval_url')}?pg_token={pg_token}",
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    def approve(self, form):
+        with self.lock:
+            payment = self.payments.get(form.get('tid'))
+            if payment is None or payment['pg_token'] != form.get('pg_token'):
+                return 400, {'code': -780, 'msg': 'approval failure!'}
+            if payment['approved']:
+                return 400, {'code': -702, 'msg': 'payment is already done!'}
+            payment['approved'] = True
+        ready_form = payment['form']
+        return 200, {
+            'aid': f"A{uuid.uuid4().hex[:19]}",
+            'tid': form['tid'],
+            'sid': f"S{uuid.uuid4().hex[:19]}",
+            'partner_order_id': form.get('partner_order_id'),
+            'partner_user_id': form.get('partner_user_id'),
+            'item_name': ready_form.get('item_name'),
+            'amount': {'total': int(ready_form.get('total_amount') or 0)},
+            'approved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+
+def make_handler(state):
+    class FakeKakaoHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive (클라이언트 커넥션 풀 재사용 확인용)
+        disable_nagle_algorithm = True
+
+        def _send(self, code, body):
+            raw = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json;charset=UTF-8')
+            self.send_header('Content-Length', str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+
+            if not (self.headers.get('Authorization') or '').startswith('KakaoAK '):
+                return self._send(401, {'code': -401, 'msg': 'invalid admin key'})
+            if self.path not in ('/v1/payment/ready', '/v1/payment/approve'):
+                return self._send(404, {'code': -404, 'msg': 'not found'})
+            if state.delay():
+                return self._send(500, {'code': -9798, 'msg': 'fake kakao failure'})
+
+            if self.path == '/v1/payment/ready':
+                self._send(*state.ready(form))
+            else:
+                self._send(*state.approve(form))
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeKakaoHandler
+
+
+class Command(BaseCommand):
+    help = ('로컬 테스트용 가짜 카카오페이 서버를 실행합니다. '
+            '(KAKAO_API_BASE_URL=http://127.0.0.1:<port>, KAKAO_CALLBACK_BASE_URL=http://127.0.0.1:8000)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8766)
+        parser.add_argument('--latency', type=float, default=0.05, help='평균 응답 지연(초)')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='500으로 응답할 비율 (0~1)')
+        parser.add_argument('--hang-rate', type=float, default=0.0, help='--hang-seconds 만큼 응답을 지연할 비율 (timeout 확인용)')
+        parser.add_argument('--hang-seconds', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        state = FakeKakaoState(options['latency'], options['fail_rate'], options['hang_rate'], options['hang_seconds'])
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), make_handler(state))
+        server.daemon_threads = True
+        self.stdout.write(self.style.SUCCESS(f"가짜 카카오페이 서버 실행 중: http://127.0.0.1:{options['port']}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
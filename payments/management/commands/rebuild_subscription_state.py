@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import UserInfo
+from users.context import invalidate_user_context
+from payments.subscription_state import compute_states, save_states
+
+
+class Command(BaseCommand):
+    help = '구독 이력/결제 이력으로 모든 유저의 현재 구독 상태(SUBSCRIPTION_STATE)를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 계산/저장할 유저 수')
+        parser.add_argument('--user-id', nargs='*', help='지정한 유저만 다시 계산')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        now = timezone.now()
+        total = 0
+
+        users = UserInfo.objects.order_by('pk')
+        if options['user_id']:
+            users = users.filter(pk__in=options['user_id'])
+
+        last_pk = None
+        while True:
+            batch = users.filter(pk__gt=last_pk) if last_pk is not None else users
+            user_ids = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not user_ids:
+                break
+            last_pk = user_ids[-1]
+
+            with transaction.atomic():
+                save_states(compute_states(user_ids, now))
+            for user_id in user_ids:
+                invalidate_user_context(user_id)
+            total += len(user_ids)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'구독 상태 재계산 완료: {total}명 ({elapsed:.2f}s)'))
@@ -0,0 +1,73 @@
+import time
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from payments import services
+from payments.models import SubscribeHistory, PaymentHistory
+
+
+class Command(BaseCommand):
+    help = ('같은 주문에 대한 결제 승인을 동시에 여러 번 보내서 중복 반영이 없는지 확인합니다. '
+            '(로컬 전용: fake_kakao_server 실행 후 KAKAO_API_BASE_URL 을 그 주소로 지정)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', required=True, help='결제할 테스트 유저 ID')
+        parser.add_argument('--orders', type=int, default=10, help='결제 준비할 주문 수')
+        parser.add_argument('--duplicates', type=int, default=5, help='주문마다 동시에 보낼 승인 요청 수')
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--plan', default='BASIC', choices=['BASIC', 'PREMIUM'])
+        parser.add_argument('--cleanup', action='store_true', help='확인 후 이번에 생성된 구독/청구/결제 이력 삭제')
+
+    def handle(self, *args, **options):
+        user_id = options['user_id']
+        existing_subs = set(SubscribeHistory.objects.filter(user_id=user_id).values_list('pk', flat=True))
+
+        orders = []
+        for _ in range(options['orders']):
+            next_url, session_data = services.prepare_kakao_payment(user_id, options['plan'])
+            pg_token = parse_qs(urlparse(next_url).query).get('pg_token', [None])[0]
+            if not pg_token:
+                raise CommandError('pg_token이 없습니다. KAKAO_API_BASE_URL 이 fake_kakao_server 를 가리키는지 확인하세요.')
+            orders.append((pg_token, session_data))
+
+        def approve(order):
+            try:
+                return services.approve_kakao_payment(*order)[0]
+            finally:
+                close_old_connections()
+
+        # 주문별 중복 요청을 섞어서 동시에 실행
+        requests = [order for order in orders for _ in range(options['duplicates'])]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            results = list(pool.map(approve, requests))
+        elapsed = time.perf_counter() - started
+
+        order_ids = [session_data['partner_order_id'] for _, session_data in orders]
+        per_order = Counter(PaymentHistory.objects.filter(partner_order_id__in=order_ids).values_list('partner_order_id', flat=True))
+        duplicated = {k: v for k, v in per_order.items() if v > 1}
+        missing = [k for k in order_ids if k not in per_order]
+
+        new_subs = list(
+            SubscribeHistory.objects.filter(user_id=user_id).exclude(pk__in=existing_subs).order_by('subscribe_start_dt')
+        )
+        all_subs = list(SubscribeHistory.objects.filter(user_id=user_id).order_by('subscribe_start_dt'))
+        overlaps = sum(
+            1 for prev, cur in zip(all_subs, all_subs[1:])
+            if prev.subscribe_end_dt is None or prev.subscribe_end_dt >= cur.subscribe_start_dt
+        )
+
+        self.stdout.write(
+            f'승인 요청 {len(requests)}건 ({len(orders)}주문 x {options["duplicates"]}) / 성공 응답 {sum(results)}건 / '
+            f'{elapsed:.2f}s ({len(requests) / elapsed:.1f} req/s)'
+        )
+        self.stdout.write(f'결제 이력 {sum(per_order.values())}건 / 새 구독 {len(new_subs)}건 / 구독 기간 겹침 {overlaps}건')
+
+        if options['cleanup']:
+            SubscribeHistory.objects.filter(pk__in=[sub.pk for sub in new_subs]).delete()
+
+        if duplicated or missing or len(new_subs) != len(orders) or overlaps:
+            raise CommandError(f'중복 반영 {len(duplicated)}건 / 누락 {len(missing)}건 / 구독 기간 겹침 {overlaps}건')
+        self.stdout.write(self.style.SUCCESS('중복 반영 없음'))
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+        ('users', '0002_performance_schema'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionState',
+            fields=[
+                ('user', models.OneToOneField(db_column='USER_ID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='subscription_state', serialize=False, to='users.userinfo')),
+                ('has_history', models.BooleanField(db_column='HAS_HISTORY', default=False, help_text='구독 이력 존재 여부 (무료 체험 판단)')),
+                ('cycle_end_dt', models.DateTimeField(blank=True, db_column='CYCLE_END_DT', help_text='현재 결제 주기 종료 (마지막 결제일 + 30일)', null=True)),
+                ('reserved_start_dt', models.DateTimeField(blank=True, db_column='RESERVED_START_DT', null=True)),
+                ('cancel_dt', models.DateTimeField(blank=True, db_column='CANCEL_DT', help_text='해지 예정 시각 (예약 구독이 있으면 예약 구독 기준)', null=True)),
+                ('storage_limit', models.IntegerField(db_column='STORAGE_LIMIT', default=0, help_text='단위: KB')),
+                ('valid_until', models.DateTimeField(blank=True, db_column='VALID_UNTIL', help_text='이 시각 이후 조회하면 다시 계산', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='UPDATED_AT')),
+            ],
+            options={
+                'verbose_name': '현재 구독 상태',
+                'verbose_name_plural': '현재 구독 상태 목록',
+                'db_table': 'SUBSCRIPTION_STATE',
+            },
+        ),
+        migrations.AddField(
+            model_name='paymenthistory',
+            name='partner_order_id',
+            field=models.CharField(blank=True, db_column='PARTNER_ORDER_ID', help_text='결제 준비 시 발급한 주문번호 (승인 중복 처리 방지)', max_length=100, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='paymenthistory',
+            index=models.Index(fields=['invoice', 'payment_date'], name='payment_invoice_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribehistory',
+            index=models.Index(fields=['user', 'subscribe_end_dt', 'subscribe_start_dt'], name='subscribe_user_period_idx'),
+        ),
+        migrations.AddField(
+            model_name='subscriptionstate',
+            name='current_plan',
+            field=models.ForeignKey(blank=True, db_column='CURRENT_PLAN_ID', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='payments.planinfo'),
+        ),
+        migrations.AddField(
+            model_name='subscriptionstate',
+            name='reserved_plan',
+            field=models.ForeignKey(blank=True, db_column='RESERVED_PLAN_ID', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='payments.planinfo'),
+        ),
+    ]
@@ -32,6 +32,9 @@ class SubscribeHistory(models.Model):
         db_table = 'SUBSCRIBE_HISTORY'
         verbose_name = '구독 이력'
         verbose_name_plural = '구독 이력 목록'
+        indexes = [
+            models.Index(fields=['user', 'subscribe_end_dt', 'subscribe_start_dt'], name='subscribe_user_period_idx'),
+        ]
 
 
 class InvoiceInfo(models.Model):
@@ -58,6 +61,7 @@ class PaymentHistory(models.Model):
     payment_id = models.BigAutoField(primary_key=True, db_column='PAYMENT_ID')
     invoice = models.ForeignKey(InvoiceInfo, on_delete=models.CASCADE, db_column='INVOICE_ID')
     transaction_id = models.CharField(max_length=100, db_column='TRANSACTION_ID')
+    partner_order_id = models.CharField(max_length=100, unique=True, null=True, blank=True, db_column='PARTNER_ORDER_ID', help_text="결제 준비 시 발급한 주문번호 (승인 중복 처리 방지)")
     payment_amount = models.BigIntegerField(db_column='PAYMENT_AMOUNT')
     fail_reason = models.CharField(max_length=255, null=True, blank=True, db_column='FAIL_REASON')
     payment_date = models.DateTimeField(db_column='PAYMENT_DATE')
@@ -65,4 +69,39 @@ class PaymentHistory(models.Model):
     class Meta:
         db_table = 'PAYMENT_HISTORY'
         verbose_name = '결제 이력'
-        verbose_name_plural = '결제 이력 목록'
\ No newline at end of file
+        verbose_name_plural = '결제 이력 목록'
+        indexes = [
+            models.Index(fields=['invoice', 'payment_date'], name='payment_invoice_date_idx'),  # 구독별 마지막 결제일
+        ]
+
+class SubscriptionState(models.Model):
+    """
+    15) 현재 구독 상태
+    유저별 이용 중인 플랜 / 결제 주기 / 예약 플랜 / 해지 예정 / 저장공간 한도를 한 행에 모아 둔 비정규화 테이블.
+    원본은 구독 이력(SUBSCRIBE_HISTORY)과 결제 이력(PAYMENT_HISTORY)이며 payments.subscription_state 가 관리한다.
+    - 결제 승인/해지/갱신 트랜잭션 안에서 다시 계산
+    - valid_until(예약 구독 시작, 구독 종료 시각)이 지나면 다음 조회 때 다시 계산
+    - rebuild_subscription_state 명령으로 전체 재계산
+    """
+    user = models.OneToOneField(UserInfo, on_delete=models.CASCADE, primary_key=True, db_column='USER_ID', related_name='subscription_state')
+    has_history = models.BooleanField(default=False, db_column='HAS_HISTORY', help_text="구독 이력 존재 여부 (무료 체험 판단)")
+    current_plan = models.ForeignKey(PlanInfo, on_delete=models.SET_NULL, null=True, blank=True, db_column='CURRENT_PLAN_ID', related_name='+')
+    cycle_end_dt = models.DateTimeField(null=True, blank=True, db_column='CYCLE_END_DT', help_text="현재 결제 주기 종료 (마지막 결제일 + 30일)")
+    reserved_plan = models.ForeignKey(PlanInfo, on_delete=models.SET_NULL, null=True, blank=True, db_column='RESERVED_PLAN_ID', related_name='+')
+    reserved_start_dt = models.DateTimeField(null=True, blank=True, db_column='RESERVED_START_DT')
+    cancel_dt = models.DateTimeField(null=True, blank=True, db_column='CANCEL_DT', help_text="해지 예정 시각 (예약 구독이 있으면 예약 구독 기준)")
+    storage_limit = models.IntegerField(default=0, db_column='STORAGE_LIMIT', help_text="단위: KB")
+    valid_until = models.DateTimeField(null=True, blank=True, db_column='VALID_UNTIL', help_text="이 시각 이후 조회하면 다시 계산")
+    updated_at = models.DateTimeField(auto_now=True, db_column='UPDATED_AT')
+
+    class Meta:
+        db_table = 'SUBSCRIPTION_STATE'
+        verbose_name = '현재 구독 상태'
+        verbose_name_plural = '현재 구독 상태 목록'
+
+    @property
+    def is_canceled(self):
+        return self.cancel_dt is not None
+
+    def is_stale(self, now):
+        return self.valid_until is not None and now >= self.valid_until
@@ -1,10 +1,19 @@
-import requests
+import time
 import uuid
+import logging
 from datetime import timedelta
-from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction, IntegrityError
 from django.utils import timezone
 from django.db.models import Q
 from .models import UserInfo, PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory
+from .kakao import kakao_client, PaymentGatewayError
+from .subscription_state import refresh_subscription_state
+
+logger = logging.getLogger(__name__)
+
+APPROVE_LOCK_TIMEOUT = 30     # 같은 주문 승인 요청 잠금 시간(초) - 카카오 승인 timeout보다 길게
+APPROVE_WAIT_INTERVAL = 0.2
 
 def prepare_kakao_payment(user_id, plan_code):
     """
@@ -21,34 +30,7 @@ def prepare_kakao_payment(user_id, plan_code):
     total_amount = plan_obj.price
     partner_order_id = str(uuid.uuid4())
 
-    admin_key = getattr(settings, 'KAKAO_ADMIN_KEY', None)
-    if not admin_key:
-        raise EnvironmentError("Kakao Admin Key가 설정되지 않았습니다.")
-
-    url = f"{settings.KAKAO_API_BASE_URL}/v1/payment/ready"
-    headers = {
-        "Authorization": f"KakaoAK {admin_key}",
-        "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
-    }
-
-    data = {
-        "cid": "TCSUBSCRIP",
-        "partner_order_id": partner_order_id,
-        "partner_user_id": user_id,
-        "item_name": item_name,
-        "quantity": "1",
-        "total_amount": str(total_amount),
-        "tax_free_amount": "0",
-        "approval_url": "http://54.116.12.113:8080/payments/approve/",
-        "cancel_url": "http://54.116.12.113:8080/payments/cancel/",
-        "fail_url": "http://54.116.12.113:8080/payments/fail/",
-    }
-
-    res = requests.post(url, headers=headers, data=data)
-    result = res.json()
-
-    if 'next_redirect_pc_url' not in result:
-        raise ConnectionError(f"Kakao API Error: {result}")
+    result = kakao_client.ready(partner_order_id, user_id, item_name, total_amount)
 
     session_data = {
         'partner_order_id': partner_order_id,
@@ -61,47 +43,55 @@ def prepare_kakao_payment(user_id, plan_code):
     return result.get('next_redirect_pc_url'), session_data
 
 
-def approve_kakao_payment(pg_token, session_data):
-    """
-    2. 결제 승인 (Approve) 및 DB 업데이트 로직
-    """
-    tid = session_data.get('tid')
-    partner_order_id = session_data.get('partner_order_id')
-    partner_user_id = session_data.get('partner_user_id')
-    plan_id = session_data.get('plan_id')
-    amount = session_data.get('total_amount')
-
-    url = f"{settings.KAKAO_API_BASE_URL}/v1/payment/approve"
-    headers = {
-        "Authorization": f"KakaoAK {settings.KAKAO_ADMIN_KEY}",
-        "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
-    }
-    data = {
-        "cid": "TCSUBSCRIP",
-        "tid": tid,
-        "partner_order_id": partner_order_id,
-        "partner_user_id": partner_user_id,
-        "pg_token": pg_token,
+def _approval_result(payment):
+    """승인 완료 화면에 보여줄 데이터"""
+    subscription = payment.invoice.subscription
+    plan_name_display = "프리미엄" if subscription.plan.plan_name == "PREMIUM" else "베이직"
+    return {
+        'user': subscription.user,
+        'plan_name': f"{plan_name_display} 플랜",
+        'payment_date': timezone.localtime(payment.payment_date).strftime('%Y.%m.%d'),
+        'payment_amount': f"{int(payment.payment_amount):,}원"
     }
 
-    res = requests.post(url, headers=headers, data=data)
-    result = res.json()
 
-    now = timezone.now()
-    is_success = (res.status_code == 200)
-    
-    if not is_success:
-        return False, f"[{result.get('code')}] {result.get('msg')}", None
+def _find_approved_payment(partner_order_id):
+    return PaymentHistory.objects.select_related(
+        'invoice__subscription__plan', 'invoice__subscription__user'
+    ).filter(partner_order_id=partner_order_id).first()
+
+
+def _wait_for_approval(partner_order_id):
+    """같은 주문을 다른 요청이 승인 중이면 끝날 때까지 대기 후 결과 조회"""
+    deadline = time.monotonic() + APPROVE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(APPROVE_WAIT_INTERVAL)
+        payment = _find_approved_payment(partner_order_id)
+        if payment or cache.get(f"kakao_approve_{partner_order_id}") is None:
+            return payment
+    return None
+
+
+def record_approved_payment(partner_user_id, plan_id, amount, partner_order_id, transaction_id, now=None):
+    """
+    승인된 결제를 구독/청구/결제 이력에 반영 (트랜잭션 하나)
+    유저 행을 잠가서 같은 유저의 결제/해지/갱신을 직렬화하고, 주문번호로 중복 반영을 막는다.
+    이미 반영된 주문이면 기존 결제 이력을 반환한다.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        user = UserInfo.objects.select_for_update().get(user_id=partner_user_id)
+
+        existing = _find_approved_payment(partner_order_id)
+        if existing:
+            return existing
 
-    try:
-        user = UserInfo.objects.get(user_id=partner_user_id)
         target_plan = PlanInfo.objects.get(plan_id=plan_id)
-        
-        current_sub = SubscribeHistory.objects.filter(
+        current_sub = SubscribeHistory.objects.select_for_update().filter(
             user=user
         ).filter(
             Q(subscribe_end_dt__isnull=True) | Q(subscribe_end_dt__gte=now)
-        ).order_by('-subscribe_start_dt').first()
+        ).order_by('-subscribe_start_dt', '-pk').first()
 
         new_start_dt = now
 
@@ -111,13 +101,15 @@ def approve_kakao_payment(pg_token, session_data):
             else:
                 last_pay = PaymentHistory.objects.filter(invoice__subscription=current_sub).order_by('-payment_date').first()
                 base_date = last_pay.payment_date if last_pay else current_sub.subscribe_start_dt
+                # 미리 결제한 예약 구독은 결제일이 아니라 시작일부터 30일
+                base_date = max(base_date, current_sub.subscribe_start_dt)
                 cycle_end_date = base_date + timedelta(days=30)
-                
+
                 if cycle_end_date < now:
                     cycle_end_date = now
 
                 current_sub.subscribe_end_dt = cycle_end_date
-                current_sub.save()
+                current_sub.save(update_fields=['subscribe_end_dt'])
 
             new_start_dt = cycle_end_date + timedelta(seconds=1)
 
@@ -127,73 +119,122 @@ def approve_kakao_payment(pg_token, session_data):
             subscribe_start_dt=new_start_dt,
             subscribe_end_dt=None
         )
-        
+
         new_invoice = InvoiceInfo.objects.create(
             subscription=new_sub,
             invoice_amount=amount,
             issue_date=now.date()
         )
 
-        PaymentHistory.objects.create(
+        payment = PaymentHistory.objects.create(
             invoice=new_invoice,
-            transaction_id=result.get('sid'),
+            transaction_id=transaction_id,
+            partner_order_id=partner_order_id,
             payment_amount=amount,
             payment_date=now,
-            fail_reason=None 
+            fail_reason=None
         )
+        refresh_subscription_state(user.user_id, now)
+        return payment
+
+
+def approve_kakao_payment(pg_token, session_data):
+    """
+    2. 결제 승인 (Approve) 및 DB 업데이트 로직
+    새로고침/중복 클릭으로 같은 주문이 여러 번 들어와도 카카오 승인과 DB 반영은 한 번만 수행하고
+    이후 요청에는 처음 결과를 그대로 돌려준다.
+    """
+    tid = session_data.get('tid')
+    partner_order_id = session_data.get('partner_order_id')
+    partner_user_id = session_data.get('partner_user_id')
+    plan_id = session_data.get('plan_id')
+    amount = session_data.get('total_amount')
 
-        plan_name_display = "프리미엄" if target_plan.plan_name == "PREMIUM" else "베이직"
-        
-        return True, {
-            'user': user,
-            'plan_name': f"{plan_name_display} 플랜",
-            'payment_date': now.strftime('%Y.%m.%d'),
-            'payment_amount': f"{int(amount):,}원"
-        }, None
+    payment = _find_approved_payment(partner_order_id)
+    if payment:
+        return True, _approval_result(payment), None
+
+    lock_key = f"kakao_approve_{partner_order_id}"
+    if not cache.add(lock_key, 1, timeout=APPROVE_LOCK_TIMEOUT):
+        payment = _wait_for_approval(partner_order_id)
+        if payment:
+            return True, _approval_result(payment), None
+        return False, "결제 승인이 진행 중입니다. 잠시 후 다시 확인해주세요.", None
+
+    try:
+        try:
+            status_code, result = kakao_client.approve(tid, partner_order_id, partner_user_id, pg_token)
+        except PaymentGatewayError as e:
+            return False, str(e), None
+
+        if status_code != 200:
+            # 이미 승인된 주문(잠금 만료 후 재요청 등)이면 먼저 반영된 결과를 돌려준다
+            payment = _find_approved_payment(partner_order_id)
+            if payment:
+                return True, _approval_result(payment), None
+            return False, f"[{result.get('code')}] {result.get('msg')}", None
+
+        try:
+            payment = record_approved_payment(partner_user_id, plan_id, amount, partner_order_id, result.get('sid'))
+        except IntegrityError:
+            # 잠금 만료 등으로 다른 요청이 먼저 반영한 경우 (주문번호 unique)
+            payment = _find_approved_payment(partner_order_id)
+            if payment is None:
+                raise
+        return True, _approval_result(payment), None
 
     except Exception as e:
+        logger.error(f"❌ 결제 승인 반영 실패 (주문 {partner_order_id}, tid {tid}): {e}")
         return False, None, str(e)
+    finally:
+        cache.delete(lock_key)
 
 
 def cancel_subscription_logic(user_id):
     """ 구독 해지 로직 """
-    user = UserInfo.objects.get(user_id=user_id)
-    target_sub = SubscribeHistory.objects.filter(
-        user=user, 
-        subscribe_end_dt__isnull=True
-    ).order_by('-subscribe_start_dt').first()
+    with transaction.atomic():
+        # 결제 승인과 같은 유저 행 잠금으로 구독 변경을 직렬화
+        user = UserInfo.objects.select_for_update().get(user_id=user_id)
+        target_sub = SubscribeHistory.objects.filter(
+            user=user, 
+            subscribe_end_dt__isnull=True
+        ).order_by('-subscribe_start_dt').first()
     
-    if not target_sub:
-        raise ValueError('해지할 구독 정보가 없습니다.')
+        if not target_sub:
+            raise ValueError('해지할 구독 정보가 없습니다.')
 
-    now = timezone.now()
-    
-    if target_sub.subscribe_start_dt > now:
-        expiration_date = target_sub.subscribe_start_dt + timedelta(days=30)
-    else:
-        last_payment = PaymentHistory.objects.filter(invoice__subscription=target_sub).order_by('-payment_date').first()
-        base_date = last_payment.payment_date if last_payment else target_sub.subscribe_start_dt
-        expiration_date = base_date + timedelta(days=30)
+        now = timezone.now()
     
-    target_sub.subscribe_end_dt = expiration_date
-    target_sub.save()
+        if target_sub.subscribe_start_dt > now:
+            expiration_date = target_sub.subscribe_start_dt + timedelta(days=30)
+        else:
+            last_payment = PaymentHistory.objects.filter(invoice__subscription=target_sub).order_by('-payment_date').first()
+            base_date = last_payment.payment_date if last_payment else target_sub.subscribe_start_dt
+            expiration_date = base_date + timedelta(days=30)
     
+        target_sub.subscribe_end_dt = expiration_date
+        target_sub.save(update_fields=['subscribe_end_dt'])
+        refresh_subscription_state(user_id, now)
+
     return expiration_date.strftime('%Y.%m.%d')
 
 
 def renew_subscription_logic(user_id):
     """ 구독 갱신 로직 """
-    user = UserInfo.objects.get(user_id=user_id)
-    now = timezone.now()
-
-    target_sub = SubscribeHistory.objects.filter(
-        user=user, 
-        subscribe_end_dt__isnull=False, 
-        subscribe_end_dt__gt=now
-    ).last()
+    with transaction.atomic():
+        # 결제 승인과 같은 유저 행 잠금으로 구독 변경을 직렬화
+        user = UserInfo.objects.select_for_update().get(user_id=user_id)
+        now = timezone.now()
+
+        target_sub = SubscribeHistory.objects.filter(
+            user=user, 
+            subscribe_end_dt__isnull=False, 
+            subscribe_end_dt__gt=now
+        ).last()
     
-    if not target_sub:
-        raise ValueError('갱신할 구독 정보가 없습니다.')
+        if not target_sub:
+            raise ValueError('갱신할 구독 정보가 없습니다.')
 
-    target_sub.subscribe_end_dt = None
-    target_sub.save()
\ No newline at end of file
+        target_sub.subscribe_end_dt = None
+        target_sub.save(update_fields=['subscribe_end_dt'])
+        refresh_subscription_state(user_id, now)
@@ -0,0 +1,104 @@
+"""
+현재 구독 상태(SubscriptionState) 계산/저장
+
+구독 이력 + 마지막 결제일로부터 "지금" 기준 상태를 계산해 유저별 한 행에 저장한다.
+화면에서는 UserContext 로 이 행만 읽으므로 구독 이력/결제 이력을 매번 정렬해서 계산하지 않는다.
+
+- refresh_subscription_state: 결제 승인/해지/갱신 트랜잭션 안에서 호출
+- compute_states / save_states: 여러 유저를 한 번에 계산 (rebuild_subscription_state 명령)
+"""
+from datetime import timedelta
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+from .models import SubscribeHistory, PaymentHistory, SubscriptionState
+
+BILLING_CYCLE = timedelta(days=30)
+
+_UPDATE_FIELDS = [
+    'has_history', 'current_plan', 'cycle_end_dt', 'reserved_plan', 'reserved_start_dt',
+    'cancel_dt', 'storage_limit', 'valid_until', 'updated_at',
+]
+
+
+def _is_alive(sub, now):
+    return sub.subscribe_end_dt is None or sub.subscribe_end_dt >= now
+
+
+def current_subscription(subscriptions, now):
+    """현재 이용 중인 구독 (subscriptions: subscribe_start_dt 내림차순)"""
+    for sub in subscriptions:
+        if sub.subscribe_start_dt <= now and _is_alive(sub, now):
+            return sub
+    return None
+
+
+def compute_state(user_id, subscriptions, last_payment_dt, now):
+    """
+    구독 이력(subscribe_start_dt 내림차순, plan 포함)과 현재 구독의 마지막 결제일로 상태 계산 (저장하지 않음)
+    """
+    state = SubscriptionState(user_id=user_id, has_history=bool(subscriptions))
+
+    current = current_subscription(subscriptions, now)
+    future = [sub for sub in subscriptions if sub.subscribe_start_dt > now]
+    future_sub = min(future, key=lambda sub: sub.subscribe_start_dt) if future else None
+
+    if current:
+        state.current_plan = current.plan
+        state.cycle_end_dt = (last_payment_dt or current.subscribe_start_dt) + BILLING_CYCLE
+        if future_sub:
+            state.reserved_plan = future_sub.plan
+            state.reserved_start_dt = future_sub.subscribe_start_dt
+        state.cancel_dt = (future_sub or current).subscribe_end_dt
+
+    # 저장공간 한도는 종료되지 않은 가장 최근 구독(예약 구독 포함) 기준
+    active = next((sub for sub in subscriptions if _is_alive(sub, now)), None)
+    state.storage_limit = active.plan.storage_limit if active else 0
+
+    # 예약 구독이 시작되거나 구독이 끝나는 시각이 지나면 다시 계산해야 한다
+    transitions = [sub.subscribe_start_dt for sub in future] + [
+        sub.subscribe_end_dt for sub in subscriptions if sub.subscribe_end_dt and sub.subscribe_end_dt >= now
+    ]
+    state.valid_until = min(transitions) if transitions else None
+    return state
+
+
+def compute_states(user_ids, now=None):
+    """여러 유저의 상태를 쿼리 2번으로 계산 (구독 이력 + 현재 구독별 마지막 결제일)"""
+    now = now or timezone.now()
+    subscriptions = {user_id: [] for user_id in user_ids}
+    for sub in SubscribeHistory.objects.select_related('plan').filter(user_id__in=user_ids).order_by('-subscribe_start_dt'):
+        subscriptions[sub.user_id].append(sub)
+
+    current_ids = [sub.pk for sub in (current_subscription(subs, now) for subs in subscriptions.values()) if sub]
+    last_payments = dict(
+        PaymentHistory.objects.filter(invoice__subscription_id__in=current_ids)
+        .values('invoice__subscription_id').annotate(last=Max('payment_date'))
+        .values_list('invoice__subscription_id', 'last')
+    ) if current_ids else {}
+
+    states = []
+    for user_id, subs in subscriptions.items():
+        current = current_subscription(subs, now)
+        states.append(compute_state(user_id, subs, last_payments.get(current.pk) if current else None, now))
+    return states
+
+
+def save_states(states):
+    """계산한 상태를 upsert (INSERT ... ON CONFLICT/DUPLICATE KEY UPDATE)"""
+    unique_fields = ['user'] if connection.features.supports_update_conflicts_with_target else None
+    SubscriptionState.objects.bulk_create(
+        states, update_conflicts=True, unique_fields=unique_fields, update_fields=_UPDATE_FIELDS,
+    )
+
+
+def refresh_subscription_state(user_id, now=None):
+    """유저 한 명의 상태를 다시 계산해서 저장 (호출한 쪽의 트랜잭션 안에서 실행된다)"""
+    state = compute_states([user_id], now)[0]
+    save_states([state])
+    return state
+
+
+def mark_stale(user_id):
+    """구독 이력이 결제/해지/갱신 외의 경로(관리자 등)로 바뀐 경우 다음 조회 때 다시 계산하도록 표시"""
+    SubscriptionState.objects.filter(user_id=user_id).update(valid_until=timezone.now())
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from payments import services
+from payments.models import PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory
+from users.tests.fixtures import create_codes, create_user, run_parallel
+
+PARALLEL = 8
+
+
+class ParallelApprovalTests(TransactionTestCase):
+    """
+    동시 승인 요청 (새로고침/중복 클릭, 같은 유저의 연속 결제)
+    SQLite 는 select_for_update 가 없지만 쓰기 트랜잭션(IMMEDIATE)이 직렬화되므로 MySQL 행 잠금과 같은 순서가 보장된다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        create_codes()
+        self.user = create_user()
+        self.plan = PlanInfo.objects.create(plan_id=1, plan_name='BASIC', price=9900, storage_limit=1024)
+
+    def session_data(self, order_id='order-1'):
+        return {
+            'tid': f'T-{order_id}', 'partner_order_id': order_id, 'partner_user_id': self.user.pk,
+            'plan_id': self.plan.pk, 'total_amount': 9900,
+        }
+
+    def test_same_order_is_approved_and_recorded_once(self):
+        approve = mock.Mock(return_value=(200, {'sid': 'S-1'}))
+        with mock.patch.object(services.kakao_client, 'approve', approve):
+            results = run_parallel(lambda i: services.approve_kakao_payment('pg-token', self.session_data()), PARALLEL)
+
+        for success, payload, error in results:
+            self.assertTrue(success, (payload, error))
+            self.assertEqual(payload['plan_name'], '베이직 플랜')
+        approve.assert_called_once()
+        self.assertEqual(PaymentHistory.objects.filter(partner_order_id='order-1').count(), 1)
+        self.assertEqual(SubscribeHistory.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(InvoiceInfo.objects.count(), 1)
+
+    def test_same_order_recorded_once_without_cache_lock(self):
+        """승인 잠금이 만료된 뒤의 재요청: 주문번호 중복 확인만으로 한 번만 반영"""
+        results = run_parallel(lambda i: services.record_approved_payment(
+            self.user.pk, self.plan.pk, 9900, 'order-1', f'S-{i}',
+        ), PARALLEL)
+
+        payment_ids = {payment.pk for payment in results}
+        self.assertEqual(len(payment_ids), 1, results)
+        self.assertEqual(PaymentHistory.objects.count(), 1)
+        self.assertEqual(SubscribeHistory.objects.filter(user=self.user).count(), 1)
+
+    def test_different_orders_chain_subscriptions(self):
+        """같은 유저의 서로 다른 주문: 구독이 30일씩 겹치지 않고 이어지며 진행 중인 구독은 하나"""
+        results = run_parallel(lambda i: services.record_approved_payment(
+            self.user.pk, self.plan.pk, 9900, f'order-{i}', f'S-{i}',
+        ), PARALLEL)
+
+        self.assertFalse([r for r in results if isinstance(r, Exception)], results)
+        self.assertEqual(PaymentHistory.objects.count(), PARALLEL)
+        subs = list(SubscribeHistory.objects.filter(user=self.user).order_by('subscribe_start_dt'))
+        self.assertEqual(len(subs), PARALLEL)
+        self.assertEqual([sub.subscribe_end_dt is None for sub in subs], [False] * (PARALLEL - 1) + [True])
+        for previous, sub in zip(subs, subs[1:]):
+            self.assertGreater(sub.subscribe_start_dt, previous.subscribe_end_dt)
+            self.assertGreaterEqual(previous.subscribe_end_dt - previous.subscribe_start_dt, timedelta(days=30) - timedelta(seconds=1))
@@ -0,0 +1,59 @@
+from unittest import mock
+import requests
+from django.test import SimpleTestCase, override_settings
+from payments.kakao import KakaoPayClient, CircuitBreaker, PaymentGatewayError, GatewayUnavailable
+
+
+def ok_response():
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'tid': 'T-1', 'next_redirect_pc_url': 'http://pay'}
+    return response
+
+
+@override_settings(KAKAO_ADMIN_KEY='test', KAKAO_MAX_RETRIES=0)
+class CircuitBreakerProbeTests(SimpleTestCase):
+    """half-open 시험 요청이 어떤 예외로 끝나도 circuit 이 영구히 닫히지(호출 차단) 않아야 한다."""
+
+    def setUp(self):
+        self.client = KakaoPayClient()
+        self.client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.post = mock.patch.object(self.client.session, 'post').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def open_circuit(self):
+        self.post.side_effect = requests.ConnectTimeout()
+        with self.assertRaises(PaymentGatewayError):
+            self.client.approve('T-1', 'order-1', 'user-1', 'pg')
+        self.assertIsNotNone(self.client.breaker._opened_at)
+
+    def assert_recovers(self):
+        self.assertFalse(self.client.breaker._probing)
+        self.post.side_effect = None
+        self.post.return_value = ok_response()
+        status_code, _ = self.client.approve('T-1', 'order-1', 'user-1', 'pg')
+        self.assertEqual(status_code, 200)
+        self.assertIsNone(self.client.breaker._opened_at)
+
+    def test_probe_failing_with_request_exception_reopens_circuit(self):
+        for error in (requests.exceptions.ChunkedEncodingError(), requests.exceptions.InvalidURL(), requests.RequestException()):
+            with self.subTest(error=type(error).__name__):
+                self.open_circuit()
+                self.post.side_effect = error
+                with self.assertRaises(PaymentGatewayError):
+                    self.client.approve('T-1', 'order-1', 'user-1', 'pg')
+                self.assert_recovers()
+
+    def test_probe_failing_with_unexpected_exception_reopens_circuit(self):
+        self.open_circuit()
+        self.post.side_effect = RuntimeError('boom')
+        with self.assertRaises(RuntimeError):
+            self.client.approve('T-1', 'order-1', 'user-1', 'pg')
+        self.assert_recovers()
+
+    def test_open_circuit_rejects_without_calling(self):
+        self.client.breaker.reset_timeout = 60
+        self.open_circuit()
+        self.post.reset_mock()
+        with self.assertRaises(GatewayUnavailable):
+            self.client.approve('T-1', 'order-1', 'user-1', 'pg')
+        self.post.assert_not_called()
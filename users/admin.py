@@ -1,9 +1,9 @@
-import json
 from django.contrib import admin
 from videos.forms import SubtitleAdminForm
-from users.models import CommonCode, UserInfo
-from videos.models import FileInfo, UserUploadVideo, HighlightVideo, SubtitleInfo
-from payments.models import PlanInfo, SubscribeHistory, PaymentHistory, InvoiceInfo
+from videos import subtitles, subtitle_ingest
+from users.models import CommonCode, UserInfo, EmailOutbox
+from videos.models import FileInfo, UserUploadVideo, HighlightVideo, SubtitleInfo, UploadJob
+from payments.models import PlanInfo, SubscribeHistory, PaymentHistory, InvoiceInfo, SubscriptionState
 
 # [1] 파일 정보 관리 (개별 업로드용)
 @admin.register(FileInfo)
@@ -31,35 +31,8 @@ class SubtitleInfoAdmin(admin.ModelAdmin):
         
         if uploaded_file:
             try:
-                file_content = uploaded_file.read().decode('utf-8')
-                raw_data = json.loads(file_content)
-                
-                processed_data = []
-
-                for item in raw_data:
-                    start = round(float(item.get('set_start_sec', 0)), 2)
-                    end = round(float(item.get('set_end_sec', 0)), 2)
-                    
-                    text_parts = []
-                    if item.get('caster_text'):
-                        text_parts.append(f"{item['caster_text']}")
-                    
-                    if item.get('analyst_text'):
-                        text_parts.append(f"{item['analyst_text']}")
-                    
-                    full_text = " ".join(text_parts)
-
-                    if full_text.strip():
-                        processed_data.append({
-                            "start": start,
-                            "end": end,
-                            "text": full_text
-                        })
-
-                json_string = json.dumps(processed_data, ensure_ascii=False)
-                binary_data = json_string.encode('utf-8')
-
-                obj.subtitle = binary_data
+                obj.subtitle, stats = subtitle_ingest.ingest(uploaded_file)
+                self.message_user(request, f"자막 변환 완료: {stats}")
 
             except Exception as e:
                 print(f"JSON 변환 중 에러 발생: {e}")
@@ -70,10 +43,9 @@ class SubtitleInfoAdmin(admin.ModelAdmin):
         if not obj.subtitle:
             return "데이터 없음"
         try:
-            text_data = obj.subtitle.decode('utf-8')
-            json_data = json.loads(text_data)
-            if json_data:
-                return f"{json_data[0]['text'][:30]}..." 
+            first_text = subtitles.preview(obj.subtitle, 30)
+            if first_text:
+                return f"{first_text}..." 
             return "빈 데이터"
         except:
             return "디코딩 오류"
@@ -82,7 +54,7 @@ class SubtitleInfoAdmin(admin.ModelAdmin):
 
 
 # [4] 나머지 모델들은 반복문으로 등록
-models_to_register = [UserUploadVideo, UserInfo, CommonCode, PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory]
+models_to_register = [UserUploadVideo, UserInfo, CommonCode, PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory, UploadJob, EmailOutbox, SubscriptionState]
 
 for model in models_to_register:
     try:
@@ -0,0 +1,134 @@
+"""
+공통 코드(CommonCode) 레지스트리
+
+공통 코드는 거의 바뀌지 않으므로 프로세스마다 한 번만 전체를 읽어 메모리에 둔다.
+- (그룹, 값) / id 로 조회, 구단 / 상태 / 해설자 / 카테고리 전용 조회 함수 제공
+- 코드가 바뀌면(signals) 공유 캐시의 버전을 갱신하고, 각 프로세스는 CHECK_INTERVAL 마다 버전을 확인해서 다시 읽는다.
+  (상태 변경/구단 조회 때 DB 조회 없음)
+- 반환하는 CommonCode 인스턴스는 모든 요청이 같이 쓰므로 수정하지 않는다.
+"""
+import time
+import threading
+from SKN17_FINAL_3TEAM.caching import get_version, bump_version
+from .models import CommonCode
+
+NAMESPACE = 'users:codes'
+CHECK_INTERVAL = 30
+
+GROUP_FAVORITE = 'FAVORITE'
+GROUP_STATUS = 'STATUS'
+GROUP_COMMENTATOR = 'COMMENTATOR'
+
+# 상태 코드
+STATUS_UPLOADED = 20
+STATUS_PROCESSING = 21
+STATUS_COMPLETED = 22
+STATUS_FAILED = 23
+
+DEFAULT_COMMENTATOR_ID = 17
+
+# 구단 코드 -> 화면 표시 정보 (full: 구단명, mascot: 마스코트, name: 하이라이트 제목 검색어)
+TEAM_META_DATA = {
+    'LG': {'full': 'LG 트윈스', 'mascot': '수타', 'name': 'LG'},
+    'HANWHA': {'full': '한화 이글스', 'mascot': '술이', 'name': '한화'},
+    'SSG': {'full': 'SSG 랜더스', 'mascot': '란디', 'name': 'SSG'},
+    'SAMSUNG': {'full': '삼성 라이온즈', 'mascot': '볼래요', 'name': '삼성'},
+    'NC': {'full': 'NC 다이노스', 'mascot': '반비', 'name': 'NC'},
+    'KT': {'full': 'KT 위즈', 'mascot': '똘이', 'name': 'KT'},
+    'LOTTE': {'full': '롯데 자이언츠', 'mascot': '눌이', 'name': '롯데'},
+    'KIA': {'full': 'KIA 타이거즈', 'mascot': '호거리', 'name': 'KIA'},
+    'DOOSAN': {'full': '두산 베어스', 'mascot': '철', 'name': '두산'},
+    'KIWOOM': {'full': '키움 히어로즈', 'mascot': '턱도리', 'name': '키움'},
+}
+DEFAULT_TEAM_META = {'full': 'KBO 리그', 'mascot': '마스코트'}
+
+
+def team_key(common_code_value):
+    """FAVORITE 코드 값에서 구단 코드만 추출 ('FAVORITE - LG' -> 'LG')"""
+    return common_code_value.replace('FAVORITE - ', '').replace('FAVORITE-', '').strip().upper()
+
+
+def team_meta(key):
+    """구단 코드 -> {'full', 'mascot'} (모르는 코드면 기본값)"""
+    meta = TEAM_META_DATA.get(key)
+    if not meta:
+        return dict(DEFAULT_TEAM_META)
+    return {'full': meta['full'], 'mascot': meta['mascot']}
+
+
+class _Snapshot:
+    """한 시점의 공통 코드 전체 (읽기 전용)"""
+
+    def __init__(self, rows):
+        self.by_id = {code.pk: code for code in rows}
+        self.by_value = {(code.common_code_grp, code.common_code_value): code for code in rows}
+        # 구단 조회는 FAVORITE 그룹만, 같은 구단 코드가 여럿이면 id 가 가장 작은 것 (rows 는 id 순)
+        self.teams = {}
+        for code in rows:
+            if code.common_code_grp != GROUP_FAVORITE:
+                continue
+            key = team_key(code.common_code_value)
+            if key in TEAM_META_DATA:
+                self.teams.setdefault(key, code)
+
+
+class CodeRegistry:
+    def __init__(self, check_interval=CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            version = get_version(NAMESPACE)
+            if self._snapshot is None or version != self._version:
+                self._snapshot = _Snapshot(list(CommonCode.objects.order_by('common_code')))
+                self._version = version
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        """공통 코드 변경 시 호출 - 모든 프로세스가 다음 확인 때 다시 읽는다."""
+        bump_version(NAMESPACE)
+        with self._lock:
+            self._snapshot = None
+
+    def get(self, code_id):
+        return self._load().by_id.get(code_id)
+
+    def find(self, group, value):
+        return self._load().by_value.get((group, value))
+
+    def in_group(self, code_id, group):
+        code = self.get(code_id)
+        return code if code and code.common_code_grp == group else None
+
+    def status(self, code_id):
+        return self.in_group(code_id, GROUP_STATUS)
+
+    def commentator(self, name):
+        return self.find(GROUP_COMMENTATOR, name)
+
+    def commentator_by_id(self, code_id):
+        return self.in_group(code_id, GROUP_COMMENTATOR)
+
+    def category(self, code_id):
+        return self.get(code_id)
+
+    def team(self, key):
+        """구단 코드('LG', 'HANWHA' ...) -> FAVORITE 공통 코드 (없으면 None)"""
+        if not key:
+            return None
+        return self._load().teams.get(key.strip().upper())
+
+
+codes = CodeRegistry()
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.utils import timezone
+from SKN17_FINAL_3TEAM.caching import TieredCache
+from .models import UserInfo
+from .codes import team_key
+from payments.models import SubscriptionState
+from payments.subscription_state import refresh_subscription_state
+
+# 결제 직후 다른 워커에서 이전 구독 상태가 보이면 안 되므로 로컬 캐시 없이 공유 캐시만 사용
+_user_context_cache = TieredCache('users:context', timeout=30, local_ttl=0, versioned=False)
+
+
+class UserContext:
+    """
+    로그인 유저 정보 + 현재 구독 상태(payments.SubscriptionState)
+    화면마다 반복되던 UserInfo / favorite_code / 구독 이력 조회를 유저 행 하나(JOIN)로 모아 둔다.
+    user 는 password 를 뺀(defer) 인스턴스이므로 비밀번호 확인에는 쓰지 않는다.
+    """
+
+    def __init__(self, user, subscription_state):
+        self.user = user
+        self.subscription_state = subscription_state
+
+    @property
+    def user_id(self):
+        return self.user.user_id
+
+    @property
+    def has_history(self):
+        return self.subscription_state.has_history
+
+    @property
+    def storage_limit_bytes(self):
+        return self.subscription_state.storage_limit * 1024
+
+    @property
+    def team_code(self):
+        """FAVORITE 코드에서 구단 코드만 추출 (없으면 None)"""
+        if not self.user.favorite_code:
+            return None
+        return team_key(self.user.favorite_code.common_code_value)
+
+
+def _build_user_context(user_id):
+    # 컨텍스트는 모든 워커가 읽는 공유 캐시에 저장되므로 비밀번호 해시는 읽지 않는다
+    # (비밀번호 확인/변경은 users.services 에서 유저를 따로 조회)
+    user = UserInfo.objects.select_related(
+        'favorite_code', 'subscription_state__current_plan', 'subscription_state__reserved_plan'
+    ).defer('password').get(user_id=user_id)
+    try:
+        state = user.subscription_state
+    except SubscriptionState.DoesNotExist:
+        state = refresh_subscription_state(user_id)
+    return UserContext(user, state)
+
+
+def load_user_context(user_id):
+    """
+    UserContext 조회 (유저별 짧은 TTL 캐시)
+    캐시가 없으면 쿼리 1번: 유저 + 선호 구단 코드 + 현재 구독 상태(+플랜)
+    예약 구독 시작/구독 종료 시각이 지난 상태면 다시 계산해서 저장한다.
+    """
+    timeout = settings.USER_CONTEXT_CACHE_TTL
+    ctx = _user_context_cache.get_or_set(user_id, lambda: _build_user_context(user_id), timeout=timeout)
+    if ctx.subscription_state.is_stale(timezone.now()):
+        refresh_subscription_state(user_id)
+        _user_context_cache.delete(user_id)
+        ctx = _user_context_cache.get_or_set(user_id, lambda: _build_user_context(user_id), timeout=timeout)
+    return ctx
+
+
+def invalidate_user_context(user_id):
+    _user_context_cache.delete(user_id)
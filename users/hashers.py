@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    반복 횟수를 settings.PASSWORD_PBKDF2_ITERATIONS 로 조절하는 PBKDF2-SHA256
+    알고리즘 이름은 기본 hasher와 같으므로 반복 횟수를 바꾸면 다음 로그인 때 새 값으로 다시 해싱된다.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
@@ -0,0 +1,260 @@
+"""
+메일 발송 대기열 (EmailOutbox)
+
+- enqueue_email: 요청 처리 중에는 대기열에 저장만 하고 바로 반환 (SMTP 왕복 없음)
+  * 주소별 발송 제한: 재요청 최소 간격(MAIL_MIN_INTERVAL) + 구간당 최대 건수(MAIL_RATE_LIMIT_COUNT / MAIL_RATE_LIMIT_WINDOW)
+  * 같은 주소/종류의 미발송 메일은 새 메일로 대체 (세션에는 마지막 인증번호만 남으므로)
+- MailOutboxWorker: 별도 프로세스(run_mail_worker)에서 SMTP 연결 하나를 유지하며 묶음 발송
+  * 메일마다 lease 를 갱신하고 보내자마자 SENT 로 표시 (배치 도중 워커가 죽어도 이미 보낸 메일은 다시 보내지 않음)
+  * 일시적 오류는 지수 백오프로 재시도, 5xx 응답(주소 거부 등)이나 유효시간이 지난 메일은 실패 처리
+  * 한동안 쓰지 않은 연결은 보내기 전에 NOOP 으로 확인해서 다시 연결한다.
+    발송 도중 끊긴 메일은 서버가 이미 받았을 수 있으므로 그 자리에서 다시 보내지 않고 재시도 예약
+  * 일정 시간 보낼 메일이 없으면 연결을 닫는다
+"""
+import os
+import time
+import socket
+import smtplib
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction, close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+from SKN17_FINAL_3TEAM.instrumentation import external_call
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def check_rate_limit(to_email):
+    """주소별 발송 제한. 초과하면 ValueError"""
+    if not cache.add(f"mail_cooldown_{to_email}", 1, timeout=settings.MAIL_MIN_INTERVAL):
+        raise ValueError("잠시 후 다시 시도해주세요.")
+
+    count_key = f"mail_count_{to_email}"
+    cache.add(count_key, 0, timeout=settings.MAIL_RATE_LIMIT_WINDOW)
+    try:
+        count = cache.incr(count_key)
+    except ValueError:  # add 와 incr 사이에 만료된 경우
+        cache.set(count_key, 1, timeout=settings.MAIL_RATE_LIMIT_WINDOW)
+        count = 1
+    if count > settings.MAIL_RATE_LIMIT_COUNT:
+        raise ValueError("인증 메일 요청 횟수를 초과했습니다. 잠시 후 다시 시도해주세요.")
+
+
+def enqueue_email(kind, to_email, subject, body, valid_seconds):
+    """메일을 발송 대기열에 등록 (valid_seconds 안에 발송하지 못하면 보내지 않음)"""
+    check_rate_limit(to_email)
+    now = timezone.now()
+    with transaction.atomic():
+        EmailOutbox.objects.filter(to_email=to_email, kind=kind, status=EmailOutbox.STATUS_PENDING).update(
+            status=EmailOutbox.STATUS_SUPERSEDED,
+        )
+        return EmailOutbox.objects.create(
+            kind=kind,
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            max_attempts=settings.MAIL_MAX_ATTEMPTS,
+            next_run_at=now,
+            expires_at=now + timedelta(seconds=valid_seconds),
+        )
+
+
+def claim_emails(worker_id, limit):
+    """발송할 메일을 lease와 함께 가져온다 (대기 메일 + lease 만료된 메일)"""
+    now = timezone.now()
+    with transaction.atomic():
+        outbox_ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                Q(status=EmailOutbox.STATUS_PENDING, next_run_at__lte=now) |
+                Q(status=EmailOutbox.STATUS_SENDING, lease_expires_at__lt=now)
+            ).order_by('next_run_at').values_list('pk', flat=True)[:limit]
+        )
+        if not outbox_ids:
+            return []
+
+        EmailOutbox.objects.filter(pk__in=outbox_ids).update(
+            status=EmailOutbox.STATUS_SENDING,
+            locked_by=worker_id,
+            lease_expires_at=now + timedelta(seconds=settings.MAIL_LEASE_SECONDS),
+            attempts=F('attempts') + 1,
+        )
+
+    return list(EmailOutbox.objects.filter(pk__in=outbox_ids, locked_by=worker_id).order_by('next_run_at'))
+
+
+def _is_permanent(error):
+    """다시 보내도 성공할 수 없는 오류 (5xx 응답, 수신 주소 거부)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def _renew_lease(item, worker_id):
+    """발송 직전 lease 갱신. lease 가 만료되어 다른 워커가 가져간 메일이면 False"""
+    return bool(EmailOutbox.objects.filter(pk=item.pk, locked_by=worker_id, status=EmailOutbox.STATUS_SENDING).update(
+        lease_expires_at=timezone.now() + timedelta(seconds=settings.MAIL_LEASE_SECONDS),
+    ))
+
+
+def _mark_sent(item, worker_id):
+    EmailOutbox.objects.filter(pk=item.pk, locked_by=worker_id).update(
+        status=EmailOutbox.STATUS_SENT,
+        sent_at=timezone.now(),
+        locked_by=None,
+        lease_expires_at=None,
+        last_error=None,
+    )
+
+
+def _fail(item, worker_id, error):
+    EmailOutbox.objects.filter(pk=item.pk, locked_by=worker_id).update(
+        status=EmailOutbox.STATUS_FAILED,
+        locked_by=None,
+        lease_expires_at=None,
+        last_error=error,
+    )
+    logger.error(f"❌ 메일 {item.pk} 발송 실패 ({item.to_email}): {error}")
+
+
+def _retry_or_fail(item, worker_id, error):
+    next_run_at = timezone.now() + timedelta(seconds=settings.MAIL_RETRY_BACKOFF * (2 ** (item.attempts - 1)))
+    if item.attempts >= item.max_attempts or next_run_at >= item.expires_at:
+        _fail(item, worker_id, error)
+        return
+    EmailOutbox.objects.filter(pk=item.pk, locked_by=worker_id).update(
+        status=EmailOutbox.STATUS_PENDING,
+        next_run_at=next_run_at,
+        locked_by=None,
+        lease_expires_at=None,
+        last_error=error,
+    )
+    logger.warning(f"🔁 메일 {item.pk} 재시도 예약 ({item.attempts}/{item.max_attempts}): {error}")
+
+
+def purge_outbox(limit=1000):
+    """보관 기간(MAIL_OUTBOX_RETENTION_DAYS)이 지난 처리 완료 메일 삭제 (본문에 인증번호가 있으므로 오래 보관하지 않음)"""
+    cutoff = timezone.now() - timedelta(days=settings.MAIL_OUTBOX_RETENTION_DAYS)
+    ids = list(
+        EmailOutbox.objects.filter(created_at__lt=cutoff).exclude(
+            status__in=[EmailOutbox.STATUS_PENDING, EmailOutbox.STATUS_SENDING]
+        ).values_list('pk', flat=True)[:limit]
+    )
+    if not ids:
+        return 0
+    return EmailOutbox.objects.filter(pk__in=ids).delete()[0]
+
+
+class MailOutboxWorker:
+    """
+    메일 발송 워커
+    SMTP 연결 하나를 열어 두고 대기열의 메일을 batch_size 개씩 가져와 발송한다.
+    """
+
+    PURGE_INTERVAL = 600
+    CHECK_AFTER_IDLE = 5   # 이 시간(초) 넘게 쓰지 않은 연결은 보내기 전에 NOOP 으로 확인
+
+    def __init__(self, batch_size=None, poll_interval=None):
+        self.batch_size = batch_size or settings.MAIL_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.MAIL_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._connection = None
+        self._last_used = 0.0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _open(self):
+        if self._connection is not None and time.monotonic() - self._last_used > self.CHECK_AFTER_IDLE:
+            smtp = getattr(self._connection, 'connection', None)
+            try:
+                if smtp is not None:
+                    smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                self._close()
+        if self._connection is None:
+            connection = get_connection(fail_silently=False, timeout=settings.EMAIL_TIMEOUT)
+            connection.open()
+            self._connection = connection
+            self._last_used = time.monotonic()
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _send(self, message):
+        """
+        메시지 1건 발송
+        발송 도중 연결이 끊기면 서버가 이미 받았을 수 있으므로 다시 보내지 않고 연결만 닫는다. (호출한 쪽에서 재시도 예약)
+        """
+        message.connection = self._open()
+        try:
+            with external_call('smtp'):
+                message.send()
+        except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout):
+            self._close()
+            raise
+        self._last_used = time.monotonic()
+
+    def send_batch(self, batch):
+        """배치 발송. 보낸 메일은 바로 SENT 로 표시하고 발송한 건수를 반환"""
+        sent = 0
+        for item in batch:
+            if item.expires_at <= timezone.now():
+                _fail(item, self.worker_id, "유효시간 만료")
+                continue
+            if not _renew_lease(item, self.worker_id):
+                logger.warning(f"⚠️ 메일 {item.pk} lease 만료로 건너뜀 (다른 워커가 처리)")
+                continue
+
+            message = EmailMessage(item.subject, item.body, settings.DEFAULT_FROM_EMAIL, [item.to_email])
+            try:
+                self._send(message)
+            except Exception as e:
+                if _is_permanent(e):
+                    _fail(item, self.worker_id, str(e))
+                else:
+                    _retry_or_fail(item, self.worker_id, str(e))
+                continue
+            _mark_sent(item, self.worker_id)
+            sent += 1
+        return sent
+
+    def run(self):
+        logger.info(f"📮 메일 워커 시작 ({self.worker_id}, 배치 {self.batch_size}, 조회 주기 {self.poll_interval}초)")
+        last_purge = 0.0
+        while not self._stop.is_set():
+            batch = []
+            try:
+                batch = claim_emails(self.worker_id, self.batch_size)
+                if batch:
+                    sent = self.send_batch(batch)
+                    logger.info(f"📨 메일 {sent}/{len(batch)}건 발송")
+                elif self._connection is not None and time.monotonic() - self._last_used > settings.MAIL_CONNECTION_IDLE_TIMEOUT:
+                    self._close()
+
+                if time.monotonic() - last_purge >= self.PURGE_INTERVAL:
+                    purge_outbox()
+                    last_purge = time.monotonic()
+            except Exception as e:
+                logger.error(f"⚠️ 메일 발송 중 에러 발생: {e}")
+                self._close()
+                close_old_connections()
+
+            # 가득 찬 배치를 가져왔으면 남은 메일이 있을 수 있으므로 바로 다시 조회
+            if len(batch) < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+        self._close()
+        logger.info("📮 메일 워커 종료")
@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class Command(BaseCommand):
+    help = 'PBKDF2 반복 횟수별 로그인(비밀번호 검증) 처리량을 워커 1개 기준으로 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, nargs='+',
+                            default=[100000, 300000, settings.PASSWORD_PBKDF2_ITERATIONS, 1000000],
+                            help='측정할 반복 횟수 목록')
+        parser.add_argument('--logins', type=int, default=20, help='반복 횟수마다 검증할 횟수')
+        parser.add_argument('--threads', type=int, default=1,
+                            help='동시에 검증할 스레드 수 (gunicorn sync 워커 1개는 1)')
+
+    def handle(self, *args, **options):
+        hasher = PBKDF2PasswordHasher()
+        password = 'benchmark123'
+        logins = options['logins']
+        threads = options['threads']
+        salt = hasher.salt()
+
+        self.stdout.write(f'검증 {logins}회 / 스레드 {threads}개 (현재 설정: {settings.PASSWORD_PBKDF2_ITERATIONS:,}회)')
+        self.stdout.write(f'{"iterations":>12} {"ms/login":>10} {"logins/s":>10}')
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for iterations in sorted(set(options['iterations'])):
+                encoded = hasher.encode(password, salt, iterations)
+                started = time.perf_counter()
+                results = list(pool.map(lambda _: hasher.verify(password, encoded), range(logins)))
+                elapsed = time.perf_counter() - started
+                assert all(results)
+
+                single = elapsed / logins * threads
+                marker = ' *' if iterations == settings.PASSWORD_PBKDF2_ITERATIONS else ''
+                self.stdout.write(f'{iterations:>12,} {single * 1000:>10.1f} {logins / elapsed:>10.1f}{marker}')
+
+        self.stdout.write(self.style.SUCCESS(
+            '워커 수를 곱한 값이 서버 전체 최대 로그인 처리량입니다. '
+            'PASSWORD_PBKDF2_ITERATIONS 를 바꾸면 기존 해시는 다음 로그인 때 새 값으로 교체됩니다.'
+        ))
@@ -0,0 +1,195 @@
+from datetime import date, timedelta
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from users.models import CommonCode, UserInfo, EmailOutbox
+from videos.models import FileInfo, HighlightVideo, UserUploadVideo, SubtitleInfo, UploadJob
+from payments.models import PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory
+from chatbot.models import Chatbot
+
+PROJECT_APPS = ('users', 'videos', 'payments', 'chatbot')
+
+# 행 수가 적어서 풀스캔이 정상인 테이블
+SMALL_TABLES = {'PLAN_INFO', 'COMMON_CODE'}
+
+
+def _next_pk(model):
+    return (model.objects.aggregate(m=Max('pk'))['m'] or 0) + 1
+
+
+def seed(rows):
+    """
+    인덱스 선택을 확인할 수 있을 만큼의 가상 데이터 생성 (호출한 쪽에서 롤백)
+    MySQL은 bulk_create 후 PK를 돌려주지 않으므로 PK를 직접 지정한다.
+    """
+    now = timezone.now()
+    category = CommonCode.objects.create(common_code_grp='SEED', common_code_value='SEED-CATEGORY')
+    plan = PlanInfo.objects.create(plan_name='SEED', price=0, storage_limit=1024)
+
+    users = UserInfo.objects.bulk_create([
+        UserInfo(user_id=f'seed-{i}', email=f'seed{i}@seed.local', password='-') for i in range(rows)
+    ])
+
+    file_base = _next_pk(FileInfo)
+    FileInfo.objects.bulk_create([FileInfo(file_id=file_base + i, file_path=f'seed/{i}.mp4') for i in range(rows * 2)])
+    HighlightVideo.objects.bulk_create([
+        HighlightVideo(video_file_id=file_base + i, highlight_title=f'SEED 하이라이트 {i % (rows // 3 + 1)}',
+                       match_date=date.today() - timedelta(days=i % 365), video_category=category)
+        for i in range(rows)
+    ])
+    UserUploadVideo.objects.bulk_create([
+        UserUploadVideo(upload_file_id=file_base + rows + i, user=users[i % rows], upload_title=f'SEED 업로드 {i}',
+                        upload_date=date.today() - timedelta(days=i % 90), use_yn=i % 5 != 0)
+        for i in range(rows)
+    ])
+    SubtitleInfo.objects.bulk_create([
+        SubtitleInfo(video_file_id=file_base + i, subtitle=b'') for i in range(rows)
+    ])
+
+    sub_base, invoice_base = _next_pk(SubscribeHistory), _next_pk(InvoiceInfo)
+    SubscribeHistory.objects.bulk_create([
+        SubscribeHistory(subscription_id=sub_base + i, user=users[i % rows], plan=plan,
+                         subscribe_start_dt=now - timedelta(days=30 * (i // rows) + 1),
+                         subscribe_end_dt=None if i < rows else now - timedelta(days=30 * (i // rows) - 29))
+        for i in range(rows * 3)
+    ])
+    InvoiceInfo.objects.bulk_create([
+        InvoiceInfo(invoice_id=invoice_base + i, subscription_id=sub_base + i, invoice_amount=0, issue_date=date.today())
+        for i in range(rows * 3)
+    ])
+    PaymentHistory.objects.bulk_create([
+        PaymentHistory(invoice_id=invoice_base + i, transaction_id=f'seed-{i}', payment_amount=0,
+                       payment_date=now - timedelta(days=30 * (i // rows) + 1))
+        for i in range(rows * 3)
+    ])
+    Chatbot.objects.bulk_create([Chatbot(rule=f'seed-rule-{i}', response='-') for i in range(rows)])
+
+
+def main_queries():
+    """(이름, QuerySet) - 서비스 코드의 주요 조회와 같은 조건"""
+    now = timezone.now()
+    sub = SubscribeHistory.objects.order_by('-pk').first()
+    user = sub.user if sub else UserInfo.objects.first()
+    video = HighlightVideo.objects.order_by('-pk').first()
+    rule = Chatbot.objects.values_list('rule', flat=True).first() or ''
+    user_id = user.pk if user else ''
+
+    return [
+        ('로그인 (이메일)', UserInfo.objects.filter(email=user.email if user else '')),
+        ('유저 컨텍스트', UserInfo.objects.select_related(
+            'favorite_code', 'subscription_state__current_plan', 'subscription_state__reserved_plan'
+        ).filter(user_id=user_id)),
+        ('현재 구독', SubscribeHistory.objects.filter(user_id=user_id).filter(
+            Q(subscribe_end_dt__isnull=True) | Q(subscribe_end_dt__gte=now)
+        ).order_by('-subscribe_start_dt')[:1]),
+        ('해지 대상 구독', SubscribeHistory.objects.filter(user_id=user_id, subscribe_end_dt__isnull=True).order_by('-subscribe_start_dt')[:1]),
+        ('마지막 결제일', PaymentHistory.objects.filter(invoice__subscription=sub).order_by('-payment_date')[:1]),
+        ('결제 내역', PaymentHistory.objects.filter(invoice__subscription__user_id=user_id).order_by('-payment_date')[:5]),
+        ('카탈로그', HighlightVideo.objects.filter(
+            video_category_id=video.video_category_id if video else None
+        ).order_by('-match_date', '-video_file_id')),
+        ('해설자별 버전', HighlightVideo.objects.filter(
+            highlight_title=video.highlight_title if video else '', match_date=video.match_date if video else None
+        )),
+        ('하이라이트 자막', SubtitleInfo.objects.filter(video_file_id=video.pk if video else None)[:1]),
+        ('내 보관함', UserUploadVideo.objects.filter(user_id=user_id, use_yn=True).order_by('-upload_date', '-pk')),
+        ('해설자 코드', CommonCode.objects.filter(common_code_value='SEED', common_code_grp='COMMENTATOR')[:1]),
+        ('챗봇 규칙', Chatbot.objects.filter(rule=rule)),
+        ('메일 대기열', EmailOutbox.objects.filter(
+            status=EmailOutbox.STATUS_PENDING, next_run_at__lte=now
+        ).order_by('next_run_at')[:50]),
+        ('업로드 작업 큐', UploadJob.objects.filter(
+            status=UploadJob.STATUS_PENDING, next_run_at__lte=now
+        ).order_by('next_run_at')[:4]),
+    ]
+
+
+def explain(queryset):
+    """(풀스캔 테이블 목록, 실행 계획 줄 목록) - MySQL / SQLite"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(f'EXPLAIN {sql}', params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            scans = [row['table'] for row in rows if row['type'] == 'ALL']
+            lines = [f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row.get('Extra') or ''}" for row in rows]
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            lines = [row[3] for row in cursor.fetchall()]
+            scans = [line.split()[1] for line in lines if line.startswith('SCAN ') and ' USING ' not in line]
+        else:
+            raise CommandError(f'지원하지 않는 DB입니다: {connection.vendor}')
+    return scans, lines
+
+
+def missing_schema():
+    """
+    모델에 선언했지만 DB에 없는 스키마 -> {'tables': [테이블], 'columns': [테이블.컬럼], 'indexes': [테이블.인덱스]}
+    (스키마는 마이그레이션으로 관리하므로 여기서는 확인만 한다)
+    """
+    missing = {'tables': [], 'columns': [], 'indexes': []}
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+        for app_label in PROJECT_APPS:
+            for model in apps.get_app_config(app_label).get_models():
+                table = model._meta.db_table
+                if table not in tables:
+                    missing['tables'].append(table)
+                    continue
+                columns = {col.name for col in connection.introspection.get_table_description(cursor, table)}
+                for field in model._meta.local_concrete_fields:
+                    if field.column not in columns:
+                        missing['columns'].append(f'{table}.{field.column}')
+                existing = connection.introspection.get_constraints(cursor, table)
+                for item in [*model._meta.indexes, *model._meta.constraints]:
+                    if item.name not in existing:
+                        missing['indexes'].append(f'{table}.{item.name}')
+    return missing
+
+
+class Command(BaseCommand):
+    help = ('주요 서비스 쿼리의 실행 계획(EXPLAIN)을 확인해서 풀스캔을 찾고, '
+            '모델에 선언된 테이블/컬럼/인덱스/제약조건 중 DB에 없는 것을 출력합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='가상 데이터 행 수 (확인 후 롤백, 0이면 현재 데이터로 확인)')
+        parser.add_argument('--verbose', action='store_true', help='모든 쿼리의 실행 계획 출력')
+
+    def handle(self, *args, **options):
+        missing = missing_schema()
+        if any(missing.values()):
+            labels = {'tables': '테이블', 'columns': '컬럼', 'indexes': '인덱스/제약조건'}
+            for kind, names in missing.items():
+                if names:
+                    self.stdout.write(self.style.WARNING(f'DB에 없는 {labels[kind]} {len(names)}개'))
+                    for name in names:
+                        self.stdout.write(f'  {name}')
+            raise CommandError('스키마가 모델과 다릅니다. python manage.py migrate 를 먼저 실행하세요.')
+
+        with transaction.atomic():
+            if options['seed']:
+                seed(options['seed'])
+            flagged = self._check_plans(options['verbose'])
+            transaction.set_rollback(True)
+
+        if flagged:
+            raise CommandError(f'풀스캔 쿼리 {flagged}개')
+        self.stdout.write(self.style.SUCCESS('풀스캔 쿼리 없음'))
+
+    def _check_plans(self, verbose):
+        flagged = 0
+        for name, queryset in main_queries():
+            scans, lines = explain(queryset)
+            scans = [table for table in scans if table not in SMALL_TABLES]
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.ERROR(f'[풀스캔] {name}: {", ".join(scans)}'))
+            elif verbose:
+                self.stdout.write(self.style.SUCCESS(f'[OK] {name}'))
+            if scans or verbose:
+                for line in lines:
+                    self.stdout.write(f'    {line}')
+        return flagged
@@ -0,0 +1,111 @@
+import random
+import threading
+import socketserver
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from django.core.management.base import BaseCommand
+
+
+class FakeSMTPState:
+    """받은 메일/연결 수 집계 + 실패 주입 설정"""
+
+    def __init__(self, fail_rate, reject, verbose):
+        self.fail_rate = fail_rate
+        self.reject = set(reject)
+        self.verbose = verbose
+        self.connections = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state, stdout):
+    class FakeSMTPHandler(socketserver.StreamRequestHandler):
+        """
+        메일 워커 테스트에 필요한 최소한의 SMTP 명령만 처리 (인증/TLS 없음)
+        EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT
+        """
+
+        def reply(self, line):
+            self.wfile.write(f"{line}\r\n".encode('utf-8'))
+
+        def handle(self):
+            with state.lock:
+                state.connections += 1
+                conn_no = state.connections
+            self.reply("220 fake-smtp ready")
+            rcpts = []
+
+            while True:
+                raw = self.rfile.readline()
+                if not raw:
+                    return
+                line = raw.decode('utf-8', 'replace').strip()
+                command = line[:4].upper()
+
+                if command in ('EHLO', 'HELO'):
+                    self.reply("250-fake-smtp\r\n250 8BITMIME" if command == 'EHLO' else "250 fake-smtp")
+                elif command == 'MAIL':
+                    rcpts = []
+                    self.reply("250 OK")
+                elif command == 'RCPT':
+                    address = line.split(':', 1)[1].strip().strip('<>')
+                    if address in state.reject:
+                        self.reply(f"550 5.1.1 <{address}> mailbox unavailable")
+                    else:
+                        rcpts.append(address)
+                        self.reply("250 OK")
+                elif command == 'DATA':
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = []
+                    while True:
+                        chunk = self.rfile.readline()
+                        if not chunk or chunk in (b".\r\n", b".\n"):
+                            break
+                        data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                    if random.random() < state.fail_rate:
+                        self.reply("451 4.3.0 temporary failure")
+                        continue
+                    with state.lock:
+                        state.messages += 1
+                        total = state.messages
+                    message = message_from_bytes(b"".join(data))
+                    stdout.write(f"[연결 {conn_no}] #{total} {', '.join(rcpts)} | {make_header(decode_header(message.get('Subject', '')))}")
+                    if state.verbose:
+                        stdout.write(message.get_payload(decode=True).decode('utf-8', 'replace'))
+                    self.reply("250 OK queued")
+                elif command in ('RSET', 'NOOP'):
+                    self.reply("250 OK")
+                elif command == 'QUIT':
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+    return FakeSMTPHandler
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Command(BaseCommand):
+    help = '로컬 테스트용 가짜 SMTP 서버를 실행합니다. (EMAIL_HOST=localhost EMAIL_PORT=<port> EMAIL_USE_TLS=False)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=1025)
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='임시 오류(451)로 응답할 메일 비율 (0~1)')
+        parser.add_argument('--reject', nargs='*', default=[], help='550으로 거부할 수신 주소')
+        parser.add_argument('--verbose', action='store_true', help='메일 본문 출력')
+
+    def handle(self, *args, **options):
+        state = FakeSMTPState(options['fail_rate'], options['reject'], options['verbose'])
+        server = _Server(('127.0.0.1', options['port']), make_handler(state, self.stdout))
+        self.stdout.write(self.style.SUCCESS(f"가짜 SMTP 서버 실행 중: 127.0.0.1:{options['port']}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"연결 {state.connections}회 / 수신 메일 {state.messages}건")
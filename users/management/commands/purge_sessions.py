@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = '만료된 세션을 일정 개수씩 나누어 삭제합니다. (한 번에 큰 DELETE로 테이블이 잠기는 것을 방지)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='한 번에 삭제할 세션 수')
+        parser.add_argument('--sleep', type=float, default=0.1, help='배치 사이 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        started = time.perf_counter()
+        deleted = 0
+
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            if len(keys) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'만료 세션 삭제 완료: {deleted}건 ({elapsed:.2f}s)'))
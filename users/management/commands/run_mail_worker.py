@@ -0,0 +1,25 @@
+import signal
+from django.core.management.base import BaseCommand
+from users.mailer import MailOutboxWorker
+
+
+class Command(BaseCommand):
+    help = '메일 발송 대기열 워커를 실행합니다. (웹 워커와 별도 프로세스로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='한 번에 가져와 발송할 메일 수 (기본: MAIL_BATCH_SIZE)')
+        parser.add_argument('--poll-interval', type=float, default=None, help='대기열 조회 주기(초) (기본: MAIL_POLL_INTERVAL)')
+
+    def handle(self, *args, **options):
+        worker = MailOutboxWorker(batch_size=options['batch_size'], poll_interval=options['poll_interval'])
+
+        # 종료 신호를 받으면 현재 배치까지만 발송하고 종료한다.
+        # 강제 종료되더라도 lease 만료 후 다른 워커가 이어서 발송한다.
+        def _graceful_stop(signum, frame):
+            self.stdout.write(self.style.WARNING('종료 신호 수신 - 현재 배치 발송 후 종료합니다.'))
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, _graceful_stop)
+        signal.signal(signal.SIGINT, _graceful_stop)
+
+        worker.run()
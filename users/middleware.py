@@ -0,0 +1,17 @@
+from django.utils.functional import SimpleLazyObject
+from .context import load_user_context
+
+
+class UserContextMiddleware:
+    """
+    request.user_context 에 로그인 유저의 UserContext를 지연 로딩으로 연결한다.
+    한 요청 안에서는 처음 접근할 때 한 번만 조회된다. (비로그인 요청은 조회하지 않음)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_id = request.session.get('user_id')
+        request.user_context = SimpleLazyObject(lambda: load_user_context(user_id)) if user_id else None
+        return self.get_response(request)
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('outbox_id', models.BigAutoField(db_column='OUTBOX_ID', primary_key=True, serialize=False)),
+                ('kind', models.CharField(db_column='KIND', max_length=20)),
+                ('to_email', models.CharField(db_column='TO_EMAIL', max_length=254)),
+                ('subject', models.CharField(db_column='SUBJECT', max_length=200)),
+                ('body', models.TextField(db_column='BODY')),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('SENDING', '발송 중'), ('SENT', '발송 완료'), ('FAILED', '실패'), ('SUPERSEDED', '새 메일로 대체')], db_column='STATUS', default='PENDING', max_length=10)),
+                ('attempts', models.IntegerField(db_column='ATTEMPTS', default=0)),
+                ('max_attempts', models.IntegerField(db_column='MAX_ATTEMPTS', default=5)),
+                ('next_run_at', models.DateTimeField(db_column='NEXT_RUN_AT', default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(db_column='EXPIRES_AT', help_text='이 시각이 지나면 발송하지 않음 (인증번호 유효시간)')),
+                ('locked_by', models.CharField(blank=True, db_column='LOCKED_BY', max_length=100, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, db_column='LEASE_EXPIRES_AT', null=True)),
+                ('last_error', models.TextField(blank=True, db_column='LAST_ERROR', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')),
+                ('sent_at', models.DateTimeField(blank=True, db_column='SENT_AT', null=True)),
+            ],
+            options={
+                'verbose_name': '메일 발송 대기열',
+                'verbose_name_plural': '메일 발송 대기열 목록',
+                'db_table': 'EMAIL_OUTBOX',
+            },
+        ),
+        migrations.AddField(
+            model_name='userinfo',
+            name='storage_reserved',
+            field=models.IntegerField(db_column='STORAGE_RESERVED', default=0, help_text='업로드 중인 파일에 예약된 용량, 단위: KB'),
+        ),
+        migrations.AlterField(
+            model_name='userinfo',
+            name='password',
+            field=models.CharField(db_column='PASSWORD', help_text='영소문자와 숫자 포함 10~16자, PBKDF2 해시 (이전 데이터는 SHA-256)', max_length=128),
+        ),
+        migrations.AddIndex(
+            model_name='commoncode',
+            index=models.Index(fields=['common_code_grp', 'common_code_value'], name='common_code_grp_value_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='userinfo',
+            constraint=models.UniqueConstraint(fields=('email',), name='user_info_email_uq'),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(fields=['status', 'next_run_at'], name='email_outbox_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='email_outbox_lease_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(fields=['to_email', 'kind', 'status'], name='email_outbox_address_idx'),
+        ),
+    ]
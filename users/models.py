@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class CommonCode(models.Model):
     """
@@ -13,6 +14,9 @@ class CommonCode(models.Model):
         db_table = 'COMMON_CODE'
         verbose_name = '공통 코드'
         verbose_name_plural = '공통 코드 목록'
+        indexes = [
+            models.Index(fields=['common_code_grp', 'common_code_value'], name='common_code_grp_value_idx'),
+        ]
 
     def __str__(self):
         return f"{self.common_code_grp} - {self.common_code_value}"
@@ -26,14 +30,72 @@ class UserInfo(models.Model):
     user_id = models.CharField(max_length=40, primary_key=True, db_column='USER_ID', help_text="이메일로 UUID 생성")
     favorite_code = models.ForeignKey(CommonCode, on_delete=models.SET_NULL, null=True, blank=True, db_column='FAVORITE_CODE', related_name='users_favorite')
     email = models.CharField(max_length=254, db_column='EMAIL')
-    password = models.CharField(max_length=64, db_column='PASSWORD', help_text="영소문자와 숫자 포함 10~16자, 암호화")
+    password = models.CharField(max_length=128, db_column='PASSWORD', help_text="영소문자와 숫자 포함 10~16자, PBKDF2 해시 (이전 데이터는 SHA-256)")
     storage_usage = models.IntegerField(default=0, db_column='STORAGE_USAGE', help_text="단위: KB")
+    storage_reserved = models.IntegerField(default=0, db_column='STORAGE_RESERVED', help_text="업로드 중인 파일에 예약된 용량, 단위: KB")
     free_use_yn = models.BooleanField(default=False, db_column='FREE_USE_YN')
 
     class Meta:
         db_table = 'USER_INFO'
         verbose_name = '회원 정보'
         verbose_name_plural = '회원 정보 목록'
+        constraints = [
+            # USER_ID가 이메일로 만든 UUID라 이미 이메일당 1명이므로 unique로 선언 (로그인/중복 확인 조회)
+            models.UniqueConstraint(fields=['email'], name='user_info_email_uq'),
+        ]
 
     def __str__(self):
-        return self.user_id
\ No newline at end of file
+        return self.user_id
+
+
+class EmailOutbox(models.Model):
+    """
+    14) 메일 발송 대기열
+    인증번호/비밀번호 재설정 메일을 요청 처리 중에 바로 보내지 않고 저장해 두면
+    메일 워커(run_mail_worker)가 SMTP 연결 하나를 유지하면서 묶음으로 발송한다.
+    같은 주소/종류로 새 메일이 등록되면 아직 발송되지 않은 이전 메일은 SUPERSEDED 처리된다.
+    """
+    STATUS_PENDING = 'PENDING'
+    STATUS_SENDING = 'SENDING'
+    STATUS_SENT = 'SENT'
+    STATUS_FAILED = 'FAILED'
+    STATUS_SUPERSEDED = 'SUPERSEDED'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENDING, '발송 중'),
+        (STATUS_SENT, '발송 완료'),
+        (STATUS_FAILED, '실패'),
+        (STATUS_SUPERSEDED, '새 메일로 대체'),
+    ]
+
+    KIND_SIGNUP_CODE = 'SIGNUP_CODE'
+    KIND_RESET_CODE = 'RESET_CODE'
+
+    outbox_id = models.BigAutoField(primary_key=True, db_column='OUTBOX_ID')
+    kind = models.CharField(max_length=20, db_column='KIND')
+    to_email = models.CharField(max_length=254, db_column='TO_EMAIL')
+    subject = models.CharField(max_length=200, db_column='SUBJECT')
+    body = models.TextField(db_column='BODY')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_column='STATUS')
+    attempts = models.IntegerField(default=0, db_column='ATTEMPTS')
+    max_attempts = models.IntegerField(default=5, db_column='MAX_ATTEMPTS')
+    next_run_at = models.DateTimeField(default=timezone.now, db_column='NEXT_RUN_AT')
+    expires_at = models.DateTimeField(db_column='EXPIRES_AT', help_text="이 시각이 지나면 발송하지 않음 (인증번호 유효시간)")
+    locked_by = models.CharField(max_length=100, null=True, blank=True, db_column='LOCKED_BY')
+    lease_expires_at = models.DateTimeField(null=True, blank=True, db_column='LEASE_EXPIRES_AT')
+    last_error = models.TextField(null=True, blank=True, db_column='LAST_ERROR')
+    created_at = models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')
+    sent_at = models.DateTimeField(null=True, blank=True, db_column='SENT_AT')
+
+    class Meta:
+        db_table = 'EMAIL_OUTBOX'
+        verbose_name = '메일 발송 대기열'
+        verbose_name_plural = '메일 발송 대기열 목록'
+        indexes = [
+            models.Index(fields=['status', 'next_run_at'], name='email_outbox_pending_idx'),
+            models.Index(fields=['status', 'lease_expires_at'], name='email_outbox_lease_idx'),
+            models.Index(fields=['to_email', 'kind', 'status'], name='email_outbox_address_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} -> {self.to_email} ({self.status})"
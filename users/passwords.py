@@ -0,0 +1,54 @@
+"""
+비밀번호 해싱/검증
+
+- 해싱은 Django hasher(settings.PASSWORD_HASHERS, 기본 PBKDF2-SHA256)를 사용한다.
+- 이전 방식(솔트 없는 SHA-256 hex)으로 저장된 비밀번호는 로그인 성공 시 새 방식으로 바꿔 저장한다.
+- 해싱은 요청 스레드에서 바로 실행한다. (gunicorn sync 워커는 요청을 하나씩 처리하므로 별도 스레드 풀은 대기만 늘린다)
+  로그인 처리량은 반복 횟수(PASSWORD_PBKDF2_ITERATIONS)로 조절한다. (benchmark_password_hashing)
+"""
+import re
+import hmac
+import hashlib
+from django.contrib.auth.hashers import make_password, check_password
+
+_LEGACY_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_legacy_hash(encoded):
+    return bool(encoded) and _LEGACY_SHA256_RE.match(encoded) is not None
+
+
+def hash_password(raw_password):
+    return make_password(raw_password)
+
+
+def _check(raw_password, encoded):
+    if is_legacy_hash(encoded):
+        legacy = hashlib.sha256(raw_password.encode('utf-8')).hexdigest()
+        return hmac.compare_digest(legacy, encoded)
+    return check_password(raw_password, encoded)
+
+
+def matches(raw_password, encoded):
+    """비밀번호 일치 여부만 확인 (저장된 해시는 바꾸지 않음)"""
+    return _check(raw_password, encoded)
+
+
+def verify_password(user, raw_password):
+    """
+    로그인용 비밀번호 검증
+    일치하면서 이전 방식 해시이거나 반복 횟수가 바뀐 경우 새 해시로 교체해서 저장한다.
+    """
+    encoded = user.password
+    if is_legacy_hash(encoded):
+        ok = _check(raw_password, encoded)
+        new_encoded = make_password(raw_password) if ok else None
+    else:
+        upgraded = []
+        ok = check_password(raw_password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+        new_encoded = upgraded[0] if upgraded else None
+
+    if ok and new_encoded:
+        user.password = new_encoded
+        user.save(update_fields=['password'])
+    return ok
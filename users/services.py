@@ -1,30 +1,14 @@
-import hashlib
 import uuid
 import random
 import string
 import re
 from datetime import timedelta
 from django.conf import settings
-from django.core.mail import send_mail
-from django.utils import timezone
-from django.db.models import Q
 from django.core.cache import cache
-from .models import UserInfo, CommonCode
-from payments.models import SubscribeHistory, PaymentHistory
-
-TEAM_META_DATA = {
-    'LG': {'full': 'LG 트윈스', 'mascot': '수타'},
-    'HANWHA': {'full': '한화 이글스', 'mascot': '술이'},
-    'SSG': {'full': 'SSG 랜더스', 'mascot': '란디'},
-    'SAMSUNG': {'full': '삼성 라이온즈', 'mascot': '볼래요'},
-    'NC': {'full': 'NC 다이노스', 'mascot': '반비'},
-    'KT': {'full': 'KT 위즈', 'mascot': '똘이'},
-    'LOTTE': {'full': '롯데 자이언츠', 'mascot': '눌이'},
-    'KIA': {'full': 'KIA 타이거즈', 'mascot': '호거리'},
-    'DOOSAN': {'full': '두산 베어스', 'mascot': '철'},
-    'KIWOOM': {'full': '키움 히어로즈', 'mascot': '턱도리'},
-}
-
+from .models import UserInfo, EmailOutbox
+from .codes import codes, team_meta
+from . import passwords, mailer
+from payments.models import PaymentHistory
 
 def generate_code(length: int = 6) -> str:
     characters = string.ascii_letters + string.digits
@@ -44,7 +28,7 @@ def send_code_email_logic(email: str) -> str:
         f"유효시간: 5분\n\n"
         f"본인이 요청하지 않았다면 이 메일을 무시하셔도 됩니다."
     )
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [email], fail_silently=False)
+    mailer.enqueue_email(EmailOutbox.KIND_SIGNUP_CODE, email, subject, message, settings.AUTH_CODE_TTL)
     return code
 
 
@@ -57,31 +41,25 @@ def verify_code_logic(input_code, session_code):
     return True
 
 
-def validate_password_logic(password):
-    """비밀번호 유효성 검사 및 해싱"""
+def check_password_format(password):
+    """비밀번호 양식 검사 (영소문자와 숫자 포함 10~16자)"""
     password_regex = r'^(?=.*[a-z])(?=.*\d).{10,16}$'
-    if not re.match(password_regex, password):
+    if not password or not re.match(password_regex, password):
         raise ValueError("비밀번호 양식이 올바르지 않습니다.")
-    
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+def validate_password_logic(password):
+    """비밀번호 유효성 검사 및 해싱"""
+    check_password_format(password)
+    return passwords.hash_password(password)
 
 
 def create_user_logic(email, hashed_password, team_str):
     """회원가입 완료(DB생성) 로직"""
-    team_mapping = {
-        'LG': 1, 'HANHWA': 2, 'SSG': 3, 'SAMSUNG': 4, 'NC': 5,
-        'KT': 6, 'LOTTE': 7, 'KIA': 8, 'DOOSAN': 9, 'KIWOOM': 10
-    }
-    
-    fav_team_code = team_mapping.get(team_str)
-    if not fav_team_code:
+    favorite_team_instance = codes.team(team_str)
+    if not favorite_team_instance:
         raise ValueError("잘못된 구단 정보입니다.")
 
-    try:
-        favorite_team_instance = CommonCode.objects.get(pk=fav_team_code)
-    except CommonCode.DoesNotExist:
-        raise ValueError("존재하지 않는 구단 코드입니다.")
-
     user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, email)
     new_user = UserInfo(
         user_id=str(user_uuid),
@@ -103,15 +81,19 @@ def login_user_logic(email, password):
     except UserInfo.DoesNotExist:
         raise ValueError("존재하지 않는 이메일입니다.")
 
-    input_hashed = hashlib.sha256(password.encode('utf-8')).hexdigest()
-
-    if user.password == input_hashed:
+    # 이전 방식(SHA-256)으로 저장된 비밀번호는 로그인 성공 시 새 해시로 교체된다.
+    if passwords.verify_password(user, password or ''):
         cache.delete(f"login_fail_{email}")
         return user.user_id
     else:
+        # 여러 워커에서 동시에 실패해도 누락되지 않도록 공유 캐시의 원자적 incr 사용
         fail_key = f"login_fail_{email}"
-        current_fail = cache.get(fail_key, 0) + 1
-        cache.set(fail_key, current_fail, timeout=600)
+        cache.add(fail_key, 0, timeout=600)
+        try:
+            current_fail = cache.incr(fail_key)
+        except ValueError:  # add 와 incr 사이에 만료된 경우
+            cache.set(fail_key, 1, timeout=600)
+            current_fail = 1
 
         if current_fail >= 5:
             cache.set(lock_key, 'LOCKED', timeout=600)
@@ -129,51 +111,36 @@ def send_reset_code_logic(email):
     code = generate_code()
     subject = "[BAIS] 비밀번호 재설정 인증번호"
     message = f"인증번호: {code}\n유효시간: 5분"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [email], fail_silently=False)
+    mailer.enqueue_email(EmailOutbox.KIND_RESET_CODE, email, subject, message, settings.AUTH_CODE_TTL)
     return code
 
 
 def reset_password_logic(email, new_password):
     """비밀번호 재설정 로직"""
-    hashed_new = validate_password_logic(new_password)
+    check_password_format(new_password)
     
     try:
         user = UserInfo.objects.get(email=email)
-        if user.password == hashed_new:
+        if passwords.matches(new_password, user.password):
             raise ValueError("기존에 사용하던 비밀번호입니다.")
         
-        user.password = hashed_new
-        user.save()
+        user.password = passwords.hash_password(new_password)
+        user.save(update_fields=['password'])
     except UserInfo.DoesNotExist:
         raise ValueError("사용자를 찾을 수 없습니다.")
 
 
-def get_setting_context(user_id):
-    """설정 페이지 데이터 조회 로직"""
-    user = UserInfo.objects.get(user_id=user_id)
+def get_setting_context(user_ctx):
+    """설정 페이지 데이터 조회 로직 (user_ctx: users.context.UserContext)"""
+    user = user_ctx.user
     
     # 1. 팀 정보
-    team_full_name = "KBO 리그"
-    team_mascot = "마스코트"
-    if user.favorite_code and user.favorite_code.common_code_value in TEAM_META_DATA:
-        meta = TEAM_META_DATA[user.favorite_code.common_code_value]
-        team_full_name = meta['full']
-        team_mascot = meta['mascot']
-
-    # 2. 구독 정보
-    now = timezone.now()
-    current_sub = SubscribeHistory.objects.filter(
-        user=user, 
-        subscribe_start_dt__lte=now
-    ).filter(
-        Q(subscribe_end_dt__gte=now) | Q(subscribe_end_dt__isnull=True)
-    ).order_by('-subscribe_start_dt').first()
-
-    future_sub = SubscribeHistory.objects.filter(
-        user=user, subscribe_start_dt__gt=now 
-    ).order_by('subscribe_start_dt').first()
-
-    target_sub = future_sub if future_sub else current_sub
+    meta = team_meta(user_ctx.team_code)
+    team_full_name = meta['full']
+    team_mascot = meta['mascot']
+
+    # 2. 구독 정보 (payments.SubscriptionState)
+    state = user_ctx.subscription_state
 
     # 기본 컨텍스트 구조
     sub_context = {
@@ -182,9 +149,9 @@ def get_setting_context(user_id):
         'reserved_plan': '', 'reserved_start_date': '', 'reserved_next_pay': '', 'modal_expire_date': ''
     }
 
-    if current_sub:
+    if state.current_plan:
         sub_context['has_sub'] = True
-        p_name = current_sub.plan.plan_name.upper()
+        p_name = state.current_plan.plan_name.upper()
         if 'PREMIUM' in p_name:
             sub_context['plan_code'] = 'PREMIUM'
             sub_context['plan_name'] = '프리미엄 플랜'
@@ -192,25 +159,22 @@ def get_setting_context(user_id):
             sub_context['plan_code'] = 'BASIC'
             sub_context['plan_name'] = '베이직 플랜'
         
-        last_pay = PaymentHistory.objects.filter(invoice__subscription=current_sub).order_by('-payment_date').first()
-        base_date = last_pay.payment_date if last_pay else current_sub.subscribe_start_dt
-        current_cycle_end = base_date + timedelta(days=30)
+        current_cycle_end = state.cycle_end_dt
         sub_context['expire_date'] = (current_cycle_end - timedelta(days=1)).strftime('%Y.%m.%d')
 
-        if future_sub:
+        if state.reserved_plan:
             sub_context['has_reserved'] = True
-            f_plan = "프리미엄" if "PREMIUM" in future_sub.plan.plan_name.upper() else "베이직"
+            f_plan = "프리미엄" if "PREMIUM" in state.reserved_plan.plan_name.upper() else "베이직"
             sub_context['reserved_plan'] = f"{f_plan} 플랜"
-            sub_context['reserved_start_date'] = future_sub.subscribe_start_dt.strftime('%Y.%m.%d')
-            sub_context['reserved_next_pay'] = (future_sub.subscribe_start_dt + timedelta(days=30)).strftime('%Y.%m.%d')
-
-        if target_sub:
-            if target_sub.subscribe_end_dt:
-                sub_context['is_canceled'] = True
-                sub_context['modal_expire_date'] = target_sub.subscribe_end_dt.strftime('%Y.%m.%d')
-            else:
-                expected_end = target_sub.subscribe_start_dt + timedelta(days=30) if target_sub == future_sub else current_cycle_end
-                sub_context['modal_expire_date'] = (expected_end - timedelta(days=1)).strftime('%Y.%m.%d')
+            sub_context['reserved_start_date'] = state.reserved_start_dt.strftime('%Y.%m.%d')
+            sub_context['reserved_next_pay'] = (state.reserved_start_dt + timedelta(days=30)).strftime('%Y.%m.%d')
+
+        if state.is_canceled:
+            sub_context['is_canceled'] = True
+            sub_context['modal_expire_date'] = state.cancel_dt.strftime('%Y.%m.%d')
+        else:
+            expected_end = state.reserved_start_dt + timedelta(days=30) if state.reserved_plan else current_cycle_end
+            sub_context['modal_expire_date'] = (expected_end - timedelta(days=1)).strftime('%Y.%m.%d')
         
         if not sub_context['is_canceled'] and not sub_context['has_reserved']:
             sub_context['next_pay_date'] = current_cycle_end.strftime('%Y.%m.%d')
@@ -233,14 +197,13 @@ def get_setting_context(user_id):
 
 def update_team_logic(user_id, new_team_code):
     """구단 변경 로직"""
-    try:
-        code_instance = CommonCode.objects.get(common_code_value=new_team_code)
-    except CommonCode.DoesNotExist:
+    code_instance = codes.team(new_team_code)
+    if not code_instance:
         raise ValueError("존재하지 않는 구단 코드입니다.")
 
     user = UserInfo.objects.get(user_id=user_id)
-    user.favorite_code_id = code_instance
-    user.save()
+    user.favorite_code = code_instance
+    user.save(update_fields=['favorite_code'])
 
 
 def update_password_logic(user_id, current_pw, new_pw, confirm_pw):
@@ -248,26 +211,24 @@ def update_password_logic(user_id, current_pw, new_pw, confirm_pw):
     if new_pw != confirm_pw:
         raise ValueError("새 비밀번호가 일치하지 않습니다.")
 
-    hashed_new = validate_password_logic(new_pw)
+    check_password_format(new_pw)
     user = UserInfo.objects.get(user_id=user_id)
     
-    hashed_current = hashlib.sha256(current_pw.encode('utf-8')).hexdigest()
-    if user.password != hashed_current:
+    if not passwords.matches(current_pw or '', user.password):
         raise ValueError("기존 비밀번호가 일치하지 않습니다.")
     
-    if user.password == hashed_new:
+    if new_pw == current_pw:
         raise ValueError("기존 비밀번호와 다르게 설정해주세요.")
 
-    user.password = hashed_new
-    user.save()
+    user.password = passwords.hash_password(new_pw)
+    user.save(update_fields=['password'])
 
 
 def delete_account_logic(user_id, password):
     """회원 탈퇴 로직"""
     user = UserInfo.objects.get(user_id=user_id)
-    input_hashed = hashlib.sha256(password.encode('utf-8')).hexdigest()
     
-    if user.password != input_hashed:
+    if not passwords.matches(password or '', user.password):
         raise ValueError("비밀번호가 올바르지 않습니다.")
     
     user.delete()
\ No newline at end of file
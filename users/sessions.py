@@ -0,0 +1,14 @@
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBSessionStore
+
+
+class SessionStore(CachedDBSessionStore):
+    """
+    cached_db 세션 엔진 (settings.SESSION_ENGINE = 'users.sessions')
+    - 읽기: 공유 캐시에서 조회, 캐시에 없을 때만 DB 조회
+    - 쓰기: 값이 실제로 바뀐 경우에만 modified 표시 -> 같은 값 재할당/set_expiry 반복 시 저장 생략
+    """
+
+    def __setitem__(self, key, value):
+        if key in self._session and self._session[key] == value:
+            return
+        super().__setitem__(key, value)
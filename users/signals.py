@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from payments.models import SubscribeHistory
+from .models import UserInfo, CommonCode
+from .codes import codes
+from payments.subscription_state import mark_stale
+from .context import invalidate_user_context
+
+
+@receiver([post_save, post_delete], sender=UserInfo)
+def user_info_changed(sender, instance, **kwargs):
+    """설정 변경(구단/비밀번호), 저장공간 사용량, 무료 체험 사용 등 유저 정보 변경 시 캐시 무효화"""
+    user_id = instance.pk
+    # 트랜잭션 안에서 바뀐 경우 커밋 전에 다른 요청이 이전 값을 다시 캐시하지 않도록 커밋 후에 무효화
+    transaction.on_commit(lambda: invalidate_user_context(user_id))
+
+
+@receiver([post_save, post_delete], sender=SubscribeHistory)
+def subscription_changed(sender, instance, **kwargs):
+    """결제/해지/갱신으로 구독 이력이 바뀌면 캐시 무효화 (관리자 수정 등은 구독 상태도 다시 계산하도록 표시)"""
+    user_id = instance.user_id
+    mark_stale(user_id)
+    transaction.on_commit(lambda: invalidate_user_context(user_id))
+
+
+@receiver([post_save, post_delete], sender=CommonCode)
+def common_code_changed(sender, instance, **kwargs):
+    """공통 코드 변경 시 모든 프로세스의 코드 레지스트리를 다시 읽게 함"""
+    transaction.on_commit(codes.invalidate)
@@ -0,0 +1,104 @@
+"""테스트 공통 데이터 (공통 코드 / 구독 유저 / 하이라이트 / 업로드 영상) + 동시 실행 도우미"""
+import threading
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from users.codes import codes
+from users.models import CommonCode, UserInfo
+from payments.models import PlanInfo, SubscribeHistory, InvoiceInfo, PaymentHistory
+from videos.models import FileInfo, HighlightVideo, UserUploadVideo, SubtitleInfo
+from videos.catalog import invalidate_catalog
+
+# S3 대신 메모리 스토리지 (override_settings(STORAGES=TEST_STORAGES))
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+KBO_CATEGORY_ID = 11
+COMMENTATORS = {17: '김선오', 18: '이순칠', 19: '박찬호'}
+
+
+def create_codes():
+    """서비스 코드가 id로 참조하는 공통 코드 (FAVORITE 1~10, 카테고리 11~16, 해설자 17~19, 상태 20~23)"""
+    teams = ['LG', 'HANWHA', 'SSG', 'SAMSUNG', 'NC', 'KT', 'LOTTE', 'KIA', 'DOOSAN', 'KIWOOM']
+    rows = [CommonCode(common_code=i + 1, common_code_grp='FAVORITE', common_code_value=team) for i, team in enumerate(teams)]
+    rows += [CommonCode(common_code=i, common_code_grp='CATEGORY', common_code_value=f'CATEGORY-{i}') for i in range(11, 17)]
+    rows += [CommonCode(common_code=i, common_code_grp='COMMENTATOR', common_code_value=name) for i, name in COMMENTATORS.items()]
+    rows += [CommonCode(common_code=i, common_code_grp='STATUS', common_code_value=f'STATUS-{i}') for i in range(20, 24)]
+    CommonCode.objects.bulk_create(rows)
+    codes.invalidate()
+
+
+def create_user(user_id='user-1', team_code_id=1, **fields):
+    fields.setdefault('password', '-')
+    return UserInfo.objects.create(user_id=user_id, email=f'{user_id}@test.local', favorite_code_id=team_code_id, **fields)
+
+
+def subscribe(user, plan_name='BASIC', storage_limit=1024 * 1024, days_ago=10):
+    """결제까지 끝난 진행 중 구독"""
+    plan = PlanInfo.objects.create(plan_name=plan_name, price=9900, storage_limit=storage_limit)
+    started = timezone.now() - timedelta(days=days_ago)
+    sub = SubscribeHistory.objects.create(user=user, plan=plan, subscribe_start_dt=started)
+    invoice = InvoiceInfo.objects.create(subscription=sub, invoice_amount=plan.price, issue_date=started.date())
+    PaymentHistory.objects.create(invoice=invoice, transaction_id=f'T-{sub.pk}', payment_amount=plan.price, payment_date=started)
+    return sub
+
+
+def create_highlight_versions(title, match_date=date(2025, 10, 1), commentator_ids=(17, 18, 19), category_id=KBO_CATEGORY_ID):
+    """같은 경기의 해설자별 하이라이트 영상 (자막 포함)"""
+    videos = []
+    for code_id in commentator_ids:
+        file_info = FileInfo.objects.create(file_path=f'videos/{title}-{code_id}.mp4')
+        video = HighlightVideo.objects.create(
+            video_file=file_info, highlight_title=title, match_date=match_date, video_category_id=category_id,
+        )
+        SubtitleInfo.objects.create(video_file=video, commentator_code_id=code_id, subtitle=b'[]')
+        videos.append(video)
+    return videos
+
+
+def create_upload(user, title='내 영상', status_id=22):
+    file_info = FileInfo.objects.create(file_path=f'videos/{user.pk}-{title}.mp4', file_size=1024)
+    return UserUploadVideo.objects.create(
+        upload_file=file_info, user=user, upload_title=title, upload_date=date.today(), upload_status_code_id=status_id,
+    )
+
+
+def login(client, user_id):
+    session = client.session
+    session['user_id'] = user_id
+    session.save()
+
+
+def clear_caches():
+    """캐시가 비어 있는 상태 (세션/유저 컨텍스트/카탈로그/공통 코드 모두 DB에서 다시 읽음)"""
+    cache.clear()
+    codes.invalidate()
+    invalidate_catalog()
+
+
+def run_parallel(func, count):
+    """
+    count 개 스레드에서 func(i) 를 동시에 시작해서 결과 목록 반환 (예외는 결과에 그대로 담는다)
+    스레드마다 DB 연결을 따로 쓰므로 TransactionTestCase 에서 사용하고, 끝나면 연결을 닫는다.
+    """
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def target(i):
+        try:
+            barrier.wait()
+            results[i] = func(i)
+        except Exception as e:
+            results[i] = e
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
@@ -0,0 +1,30 @@
+from django.test import TestCase
+from users.codes import codes
+from users.models import CommonCode
+from .fixtures import create_codes
+
+
+class TeamLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+
+    def setUp(self):
+        codes.invalidate()
+
+    def test_team_returns_favorite_code(self):
+        self.assertEqual(codes.team('lg').pk, 1)
+        self.assertEqual(codes.team('KIWOOM').common_code_grp, 'FAVORITE')
+        self.assertIsNone(codes.team('UNKNOWN'))
+
+    def test_team_ignores_other_groups_with_team_values(self):
+        # 다른 그룹에 구단 이름과 같은 값이 먼저(작은 id) 있어도 FAVORITE 코드를 돌려준다
+        CommonCode.objects.filter(pk=1).delete()
+        CommonCode.objects.bulk_create([
+            CommonCode(common_code=100, common_code_grp='CATEGORY', common_code_value='LG'),
+            CommonCode(common_code=0, common_code_grp='SEED', common_code_value='FAVORITE - LG'),
+            CommonCode(common_code=300, common_code_grp='FAVORITE', common_code_value='FAVORITE - LG'),
+            CommonCode(common_code=200, common_code_grp='FAVORITE', common_code_value='LG'),
+        ])
+        codes.invalidate()
+        self.assertEqual(codes.team('LG').pk, 200)
@@ -0,0 +1,80 @@
+import smtplib
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+from users.mailer import MailOutboxWorker, claim_emails
+from users.models import EmailOutbox
+
+
+class WorkerStopped(BaseException):
+    """발송 도중 워커 프로세스가 죽은 상황"""
+
+
+class SendBatchTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.items = [
+            EmailOutbox.objects.create(
+                kind=EmailOutbox.KIND_SIGNUP_CODE, to_email=f'user{i}@test.local', subject='인증번호', body=f'{i}',
+                next_run_at=now, expires_at=now + timedelta(minutes=5),
+            )
+            for i in range(3)
+        ]
+        self.worker = MailOutboxWorker(batch_size=10)
+        self.batch = claim_emails(self.worker.worker_id, 10)
+
+    def statuses(self):
+        return list(EmailOutbox.objects.order_by('pk').values_list('status', flat=True))
+
+    def test_marks_each_message_sent_when_accepted(self):
+        self.assertEqual(self.worker.send_batch(self.batch), 3)
+        self.assertEqual(self.statuses(), [EmailOutbox.STATUS_SENT] * 3)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_messages_sent_before_worker_dies_are_not_resent(self):
+        send = self.worker._send
+        calls = []
+
+        def send_then_die(message):
+            calls.append(message)
+            if len(calls) == 2:
+                raise WorkerStopped()
+            send(message)
+
+        with mock.patch.object(self.worker, '_send', side_effect=send_then_die):
+            with self.assertRaises(WorkerStopped):
+                self.worker.send_batch(self.batch)
+        self.assertEqual(self.statuses(), [EmailOutbox.STATUS_SENT, EmailOutbox.STATUS_SENDING, EmailOutbox.STATUS_SENDING])
+
+        # lease 가 만료된 뒤 다른 워커가 가져가도 보낸 메일은 다시 보내지 않는다
+        EmailOutbox.objects.filter(status=EmailOutbox.STATUS_SENDING).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        other = MailOutboxWorker(batch_size=10)
+        other.worker_id = 'other-worker'
+        reclaimed = claim_emails(other.worker_id, 10)
+        self.assertEqual([item.pk for item in reclaimed], [self.items[1].pk, self.items[2].pk])
+        other.send_batch(reclaimed)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [f'user{i}@test.local' for i in range(3)])
+
+    def test_skips_messages_reclaimed_by_another_worker(self):
+        EmailOutbox.objects.filter(pk=self.items[0].pk).update(locked_by='other-worker')
+        self.assertEqual(self.worker.send_batch(self.batch), 2)
+        self.assertEqual([m.to[0] for m in mail.outbox], ['user1@test.local', 'user2@test.local'])
+
+    def test_disconnect_while_sending_is_not_resent_immediately(self):
+        with mock.patch('users.mailer.EmailMessage.send', side_effect=smtplib.SMTPServerDisconnected()) as send:
+            self.assertEqual(self.worker.send_batch(self.batch[:1]), 0)
+        send.assert_called_once()
+        item = EmailOutbox.objects.get(pk=self.items[0].pk)
+        self.assertEqual(item.status, EmailOutbox.STATUS_PENDING)
+        self.assertGreater(item.next_run_at, timezone.now())
+
+    def test_idle_connection_is_checked_before_sending(self):
+        stale = mock.Mock()
+        stale.connection.noop.side_effect = smtplib.SMTPServerDisconnected()
+        self.worker._connection = stale
+        self.worker._last_used = 0.0
+        self.assertEqual(self.worker.send_batch(self.batch[:1]), 1)
+        stale.close.assert_called_once()
+        self.assertIsNot(self.worker._connection, stale)
@@ -0,0 +1,34 @@
+import hashlib
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import TestCase, override_settings
+from users import passwords
+from .fixtures import create_codes, create_user
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class VerifyPasswordTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+
+    def test_legacy_sha256_hash_is_upgraded_on_login(self):
+        user = create_user(password=hashlib.sha256(b'secret123').hexdigest())
+        self.assertTrue(passwords.verify_password(user, 'secret123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertFalse(passwords.verify_password(user, 'wrong'))
+
+    def test_stock_pbkdf2_hash_is_verified_and_rehashed_with_current_iterations(self):
+        hasher = PBKDF2PasswordHasher()
+        user = create_user(password=hasher.encode('secret123', hasher.salt(), 2000))
+        self.assertTrue(passwords.verify_password(user, 'secret123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_wrong_password_keeps_stored_hash(self):
+        encoded = passwords.hash_password('secret123')
+        user = create_user(password=encoded)
+        self.assertFalse(passwords.verify_password(user, 'wrong'))
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+        self.assertTrue(passwords.matches('secret123', encoded))
@@ -0,0 +1,118 @@
+import pickle
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from payments.models import SubscribeHistory
+from payments.subscription_state import refresh_subscription_state
+from users.context import load_user_context, _user_context_cache
+from users.models import UserInfo
+from .fixtures import TEST_STORAGES, create_codes, create_user, subscribe, create_highlight_versions, create_upload, login, clear_caches
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class ViewQueryCountTests(TestCase):
+    """
+    화면별 쿼리 수 고정 (UserContext 로 유저/구독 조회를 모은 결과)
+    - cold: 캐시가 비어 있을 때 (세션 + 유저 컨텍스트 + 화면 데이터)
+    - warm: 같은 화면을 다시 열 때 (유저 컨텍스트/카탈로그/공통 코드는 캐시에서)
+    """
+
+    # URL 이름: (cold, warm) - 홈/목록은 카탈로그 구역(내 구단 / 다른 경기)마다 영상 조회 1번
+    EXPECTED = {
+        'home': (8, 2),
+        'list': (6, 1),
+        'play': (6, 3),
+        'play_user': (5, 3),
+        'myvideos': (3, 1),
+        'setting': (3, 1),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.user = create_user()
+        subscribe(cls.user)
+        cls.highlights = create_highlight_versions('LG vs 한화')
+        create_highlight_versions('KT vs NC', commentator_ids=(17,))
+        cls.uploads = [create_upload(cls.user, f'직관 {i}') for i in range(3)]
+
+    def setUp(self):
+        login(self.client, self.user.pk)
+        refresh_subscription_state(self.user.pk)
+        clear_caches()
+
+    def urls(self):
+        return {
+            'home': '/videos/home',
+            'list': '/videos/list/?type=other&page=1',
+            'play': f'/videos/play/{self.highlights[0].pk}/',
+            'play_user': f'/videos/play/user/{self.uploads[0].pk}/',
+            'myvideos': '/videos/myvideos',
+            'setting': '/setting',
+        }
+
+    def assert_queries(self, name, url, count):
+        with self.subTest(view=name), self.assertNumQueries(count):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_cold_cache_query_counts(self):
+        for name, url in self.urls().items():
+            clear_caches()
+            self.assert_queries(name, url, self.EXPECTED[name][0])
+
+    def test_warm_cache_query_counts(self):
+        for name, url in self.urls().items():
+            self.client.get(url)
+            self.assert_queries(name, url, self.EXPECTED[name][1])
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        for i in range(10):
+            create_upload(self.user, f'추가 {i}')
+            create_highlight_versions(f'추가 경기 {i}', commentator_ids=(17, 18))
+        for name, url in self.urls().items():
+            clear_caches()
+            self.assert_queries(name, url, self.EXPECTED[name][0])
+
+
+class UserContextTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.user = create_user(password='pbkdf2_sha256$1000$salt$secret-hash')
+        subscribe(cls.user, storage_limit=2048)
+
+    def setUp(self):
+        refresh_subscription_state(self.user.pk)
+        clear_caches()
+
+    def test_loads_user_team_and_subscription_in_one_query(self):
+        with self.assertNumQueries(1):
+            ctx = load_user_context(self.user.pk)
+            self.assertEqual(ctx.team_code, 'LG')
+            self.assertEqual(ctx.subscription_state.storage_limit, 2048)
+        with self.assertNumQueries(0):
+            load_user_context(self.user.pk)
+
+    def test_settings_write_invalidates_cached_context(self):
+        load_user_context(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            user = UserInfo.objects.get(pk=self.user.pk)
+            user.favorite_code_id = 2
+            user.save()
+        self.assertEqual(load_user_context(self.user.pk).team_code, 'HANWHA')
+
+    def test_subscription_write_invalidates_cached_context(self):
+        load_user_context(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            SubscribeHistory.objects.filter(user=self.user).update(subscribe_end_dt=timezone.now() - timedelta(days=1))
+            sub = SubscribeHistory.objects.get(user=self.user)
+            sub.save()
+        self.assertIsNone(load_user_context(self.user.pk).subscription_state.current_plan)
+
+    def test_cached_context_holds_no_password_hash(self):
+        load_user_context(self.user.pk)
+        cached = cache.get(_user_context_cache._full_key(self.user.pk))  # 공유 캐시에 저장된 값 그대로
+        self.assertIn('password', cached.user.get_deferred_fields())
+        self.assertNotIn(b'secret-hash', pickle.dumps(cached))
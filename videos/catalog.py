@@ -0,0 +1,144 @@
+import json
+import base64
+import binascii
+from SKN17_FINAL_3TEAM.caching import TieredCache
+from users.codes import TEAM_META_DATA
+from .models import HighlightVideo, SubtitleInfo
+
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+KBO_CATEGORY_ID = 11
+PREFERRED_COMMENTATOR = "박찬호"
+
+TEAM_KOREA_MAP = {
+    'K-BASEBALL': {'id': 12, 'name': '2025 K-BASEBALL SERIES'},
+    'ASIAN': {'id': 13, 'name': 'ASIAN GAMES'},
+    'OLYMPIC': {'id': 14, 'name': 'OLYMPICS'},
+    'PREMIER': {'id': 15, 'name': 'WBSC PREMIER 12'},
+    'WBC': {'id': 16, 'name': 'WORLD BASEBALL CLASSIC'},
+}
+SORT_ORDERING = {
+    'latest': ('-match_date', '-video_file_id'),
+    'oldest': ('match_date', 'video_file_id'),
+    'name': ('highlight_title', 'video_file_id'),
+}
+# 정렬 옵션별 keyset 커서 컬럼 / 내림차순 여부
+SORT_KEY_FIELD = {'latest': 'match_date', 'oldest': 'match_date', 'name': 'highlight_title'}
+SORT_DESCENDING = {'latest'}
+
+
+# 공유 캐시 + 워커별 로컬 LRU. 하이라이트 변경은 드물어서 다른 워커에 최대 5초 늦게 반영되어도 무방하다.
+_catalog_cache = TieredCache('videos:catalog', timeout=CATALOG_TIMEOUT, local_ttl=5)
+
+
+def invalidate_catalog():
+    """하이라이트/자막 변경 시 버전을 갱신하여 모든 카탈로그를 재계산하게 함"""
+    _catalog_cache.invalidate()
+
+
+def _deduplicate_rows(queryset, sort_option):
+    """
+    제목당 영상 하나만 남긴다. 먼저 나온 영상의 위치를 유지하되,
+    뒤에 나온 같은 제목의 영상이 선호 해설자 버전이면 그 영상으로 교체한다.
+    Returns: (video_file_id, highlight_title, 커서 키) 목록
+    커서 키는 목록상 위치를 정한 행의 (정렬값, video_file_id)로, 목록 순서와 항상 단조 관계이다.
+    """
+    key_field = SORT_KEY_FIELD[sort_option]
+    rows = list(queryset.order_by(*SORT_ORDERING[sort_option]).values_list(
+        'video_file_id', 'highlight_title', key_field
+    ))
+    # DB 콜레이션과 무관하게 커서 비교와 같은 기준으로 정렬을 고정
+    rows.sort(key=lambda row: (str(row[2]), row[0]), reverse=sort_option in SORT_DESCENDING)
+    commentators = {}
+    subtitle_rows = SubtitleInfo.objects.filter(
+        video_file__in=queryset.order_by().values('video_file_id')
+    ).order_by('pk').values_list('video_file_id', 'commentator_code__common_code_value')
+    for vid, commentator in subtitle_rows:
+        commentators.setdefault(vid, commentator or "")
+
+    video_map = {}
+    position_keys = {}
+    for vid, title, sort_value in rows:
+        if title not in video_map:
+            video_map[title] = vid
+            position_keys[title] = [str(sort_value), vid]
+        elif PREFERRED_COMMENTATOR in commentators.get(vid, ""):
+            video_map[title] = vid
+    return [(vid, title, position_keys[title]) for title, vid in video_map.items()]
+
+
+def _build_catalog(target_code, sort_option):
+    if target_code in TEAM_KOREA_MAP:
+        info = TEAM_KOREA_MAP[target_code]
+        my_team_qs = HighlightVideo.objects.filter(video_category_id=info['id'])
+        return {
+            'my_team': _deduplicate_rows(my_team_qs, 'latest'),
+            'other': [],
+            'other_sort': sort_option,
+            'is_team_korea': True,
+            'display_name': info['name'],
+        }
+
+    korean_name = TEAM_META_DATA.get(target_code, TEAM_META_DATA['SAMSUNG'])['name']
+    kbo_qs = HighlightVideo.objects.filter(video_category_id=KBO_CATEGORY_ID)
+    my_team_qs = kbo_qs.filter(highlight_title__icontains=korean_name)
+    other_qs = kbo_qs.exclude(video_file_id__in=my_team_qs.values_list('video_file_id', flat=True))
+
+    return {
+        'my_team': _deduplicate_rows(my_team_qs, 'latest'),
+        'other': _deduplicate_rows(other_qs, sort_option),
+        'other_sort': sort_option,
+        'is_team_korea': False,
+        'display_name': korean_name,
+    }
+
+
+def get_catalog(target_code, sort_option='latest'):
+    """
+    팀/카테고리, 정렬 옵션별로 중복 제거된 (video_file_id, highlight_title, 커서 키) 목록을 반환한다.
+    my_team 목록은 항상 최신순, other 목록은 sort_option 순서이다.
+    결과는 카탈로그 버전이 바뀔 때까지 캐시에서 재사용된다. (반환값은 읽기 전용)
+    """
+    if sort_option not in SORT_ORDERING:
+        sort_option = 'latest'
+    if target_code not in TEAM_KOREA_MAP and target_code not in TEAM_META_DATA:
+        target_code = 'SAMSUNG'
+    return _catalog_cache.get_or_set(
+        f"{target_code}:{sort_option}", lambda: _build_catalog(target_code, sort_option)
+    )
+
+
+def encode_cursor(position_key):
+    """커서 키 -> 불투명(opaque) 커서 문자열"""
+    raw = json.dumps(position_key, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열 -> 커서 키 (빈 값이면 None)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, vid = json.loads(raw.decode('utf-8'))
+        return [str(sort_value), int(vid)]
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("잘못된 커서입니다.")
+
+
+def rows_after(rows, position_key, sort_option):
+    """커서 키 바로 다음 위치부터의 인덱스를 이진 탐색으로 찾는다."""
+    if position_key is None:
+        return 0
+    descending = sort_option in SORT_DESCENDING
+    target = tuple(position_key)
+    lo, hi = 0, len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        key = tuple(rows[mid][2])
+        passed = key >= target if descending else key <= target
+        if passed:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -0,0 +1,265 @@
+import os
+import time
+import socket
+import logging
+import functools
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction, close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import UploadJob
+from .runpod import runpod_client
+from . import quota
+from .poller import RunPodStatusPoller
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """다른 워커가 작업을 가져간 경우"""
+
+
+def enqueue_upload_job(user_upload_instance, db_analyst_id):
+    """업로드 영상 처리 작업 등록 (실제 처리는 run_upload_worker가 담당)"""
+    return UploadJob.objects.create(
+        upload_file=user_upload_instance,
+        analyst_code=db_analyst_id,
+        max_attempts=settings.UPLOAD_JOB_MAX_ATTEMPTS,
+    )
+
+
+def claim_jobs(worker_id, limit):
+    """실행 가능한 작업을 lease와 함께 가져온다 (대기 작업 + lease 만료된 작업)"""
+    if limit <= 0:
+        return []
+
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.UPLOAD_JOB_LEASE_SECONDS)
+
+    with transaction.atomic():
+        job_ids = list(
+            UploadJob.objects.select_for_update(skip_locked=True).filter(
+                Q(status=UploadJob.STATUS_PENDING, next_run_at__lte=now) |
+                Q(status=UploadJob.STATUS_RUNNING, lease_expires_at__lt=now)
+            ).order_by('next_run_at').values_list('pk', flat=True)[:limit]
+        )
+        if not job_ids:
+            return []
+
+        UploadJob.objects.filter(pk__in=job_ids).update(
+            status=UploadJob.STATUS_RUNNING,
+            locked_by=worker_id,
+            lease_expires_at=lease_until,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+
+    return list(UploadJob.objects.select_related('upload_file__upload_file').filter(pk__in=job_ids, locked_by=worker_id))
+
+
+class _LeaseKeeper(threading.Thread):
+    """
+    작업 실행 중 lease를 주기적으로(lease의 1/3) 연장하는 heartbeat 스레드.
+    S3 업로드처럼 오래 걸리는 단계에서도 다른 워커가 작업을 중복으로 가져가지 않게 한다.
+    """
+
+    def __init__(self, job, worker_id):
+        super().__init__(daemon=True, name=f'upload-job-lease-{job.pk}')
+        self.job = job
+        self.worker_id = worker_id
+        self.lost = False
+        self._done = threading.Event()
+
+    def run(self):
+        interval = settings.UPLOAD_JOB_LEASE_SECONDS / 3
+        try:
+            while not self._done.wait(interval):
+                updated = UploadJob.objects.filter(pk=self.job.pk, locked_by=self.worker_id).update(
+                    lease_expires_at=timezone.now() + timedelta(seconds=settings.UPLOAD_JOB_LEASE_SECONDS),
+                    updated_at=timezone.now(),
+                )
+                if not updated:
+                    self.lost = True
+                    break
+        except Exception as e:
+            logger.error(f"⚠️ 작업 {self.job.pk} heartbeat 실패: {e}")
+        finally:
+            close_old_connections()
+
+    def check(self):
+        """모니터링 루프에서 호출 - lease를 잃었으면 중단"""
+        if self.lost:
+            raise LeaseLost(f"작업 {self.job.pk}의 lease를 잃었습니다.")
+
+    def stop(self):
+        self._done.set()
+
+
+def _finish(job, worker_id, status, error=None):
+    UploadJob.objects.filter(pk=job.pk, locked_by=worker_id).update(
+        status=status,
+        locked_by=None,
+        lease_expires_at=None,
+        last_error=error,
+        updated_at=timezone.now(),
+    )
+
+
+def _retry_or_fail(job, worker_id, error):
+    if job.attempts < job.max_attempts:
+        delay = settings.UPLOAD_JOB_RETRY_BACKOFF * (2 ** (job.attempts - 1))
+        UploadJob.objects.filter(pk=job.pk, locked_by=worker_id).update(
+            status=UploadJob.STATUS_PENDING,
+            next_run_at=timezone.now() + timedelta(seconds=delay),
+            locked_by=None,
+            lease_expires_at=None,
+            last_error=error,
+            updated_at=timezone.now(),
+        )
+        logger.warning(f"🔁 작업 {job.pk} 재시도 예약 ({job.attempts}/{job.max_attempts}, {delay}초 후): {error}")
+    else:
+        _finish(job, worker_id, UploadJob.STATUS_FAILED, error)
+        runpod_client._update_status(job.upload_file, 23)
+        logger.error(f"❌ 작업 {job.pk} 최종 실패: {error}")
+
+
+def _on_runpod_finished(job, worker_id, status_data):
+    """
+    폴러가 종료 상태를 받았을 때 호출되는 후처리
+    폴러는 이 시점에 작업을 tracked_keys 에서 빼므로, 후처리 동안에는 여기서 lease를 연장한다.
+    """
+    raw_status = str(status_data.get('status', '')).upper()
+    lease = _LeaseKeeper(job, worker_id)
+    lease.start()
+    try:
+        if raw_status in ('COMPLETED', 'SUCCESS'):
+            logger.info("✅ RunPod 작업 완료! 결과 처리 시작...")
+            succeeded = runpod_client.handle_completed(job.upload_file, job.analyst_code, job.output_key, job.script_key)
+        else:
+            if raw_status == 'FAILED':
+                logger.error(f"❌ RunPod 작업 실패: {status_data.get('error')}")
+            runpod_client._update_status(job.upload_file, 23)
+            succeeded = False
+
+        error = None if succeeded else (status_data.get('error') or raw_status)
+        _finish(job, worker_id, UploadJob.STATUS_DONE if succeeded else UploadJob.STATUS_FAILED, error)
+    finally:
+        lease.stop()
+        close_old_connections()
+
+
+def run_job(job, worker_id, poller):
+    """
+    작업 하나를 RunPod에 제출하고 폴러에 모니터링을 맡긴다.
+    이미 RunPod에 제출된 작업(재시작 후 재개)이면 제출 없이 바로 모니터링을 등록한다.
+    """
+    upload = job.upload_file
+    lease = _LeaseKeeper(job, worker_id)
+    lease.start()
+    try:
+        if not job.runpod_job_id:
+            submitted = runpod_client.submit_processing(upload, job.analyst_code)
+            lease.check()
+            job.runpod_job_id = submitted['job_id']
+            job.output_key = submitted['output_key']
+            job.script_key = submitted['script_key']
+            job.submitted_at = timezone.now()
+            UploadJob.objects.filter(pk=job.pk, locked_by=worker_id).update(
+                runpod_job_id=job.runpod_job_id,
+                output_key=job.output_key,
+                script_key=job.script_key,
+                submitted_at=job.submitted_at,
+                updated_at=job.submitted_at,
+            )
+        else:
+            logger.info(f"♻️ 작업 {job.pk} 모니터링 재개 (RunPod Job ID: {job.runpod_job_id})")
+
+        poller.track(
+            job.pk,
+            job.runpod_job_id,
+            job.submitted_at.timestamp(),
+            functools.partial(_on_runpod_finished, job, worker_id),
+        )
+
+    except LeaseLost as e:
+        logger.warning(f"⚠️ {e}")
+    except Exception as e:
+        _retry_or_fail(job, worker_id, str(e))
+    finally:
+        lease.stop()
+        close_old_connections()
+
+
+def renew_leases(job_ids, worker_id):
+    """폴러가 모니터링 중인 작업들의 lease를 한 번의 UPDATE로 연장"""
+    if not job_ids:
+        return 0
+    return UploadJob.objects.filter(pk__in=job_ids, locked_by=worker_id).update(
+        lease_expires_at=timezone.now() + timedelta(seconds=settings.UPLOAD_JOB_LEASE_SECONDS),
+        updated_at=timezone.now(),
+    )
+
+
+def reconcile_storage_if_due():
+    """여러 워커 중 한 곳에서만 STORAGE_RECONCILE_INTERVAL 마다 저장공간 점검 (만료 예약 해제 + S3 크기로 사용량 보정)"""
+    if not cache.add('videos:storage_reconcile', 1, timeout=settings.STORAGE_RECONCILE_INTERVAL):
+        return None
+    result = quota.reconcile_storage_usage()
+    logger.info(f"🧮 저장공간 점검 완료: {result}")
+    return result
+
+
+class UploadJobWorker:
+    """
+    작업 큐 워커
+    - 제출(S3 업로드 + RunPod 요청)은 concurrency 개의 스레드에서 수행
+    - 제출된 작업의 상태 확인은 RunPodStatusPoller 하나(스레드 1개)가 모두 담당
+    - 동시에 RunPod에 올라가 있는 작업 수는 max_in_flight로 제한
+    """
+
+    def __init__(self, concurrency=None, poll_interval=2.0, max_in_flight=None):
+        self.concurrency = concurrency or settings.UPLOAD_JOB_CONCURRENCY
+        self.max_in_flight = max_in_flight or settings.UPLOAD_JOB_MAX_IN_FLIGHT
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.poller = RunPodStatusPoller()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        logger.info(f"👷 업로드 워커 시작 ({self.worker_id}, 동시 제출 {self.concurrency}, 최대 진행 {self.max_in_flight})")
+        self.poller.start()
+        renew_interval = settings.UPLOAD_JOB_LEASE_SECONDS / 3
+        last_renew = time.monotonic()
+        last_reconcile = 0.0
+        active = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='upload-job') as pool:
+            while not self._stop.is_set():
+                active = {f for f in active if not f.done()}
+                tracked = self.poller.tracked_keys()
+                try:
+                    limit = min(self.concurrency - len(active), self.max_in_flight - len(active) - len(tracked))
+                    for job in claim_jobs(self.worker_id, limit):
+                        active.add(pool.submit(run_job, job, self.worker_id, self.poller))
+
+                    if time.monotonic() - last_renew >= renew_interval:
+                        renew_leases(tracked, self.worker_id)
+                        last_renew = time.monotonic()
+
+                    if time.monotonic() - last_reconcile >= settings.STORAGE_RECONCILE_INTERVAL:
+                        last_reconcile = time.monotonic()
+                        reconcile_storage_if_due()
+                except Exception as e:
+                    logger.error(f"⚠️ 작업 조회 중 에러 발생: {e}")
+                    close_old_connections()
+                self._stop.wait(self.poll_interval)
+
+        # 모니터링 중이던 작업은 lease 만료 후 다음 워커가 이어서 처리한다.
+        self.poller.stop(wait=False)
+        logger.info("👷 업로드 워커 종료")
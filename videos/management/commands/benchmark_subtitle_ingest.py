@@ -0,0 +1,79 @@
+import gc
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+from django.core.management.base import BaseCommand
+from videos import subtitle_ingest, subtitles
+
+
+def write_timeline(fp, target_bytes, overlap_rate):
+    """RunPod 출력과 같은 형식의 타임라인 JSON을 target_bytes 이상 생성"""
+    fp.write(b'[')
+    t = 0.0
+    count = 0
+    while fp.tell() < target_bytes:
+        length = random.uniform(1.5, 6.0)
+        start = t - random.uniform(0.1, 1.0) if random.random() < overlap_rate else t
+        item = {
+            'set_start_sec': round(max(0.0, start), 2),
+            'set_end_sec': round(start + length, 2),
+            'caster_text': f'{count}번째 타석, 투수가 던집니다! 스트라이크 존 바깥쪽 낮은 공입니다.',
+            'analyst_text': '이 카운트에서는 변화구 승부가 유리해 보입니다.' if count % 3 else '',
+        }
+        if count:
+            fp.write(b',\n')
+        fp.write(json.dumps(item, ensure_ascii=False).encode('utf-8'))
+        t = start + length
+        count += 1
+    fp.write(b']')
+    fp.flush()
+    return count
+
+
+def legacy_ingest(fp):
+    """기존 방식: 전체를 읽어 json.loads 후 리스트로 변환"""
+    raw_data = json.loads(fp.read().decode('utf-8'))
+    processed_data = [s for s in map(subtitle_ingest.normalize_item, raw_data) if s]
+    return subtitles.encode(processed_data)
+
+
+def measure(func, fp):
+    """처리 시간은 tracemalloc 없이, 최대 메모리는 tracemalloc으로 따로 측정"""
+    fp.seek(0)
+    gc.collect()
+    started = time.perf_counter()
+    result = func(fp)
+    elapsed = time.perf_counter() - started
+
+    fp.seek(0)
+    gc.collect()
+    tracemalloc.start()
+    func(fp)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+class Command(BaseCommand):
+    help = '대용량(10MB 이상) 자막 타임라인 변환의 처리 시간과 최대 메모리를 기존 방식과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=float, default=12.0, help='생성할 원본 타임라인 크기(MB)')
+        parser.add_argument('--overlap-rate', type=float, default=0.1, help='앞 자막과 겹치는 항목 비율 (0~1)')
+        parser.add_argument('--seed', type=int, default=17)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        with tempfile.TemporaryFile() as fp:
+            count = write_timeline(fp, int(options['size_mb'] * 1024 * 1024), options['overlap_rate'])
+            size = fp.tell()
+            self.stdout.write(f'원본 타임라인: {count:,}개 항목 / {size / 1024 / 1024:.1f}MB')
+
+            legacy_blob, legacy_time, legacy_peak = measure(legacy_ingest, fp)
+            (blob, stats), stream_time, stream_peak = measure(subtitle_ingest.ingest, fp)
+
+        self.stdout.write(f'기존 방식  : {legacy_time:6.2f}s / 최대 메모리 {legacy_peak / 1024 / 1024:7.1f}MB / 결과 {len(legacy_blob):,} bytes')
+        self.stdout.write(f'스트리밍   : {stream_time:6.2f}s / 최대 메모리 {stream_peak / 1024 / 1024:7.1f}MB / 결과 {len(blob):,} bytes')
+        self.stdout.write(self.style.SUCCESS(f'변환 결과: {stats}'))
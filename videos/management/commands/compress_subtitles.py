@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from videos.models import SubtitleInfo
+from videos import subtitles
+
+
+class Command(BaseCommand):
+    help = '이전 포맷(압축하지 않은 JSON) 자막을 압축 포맷으로 일괄 변환합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='한 번에 읽고 저장할 자막 수')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 변환 결과만 집계')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        started = time.perf_counter()
+
+        scanned = converted = failed = 0
+        bytes_before = bytes_after = 0
+        last_pk = 0
+
+        # 자막 blob이 크므로 PK 기준으로 잘라서 읽는다.
+        while True:
+            rows = list(
+                SubtitleInfo.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'subtitle')[:batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            updates = []
+            for pk, blob in rows:
+                scanned += 1
+                try:
+                    new_blob = subtitles.convert(blob)
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'자막 {pk} 변환 실패: {e}')
+                    continue
+                if new_blob is None:
+                    continue
+                bytes_before += len(blob)
+                bytes_after += len(new_blob)
+                updates.append(SubtitleInfo(pk=pk, subtitle=new_blob))
+
+            converted += len(updates)
+            if updates and not dry_run:
+                with transaction.atomic():
+                    SubtitleInfo.objects.bulk_update(updates, ['subtitle'])
+
+        elapsed = time.perf_counter() - started
+        ratio = f'{bytes_after / bytes_before:.1%}' if bytes_before else '-'
+        prefix = '[DRY-RUN] ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}자막 변환 완료: 검사 {scanned}건 / 변환 {converted}건 / 실패 {failed}건 '
+            f'({bytes_before:,} → {bytes_after:,} bytes, {ratio}, {elapsed:.2f}s)'
+        ))
@@ -0,0 +1,94 @@
+import json
+import time
+import uuid
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+
+
+class FakeRunPodState:
+    """제출된 작업별로 경과 시간에 따라 진행률/상태를 계산하는 가짜 RunPod 상태 저장소"""
+
+    def __init__(self, duration, fail_rate):
+        self.duration = duration
+        self.fail_rate = fail_rate
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, payload):
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.jobs[job_id] = {
+                'started': time.time(),
+                'duration': self.duration * random.uniform(0.5, 1.5),
+                'will_fail': random.random() < self.fail_rate,
+                'payload': payload,
+            }
+        return job_id
+
+    def status(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return None
+
+        progress = min(100, int((time.time() - job['started']) / job['duration'] * 100))
+        if progress >= 100:
+            if job['will_fail']:
+                return {'status': 'FAILED', 'error': 'fake runpod failure'}
+            return {'status': 'COMPLETED', 'progress': 100}
+        if progress < 5:
+            return {'status': 'IN_QUEUE', 'progress': 0}
+        return {'status': 'IN_PROGRESS', 'progress': progress, 'step': 'processing'}
+
+
+def make_handler(state):
+    class FakeRunPodHandler(BaseHTTPRequestHandler):
+        def _send(self, code, body):
+            raw = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self):
+            if self.path != '/process_video':
+                return self._send(404, {'error': 'not found'})
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            self._send(200, {'job_id': state.submit(payload)})
+
+        def do_GET(self):
+            if not self.path.startswith('/status/'):
+                return self._send(404, {'error': 'not found'})
+            status = state.status(self.path[len('/status/'):])
+            if status is None:
+                return self._send(404, {'status': 'FAILED', 'error': 'unknown job'})
+            self._send(200, status)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeRunPodHandler
+
+
+class Command(BaseCommand):
+    help = '로컬 테스트용 가짜 RunPod 서버를 실행합니다. (RUNPOD_API_URL=http://127.0.0.1:<port>)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--duration', type=float, default=60.0, help='작업 평균 처리 시간(초)')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='실패로 끝나는 작업 비율 (0~1)')
+
+    def handle(self, *args, **options):
+        state = FakeRunPodState(options['duration'], options['fail_rate'])
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), make_handler(state))
+        self.stdout.write(self.style.SUCCESS(f"가짜 RunPod 서버 실행 중: http://127.0.0.1:{options['port']}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,18 @@
+import time
+from django.core.management.base import BaseCommand
+from videos.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = '하이라이트/유저 업로드 영상 제목 검색 색인을 전체 재생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk_create 단위')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        highlight_count, upload_count = rebuild_index(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'검색 색인 재생성 완료: 하이라이트 {highlight_count}건 / 업로드 {upload_count}건 ({elapsed:.2f}s)'
+        ))
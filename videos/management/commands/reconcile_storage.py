@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from videos.quota import reconcile_storage_usage
+
+
+class Command(BaseCommand):
+    help = ('만료된 저장공간 예약을 해제하고, S3 객체 크기(list_objects_v2)로 유저별 사용량을 다시 계산합니다. '
+            '(업로드 워커가 STORAGE_RECONCILE_INTERVAL 마다 자동 실행)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='보정할 대상만 출력하고 저장하지 않음')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = reconcile_storage_usage(dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"저장공간 점검 완료: 만료 예약 해제 {result['released']}건 / 파일 크기 보정 {result['files']}건 / "
+            f"사용량 보정 {result['users']}명 ({elapsed:.2f}s)"
+        ))
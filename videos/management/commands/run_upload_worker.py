@@ -0,0 +1,30 @@
+import signal
+from django.core.management.base import BaseCommand
+from videos.jobs import UploadJobWorker
+
+
+class Command(BaseCommand):
+    help = '업로드 영상 처리 작업 큐 워커를 실행합니다. (웹 워커와 별도 프로세스로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None, help='동시에 처리할 작업 수 (기본: UPLOAD_JOB_CONCURRENCY)')
+        parser.add_argument('--max-in-flight', type=int, default=None, help='동시에 모니터링할 RunPod 작업 수 (기본: UPLOAD_JOB_MAX_IN_FLIGHT)')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='작업 조회 주기(초)')
+
+    def handle(self, *args, **options):
+        worker = UploadJobWorker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            max_in_flight=options['max_in_flight'],
+        )
+
+        # 종료 신호를 받으면 새 작업만 멈추고 진행 중인 작업은 마무리한다.
+        # 강제 종료되더라도 lease 만료 후 다른 워커가 이어서 처리한다.
+        def _graceful_stop(signum, frame):
+            self.stdout.write(self.style.WARNING('종료 신호 수신 - 진행 중인 작업 완료 후 종료합니다.'))
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, _graceful_stop)
+        signal.signal(signal.SIGINT, _graceful_stop)
+
+        worker.run()
@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from users.models import UserInfo
+from videos import quota
+from videos.models import UserUploadVideo
+
+
+class Command(BaseCommand):
+    help = ('저장공간 사용량 / 다운로드 횟수를 여러 스레드에서 동시에 늘려서 '
+            '증가분 유실이나 한도 초과가 없는지 확인합니다. (확인 후 원래 값으로 복구)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', required=True, help='테스트 유저 ID')
+        parser.add_argument('--requests', type=int, default=50, help='카운터별 동시 요청 수')
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--size-kb', type=int, default=1024, help='업로드 1건당 증가시킬 사용량(KB)')
+
+    def handle(self, *args, **options):
+        user_id = options['user_id']
+        total = options['requests']
+        size_kb = options['size_kb']
+
+        def run(func):
+            def call(_):
+                try:
+                    func()
+                    return True
+                except (ValueError, PermissionError):
+                    return False
+                finally:
+                    close_old_connections()
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+                results = list(pool.map(call, range(total)))
+            return sum(results), time.perf_counter() - started
+
+        errors = []
+
+        # 저장공간: 한도를 요청 수의 절반 만큼만 남겨 두고 동시에 증가
+        original_usage = UserInfo.objects.values_list('storage_usage', flat=True).get(user_id=user_id)
+        allowed = total // 2
+        limit_kb = original_usage + allowed * size_kb
+        try:
+            succeeded, elapsed = run(lambda: quota.add_storage_usage(user_id, size_kb, limit_kb))
+            usage = UserInfo.objects.values_list('storage_usage', flat=True).get(user_id=user_id)
+        finally:
+            UserInfo.objects.filter(user_id=user_id).update(storage_usage=original_usage)
+        self.stdout.write(f'저장공간: 성공 {succeeded}/{total}건 (허용 {allowed}건), '
+                          f'사용량 +{usage - original_usage}KB (기대 +{succeeded * size_kb}KB), {elapsed:.2f}s')
+        if succeeded != allowed or usage != original_usage + succeeded * size_kb:
+            errors.append('저장공간')
+
+        # 다운로드 횟수: 0에서 시작해서 동시에 증가
+        video = UserUploadVideo.objects.filter(user_id=user_id).first()
+        if video is None:
+            raise CommandError('테스트 유저의 업로드 영상이 없습니다.')
+        original_count = video.download_count
+        UserUploadVideo.objects.filter(pk=video.pk).update(download_count=0)
+        try:
+            succeeded, elapsed = run(lambda: quota.increment_download_count(video.pk))
+            count = UserUploadVideo.objects.values_list('download_count', flat=True).get(pk=video.pk)
+        finally:
+            UserUploadVideo.objects.filter(pk=video.pk).update(download_count=original_count)
+        allowed = min(total, quota.DOWNLOAD_LIMIT)
+        self.stdout.write(f'다운로드: 성공 {succeeded}/{total}건 (허용 {allowed}건), 횟수 {count}, {elapsed:.2f}s')
+        if succeeded != allowed or count != succeeded:
+            errors.append('다운로드')
+
+        if errors:
+            raise CommandError(f'카운터 불일치: {", ".join(errors)}')
+        self.stdout.write(self.style.SUCCESS('증가분 유실 / 한도 초과 없음'))
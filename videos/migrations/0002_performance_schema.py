@@ -0,0 +1,123 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_performance_schema'),
+        ('videos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                ('search_index_id', models.BigAutoField(db_column='SEARCH_INDEX_ID', primary_key=True, serialize=False)),
+                ('token', models.CharField(db_column='TOKEN', max_length=2)),
+                ('doc_type', models.CharField(choices=[('HIGHLIGHT', '하이라이트 영상'), ('UPLOAD', '유저 업로드 영상')], db_column='DOC_TYPE', max_length=10)),
+                ('doc_id', models.BigIntegerField(db_column='DOC_ID')),
+            ],
+            options={
+                'verbose_name': '검색 색인',
+                'verbose_name_plural': '검색 색인 목록',
+                'db_table': 'SEARCH_INDEX',
+            },
+        ),
+        migrations.CreateModel(
+            name='StorageReservation',
+            fields=[
+                ('reservation_id', models.BigAutoField(db_column='RESERVATION_ID', primary_key=True, serialize=False)),
+                ('size_kb', models.IntegerField(db_column='SIZE_KB')),
+                ('object_key', models.CharField(blank=True, db_column='OBJECT_KEY', max_length=500, null=True)),
+                ('upload_id', models.CharField(blank=True, db_column='UPLOAD_ID', help_text='S3 멀티파트 업로드 ID', max_length=200, null=True)),
+                ('expires_at', models.DateTimeField(db_column='EXPIRES_AT')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')),
+            ],
+            options={
+                'verbose_name': '저장공간 예약',
+                'verbose_name_plural': '저장공간 예약 목록',
+                'db_table': 'STORAGE_RESERVATION',
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('job_id', models.BigAutoField(db_column='JOB_ID', primary_key=True, serialize=False)),
+                ('analyst_code', models.IntegerField(db_column='ANALYST_CODE', help_text='COMMENTATOR 공통 코드')),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('RUNNING', '처리 중'), ('DONE', '완료'), ('FAILED', '실패')], db_column='STATUS', default='PENDING', max_length=10)),
+                ('attempts', models.IntegerField(db_column='ATTEMPTS', default=0)),
+                ('max_attempts', models.IntegerField(db_column='MAX_ATTEMPTS', default=3)),
+                ('runpod_job_id', models.CharField(blank=True, db_column='RUNPOD_JOB_ID', max_length=100, null=True)),
+                ('output_key', models.CharField(blank=True, db_column='OUTPUT_KEY', max_length=500, null=True)),
+                ('script_key', models.CharField(blank=True, db_column='SCRIPT_KEY', max_length=500, null=True)),
+                ('submitted_at', models.DateTimeField(blank=True, db_column='SUBMITTED_AT', null=True)),
+                ('next_run_at', models.DateTimeField(db_column='NEXT_RUN_AT', default=django.utils.timezone.now)),
+                ('locked_by', models.CharField(blank=True, db_column='LOCKED_BY', max_length=100, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, db_column='LEASE_EXPIRES_AT', null=True)),
+                ('last_error', models.TextField(blank=True, db_column='LAST_ERROR', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='UPDATED_AT')),
+            ],
+            options={
+                'verbose_name': '업로드 처리 작업',
+                'verbose_name_plural': '업로드 처리 작업 목록',
+                'db_table': 'UPLOAD_JOB',
+            },
+        ),
+        migrations.AddField(
+            model_name='fileinfo',
+            name='file_size',
+            field=models.BigIntegerField(blank=True, db_column='FILE_SIZE', help_text='단위: byte', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='highlightvideo',
+            index=models.Index(fields=['video_category', 'match_date'], name='highlight_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='highlightvideo',
+            index=models.Index(fields=['highlight_title', 'match_date'], name='highlight_title_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useruploadvideo',
+            index=models.Index(fields=['user', 'use_yn', 'upload_date'], name='upload_user_list_idx'),
+        ),
+        migrations.AddField(
+            model_name='searchindex',
+            name='user',
+            field=models.ForeignKey(blank=True, db_column='USER_ID', null=True, on_delete=django.db.models.deletion.CASCADE, to='users.userinfo'),
+        ),
+        migrations.AddField(
+            model_name='storagereservation',
+            name='user',
+            field=models.ForeignKey(db_column='USER_ID', on_delete=django.db.models.deletion.CASCADE, to='users.userinfo'),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='upload_file',
+            field=models.ForeignKey(db_column='UPLOAD_FILE_ID', on_delete=django.db.models.deletion.CASCADE, to='videos.useruploadvideo'),
+        ),
+        migrations.AddIndex(
+            model_name='searchindex',
+            index=models.Index(fields=['doc_type', 'user', 'token', 'doc_id'], name='search_token_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchindex',
+            index=models.Index(fields=['doc_type', 'doc_id'], name='search_doc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storagereservation',
+            index=models.Index(fields=['expires_at'], name='storage_reservation_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadjob',
+            index=models.Index(fields=['status', 'next_run_at'], name='upload_job_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadjob',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='upload_job_lease_idx'),
+        ),
+    ]
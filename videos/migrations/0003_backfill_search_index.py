@@ -0,0 +1,40 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def build_search_index(apps, schema_editor):
+    """기존 영상 제목으로 검색 색인 생성 (이후에는 저장/삭제 시그널이 갱신)"""
+    from videos.search import tokenize
+
+    SearchIndex = apps.get_model('videos', 'SearchIndex')
+    HighlightVideo = apps.get_model('videos', 'HighlightVideo')
+    UserUploadVideo = apps.get_model('videos', 'UserUploadVideo')
+
+    sources = [
+        ('HIGHLIGHT', HighlightVideo.objects.values_list('pk', 'highlight_title')),
+        ('UPLOAD', UserUploadVideo.objects.values_list('pk', 'upload_title', 'user_id')),
+    ]
+    for doc_type, rows in sources:
+        buffer = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            user_id = row[2] if len(row) > 2 else None
+            buffer.extend(
+                SearchIndex(token=token, doc_type=doc_type, doc_id=row[0], user_id=user_id)
+                for token in tokenize(row[1])
+            )
+            if len(buffer) >= BATCH_SIZE:
+                SearchIndex.objects.bulk_create(buffer, batch_size=BATCH_SIZE)
+                buffer = []
+        SearchIndex.objects.bulk_create(buffer, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0002_performance_schema'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 import os
 from django.db import models
+from django.utils import timezone
 from users.models import CommonCode, UserInfo
 
 class FileInfo(models.Model):
@@ -9,6 +10,7 @@ class FileInfo(models.Model):
     """
     file_id = models.BigAutoField(primary_key=True, db_column='FILE_ID')
     file_path = models.FileField(upload_to='videos/%Y/%m/%d/',max_length=500, db_column='FILE_PATH')
+    file_size = models.BigIntegerField(null=True, blank=True, db_column='FILE_SIZE', help_text="단위: byte")
 
     class Meta:
         db_table = 'FILE_INFO'
@@ -37,6 +39,9 @@ class UserUploadVideo(models.Model):
         db_table = 'USER_UPLOAD_VIDEO'
         verbose_name = '유저 업로드 영상'
         verbose_name_plural = '유저 업로드 영상 목록'
+        indexes = [
+            models.Index(fields=['user', 'use_yn', 'upload_date'], name='upload_user_list_idx'),  # 내 보관함
+        ]
 
 
 class HighlightVideo(models.Model):
@@ -54,6 +59,10 @@ class HighlightVideo(models.Model):
         db_table = 'HIGHLIGHT_VIDEO'
         verbose_name = '하이라이트 영상'
         verbose_name_plural = '하이라이트 영상 목록'
+        indexes = [
+            models.Index(fields=['video_category', 'match_date'], name='highlight_category_date_idx'),  # 카탈로그
+            models.Index(fields=['highlight_title', 'match_date'], name='highlight_title_date_idx'),    # 해설자별 버전 조회
+        ]
 
 
 class SubtitleInfo(models.Model):
@@ -70,4 +79,97 @@ class SubtitleInfo(models.Model):
     class Meta:
         db_table = 'SUBTITLE_INFO'
         verbose_name = '자막 정보'
-        verbose_name_plural = '자막 정보 목록'
\ No newline at end of file
+        verbose_name_plural = '자막 정보 목록'
+
+class SearchIndex(models.Model):
+    """
+    12) 검색 색인
+    하이라이트/유저 업로드 영상 제목의 2-gram 역색인. 제목 검색 시 LIKE '%q%' 풀스캔 대신 사용한다.
+    """
+    DOC_HIGHLIGHT = 'HIGHLIGHT'
+    DOC_UPLOAD = 'UPLOAD'
+    DOC_TYPE_CHOICES = [(DOC_HIGHLIGHT, '하이라이트 영상'), (DOC_UPLOAD, '유저 업로드 영상')]
+
+    search_index_id = models.BigAutoField(primary_key=True, db_column='SEARCH_INDEX_ID')
+    token = models.CharField(max_length=2, db_column='TOKEN')
+    doc_type = models.CharField(max_length=10, choices=DOC_TYPE_CHOICES, db_column='DOC_TYPE')
+    doc_id = models.BigIntegerField(db_column='DOC_ID')
+    user = models.ForeignKey(UserInfo, on_delete=models.CASCADE, null=True, blank=True, db_column='USER_ID')
+
+    class Meta:
+        db_table = 'SEARCH_INDEX'
+        verbose_name = '검색 색인'
+        verbose_name_plural = '검색 색인 목록'
+        indexes = [
+            models.Index(fields=['doc_type', 'user', 'token', 'doc_id'], name='search_token_idx'),
+            models.Index(fields=['doc_type', 'doc_id'], name='search_doc_idx'),
+        ]
+
+
+
+class UploadJob(models.Model):
+    """
+    13) 업로드 영상 처리 작업
+    유저 업로드 영상의 RunPod 처리 요청을 워커 프로세스(run_upload_worker)가 가져가 실행하는 작업 큐.
+    lease가 만료된 RUNNING 작업은 다른 워커가 다시 가져가며, 제출된 RunPod 작업은 이어서 모니터링한다.
+    """
+    STATUS_PENDING = 'PENDING'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_DONE = 'DONE'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_RUNNING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    job_id = models.BigAutoField(primary_key=True, db_column='JOB_ID')
+    upload_file = models.ForeignKey(UserUploadVideo, on_delete=models.CASCADE, db_column='UPLOAD_FILE_ID')
+    analyst_code = models.IntegerField(db_column='ANALYST_CODE', help_text="COMMENTATOR 공통 코드")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_column='STATUS')
+    attempts = models.IntegerField(default=0, db_column='ATTEMPTS')
+    max_attempts = models.IntegerField(default=3, db_column='MAX_ATTEMPTS')
+    runpod_job_id = models.CharField(max_length=100, null=True, blank=True, db_column='RUNPOD_JOB_ID')
+    output_key = models.CharField(max_length=500, null=True, blank=True, db_column='OUTPUT_KEY')
+    script_key = models.CharField(max_length=500, null=True, blank=True, db_column='SCRIPT_KEY')
+    submitted_at = models.DateTimeField(null=True, blank=True, db_column='SUBMITTED_AT')
+    next_run_at = models.DateTimeField(default=timezone.now, db_column='NEXT_RUN_AT')
+    locked_by = models.CharField(max_length=100, null=True, blank=True, db_column='LOCKED_BY')
+    lease_expires_at = models.DateTimeField(null=True, blank=True, db_column='LEASE_EXPIRES_AT')
+    last_error = models.TextField(null=True, blank=True, db_column='LAST_ERROR')
+    created_at = models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')
+    updated_at = models.DateTimeField(auto_now=True, db_column='UPDATED_AT')
+
+    class Meta:
+        db_table = 'UPLOAD_JOB'
+        verbose_name = '업로드 처리 작업'
+        verbose_name_plural = '업로드 처리 작업 목록'
+        indexes = [
+            models.Index(fields=['status', 'next_run_at'], name='upload_job_pending_idx'),
+            models.Index(fields=['status', 'lease_expires_at'], name='upload_job_lease_idx'),
+        ]
+
+
+class StorageReservation(models.Model):
+    """
+    16) 저장공간 예약
+    업로드 바이트를 받기 전에 선언된 크기(Content-Length / 직접 업로드 시작 시 크기)만큼 저장공간을 예약한다.
+    예약 용량은 회원 정보의 STORAGE_RESERVED 에 합산되고, 업로드가 끝나면 실제 크기로 확정(STORAGE_USAGE)되거나 해제된다.
+    만료된 예약은 업로드 워커의 정기 점검(reconcile_storage)에서 해제된다.
+    """
+    reservation_id = models.BigAutoField(primary_key=True, db_column='RESERVATION_ID')
+    user = models.ForeignKey(UserInfo, on_delete=models.CASCADE, db_column='USER_ID')
+    size_kb = models.IntegerField(db_column='SIZE_KB')
+    object_key = models.CharField(max_length=500, null=True, blank=True, db_column='OBJECT_KEY')
+    upload_id = models.CharField(max_length=200, null=True, blank=True, db_column='UPLOAD_ID', help_text="S3 멀티파트 업로드 ID")
+    expires_at = models.DateTimeField(db_column='EXPIRES_AT')
+    created_at = models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')
+
+    class Meta:
+        db_table = 'STORAGE_RESERVATION'
+        verbose_name = '저장공간 예약'
+        verbose_name_plural = '저장공간 예약 목록'
+        indexes = [
+            models.Index(fields=['expires_at'], name='storage_reservation_exp_idx'),
+        ]
@@ -0,0 +1,177 @@
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {'COMPLETED', 'SUCCESS', 'FAILED', 'TIMEOUT'}
+
+MIN_POLL_INTERVAL = 2
+MAX_POLL_INTERVAL = 30
+MAX_WAIT_TIME = 20 * 60
+
+
+def next_poll_interval(elapsed, progress=None, progress_rate=None):
+    """
+    적응형 폴링 주기(초)
+    - 제출 직후 30초는 빠르게(2초), 이후 경과 시간에 비례해 최대 30초까지 늘린다.
+    - progress 변화율로 남은 시간을 추정할 수 있으면 그 절반 이내로 당겨서 완료를 빨리 감지한다.
+    """
+    if elapsed < 30:
+        interval = MIN_POLL_INTERVAL
+    else:
+        interval = min(MAX_POLL_INTERVAL, 5 + elapsed / 30)
+
+    if progress is not None and progress_rate and progress_rate > 0:
+        remaining = max(0, 100 - progress) / progress_rate
+        interval = min(interval, remaining / 2)
+
+    return max(MIN_POLL_INTERVAL, interval)
+
+
+class _TrackedJob:
+    __slots__ = ('key', 'runpod_job_id', 'started_at', 'callback', 'next_poll_at',
+                 'progress', 'progress_at', 'progress_rate')
+
+    def __init__(self, key, runpod_job_id, started_at, callback):
+        self.key = key
+        self.runpod_job_id = runpod_job_id
+        self.started_at = started_at
+        self.callback = callback
+        self.next_poll_at = time.time()
+        self.progress = None
+        self.progress_at = None
+        self.progress_rate = None
+
+    def observe_progress(self, progress, now):
+        try:
+            progress = float(progress)
+        except (TypeError, ValueError):
+            return
+        if self.progress is not None and self.progress_at and now > self.progress_at and progress > self.progress:
+            self.progress_rate = (progress - self.progress) / (now - self.progress_at)
+        if self.progress is None or progress != self.progress:
+            self.progress, self.progress_at = progress, now
+
+
+class RunPodStatusPoller:
+    """
+    진행 중인 모든 RunPod 작업의 상태를 하나의 asyncio 이벤트 루프(스레드 1개)에서 폴링한다.
+    폴링 시점이 된 작업들은 한 번에 모아 동시에 조회하고,
+    완료/실패한 작업의 후처리(callback)는 별도의 제한된 스레드 풀에서 실행한다.
+    """
+
+    def __init__(self, base_url=None, max_connections=20, completion_workers=4, max_wait_time=MAX_WAIT_TIME):
+        self.base_url = base_url or settings.RUNPOD_API_URL
+        self.max_connections = max_connections
+        self.max_wait_time = max_wait_time
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._thread = None
+        self._stopping = False
+        self._ready = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=completion_workers, thread_name_prefix='runpod-complete')
+
+    # --- [외부(동기) API] ---
+    def start(self):
+        self._thread = threading.Thread(target=self._run_loop, name='runpod-poller', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, wait=True):
+        self._stopping = True
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        if self._thread and wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def track(self, key, runpod_job_id, started_at, callback):
+        """
+        작업 모니터링 등록 (스레드 안전)
+        callback(status_data): 종료 상태(COMPLETED/SUCCESS/FAILED/TIMEOUT) 수신 시 스레드 풀에서 호출
+        """
+        job = _TrackedJob(key, runpod_job_id, started_at, callback)
+        self._loop.call_soon_threadsafe(self._add, job)
+
+    def tracked_keys(self):
+        with self._jobs_lock:
+            return list(self._jobs)
+
+    # --- [이벤트 루프] ---
+    def _add(self, job):
+        with self._jobs_lock:
+            self._jobs[job.key] = job
+        self._wakeup.set()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=15, limits=limits) as client:
+            while not self._stopping:
+                now = time.time()
+                due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+                if due:
+                    await asyncio.gather(*(self._poll(client, job) for job in due))
+
+                next_at = min((job.next_poll_at for job in self._jobs.values()), default=now + MAX_POLL_INTERVAL)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.05, next_at - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll(self, client, job):
+        now = time.time()
+        elapsed = now - job.started_at
+        if elapsed > self.max_wait_time:
+            logger.error(f"⏰ 타임아웃 발생! ({self.max_wait_time}초 초과, Job ID: {job.runpod_job_id})")
+            self._dispatch(job, {'status': 'TIMEOUT'})
+            return
+
+        try:
+            response = await client.get(f"/status/{job.runpod_job_id}")
+            status_data = response.json()
+        except Exception as e:
+            logger.error(f"⚠️ 모니터링 중 에러 발생 (Job ID: {job.runpod_job_id}): {e}")
+            job.next_poll_at = now + next_poll_interval(elapsed)
+            return
+
+        raw_status = str(status_data.get('status', '')).upper()
+        if raw_status in TERMINAL_STATUSES:
+            self._dispatch(job, status_data)
+            return
+
+        if status_data.get('progress') is not None:
+            job.observe_progress(status_data.get('progress'), now)
+        if status_data.get('step'):
+            logger.info(f"Job Status: {raw_status} | Progress: {status_data.get('progress', 0)}% | Step: {status_data.get('step')}")
+
+        job.next_poll_at = now + next_poll_interval(elapsed, job.progress, job.progress_rate)
+
+    def _dispatch(self, job, status_data):
+        with self._jobs_lock:
+            self._jobs.pop(job.key, None)
+        self._loop.run_in_executor(self._executor, self._safe_callback, job, status_data)
+
+    @staticmethod
+    def _safe_callback(job, status_data):
+        try:
+            job.callback(status_data)
+        except Exception as e:
+            logger.error(f"❌ 작업 후처리 중 에러 (Job ID: {job.runpod_job_id}): {e}")
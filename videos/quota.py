@@ -0,0 +1,228 @@
+"""
+저장공간 사용량 / 다운로드 횟수 카운터
+
+값을 읽어서 더한 뒤 save() 하면 동시에 들어온 요청끼리 서로 덮어써서 증가분이 사라지므로,
+한도 확인과 증가를 UPDATE 한 문장으로 처리한다.
+    UPDATE ... SET x = x + n WHERE ... AND x + n <= 한도
+바뀐 행이 없으면 한도 초과, 있으면 같은 트랜잭션 안에서 증가 후 값을 읽어 반환한다.
+QuerySet.update 는 post_save 시그널을 보내지 않으므로 유저 컨텍스트 캐시는 직접 무효화한다.
+
+저장공간은 업로드 바이트를 받기 전에 예약한다. (StorageReservation)
+- reserve_storage: 선언된 크기만큼 STORAGE_RESERVED 증가 (사용량 + 예약 + 요청 <= 한도일 때만)
+- commit_reservation: 업로드가 끝나면 예약을 지우고 실제 크기를 STORAGE_USAGE 에 반영
+- release_reservation: 업로드 실패/취소 시 예약 해제 (예약 행을 지운 쪽만 차감하므로 여러 번 호출해도 안전)
+- reconcile_storage_usage: 만료된 예약 해제 + S3 객체 크기로 사용량 재계산 (업로드 워커가 정기 실행)
+"""
+import math
+import logging
+from datetime import timedelta
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from users.models import UserInfo
+from users.context import load_user_context, invalidate_user_context
+from .models import FileInfo, UserUploadVideo, StorageReservation
+from . import s3
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_LIMIT = 10
+# 유저 영상 객체 위치: 업로드 원본(videos/...) + 처리 결과(outputs/..., RunPod 완료 후 FileInfo 가 가리킴)
+UPLOAD_PREFIXES = ('videos/', 'outputs/')
+
+
+def size_to_kb(size_bytes):
+    return math.ceil(size_bytes / 1024)
+
+
+def storage_limit_kb(user_id):
+    """현재 구독 플랜의 저장공간 한도 (KB)"""
+    return load_user_context(user_id).subscription_state.storage_limit
+
+
+def _within_limit(size_kb, limit_kb):
+    """사용량 + 예약 + size_kb <= 한도 조건"""
+    return {'storage_usage__lte': Value(limit_kb - size_kb) - F('storage_reserved')}
+
+
+def _invalidate_on_commit(user_id):
+    transaction.on_commit(lambda: invalidate_user_context(user_id))
+
+
+def add_storage_usage(user_id, size_kb, limit_kb):
+    """저장공간 사용량을 size_kb 만큼 늘리고 늘어난 사용량(KB)을 반환 (한도를 넘으면 ValueError)"""
+    with transaction.atomic():
+        updated = UserInfo.objects.filter(
+            user_id=user_id, **_within_limit(size_kb, limit_kb),
+        ).update(storage_usage=F('storage_usage') + size_kb)
+        if not updated:
+            raise ValueError("저장공간이 부족합니다.")
+        used_kb = UserInfo.objects.filter(user_id=user_id).values_list('storage_usage', flat=True).get()
+        _invalidate_on_commit(user_id)
+    return used_kb
+
+
+def release_storage_usage(user_id, size_kb):
+    """영상 삭제 시 사용량 반환"""
+    if size_kb <= 0:
+        return
+    UserInfo.objects.filter(user_id=user_id).update(storage_usage=Greatest(F('storage_usage') - size_kb, Value(0)))
+    _invalidate_on_commit(user_id)
+
+
+def reserve_storage(user_id, size_bytes, limit_kb, object_key=None):
+    """업로드 전에 size_bytes 만큼 저장공간 예약 (한도를 넘으면 ValueError)"""
+    size_kb = size_to_kb(size_bytes)
+    with transaction.atomic():
+        updated = UserInfo.objects.filter(
+            user_id=user_id, **_within_limit(size_kb, limit_kb),
+        ).update(storage_reserved=F('storage_reserved') + size_kb)
+        if not updated:
+            raise ValueError("저장공간이 부족합니다.")
+        reservation = StorageReservation.objects.create(
+            user_id=user_id,
+            size_kb=size_kb,
+            object_key=object_key,
+            expires_at=timezone.now() + timedelta(seconds=settings.STORAGE_RESERVATION_TTL),
+        )
+        _invalidate_on_commit(user_id)
+    return reservation
+
+
+def _take_reservation(reservation_id):
+    """예약 행을 지우고 예약 용량(KB)을 반환 (이미 확정/해제된 예약이면 None)"""
+    reservation = StorageReservation.objects.filter(pk=reservation_id).values_list('user_id', 'size_kb').first()
+    if reservation is None or not StorageReservation.objects.filter(pk=reservation_id).delete()[0]:
+        return None
+    return reservation
+
+
+def release_reservation(reservation_id):
+    """예약 해제. 실제로 해제했으면 True"""
+    if reservation_id is None:
+        return False
+    with transaction.atomic():
+        taken = _take_reservation(reservation_id)
+        if taken is None:
+            return False
+        user_id, size_kb = taken
+        UserInfo.objects.filter(user_id=user_id).update(
+            storage_reserved=Greatest(F('storage_reserved') - size_kb, Value(0)),
+        )
+        _invalidate_on_commit(user_id)
+    return True
+
+
+def commit_reservation(reservation_id, user_id, size_bytes, limit_kb):
+    """
+    업로드 완료: 예약을 실제 크기(size_bytes)의 사용량으로 확정하고 사용량(KB)을 반환
+    예약이 이미 만료되어 해제됐거나 실제 크기가 예약보다 크면 한도 안에서만 반영한다. (넘으면 ValueError)
+    """
+    size_kb = size_to_kb(size_bytes)
+    with transaction.atomic():
+        reserved = StorageReservation.objects.filter(pk=reservation_id, user_id=user_id).values_list('size_kb', flat=True).first()
+        if reserved is None or size_kb > reserved or _take_reservation(reservation_id) is None:
+            release_reservation(reservation_id)
+            return add_storage_usage(user_id, size_kb, limit_kb)
+
+        UserInfo.objects.filter(user_id=user_id).update(
+            storage_reserved=Greatest(F('storage_reserved') - reserved, Value(0)),
+            storage_usage=F('storage_usage') + size_kb,
+        )
+        used_kb = UserInfo.objects.filter(user_id=user_id).values_list('storage_usage', flat=True).get()
+        _invalidate_on_commit(user_id)
+    return used_kb
+
+
+def set_reservation_upload(reservation_id, upload_id):
+    """직접 업로드의 멀티파트 업로드 ID 기록 (만료 시 업로드 취소용)"""
+    StorageReservation.objects.filter(pk=reservation_id).update(upload_id=upload_id)
+
+
+def release_expired_reservations(limit=1000):
+    """만료된 예약 해제 + 완료되지 않은 멀티파트 업로드 취소. 해제한 예약 수 반환"""
+    expired = list(StorageReservation.objects.filter(expires_at__lt=timezone.now()).order_by('expires_at')[:limit])
+    released = 0
+    for reservation in expired:
+        if not release_reservation(reservation.pk):
+            continue
+        released += 1
+        if reservation.upload_id:
+            try:
+                s3.abort_multipart_upload(reservation.object_key, reservation.upload_id)
+            except Exception as e:
+                logger.warning(f"⚠️ 만료된 멀티파트 업로드 취소 실패 ({reservation.object_key}): {e}")
+    return released
+
+
+def reconcile_storage_usage(dry_run=False):
+    """
+    S3 객체 크기(UPLOAD_PREFIXES 아래 list_objects_v2)로 유저별 사용량과 예약 용량을 다시 계산해서 어긋난 값을 고친다.
+    계산하는 동안 값이 바뀐 유저는 건너뛰고 다음 점검 때 다시 계산한다. (compare-and-set UPDATE)
+    Returns: {'released': 해제한 만료 예약 수, 'files': 크기를 고친 파일 수, 'users': 사용량을 고친 유저 수}
+    """
+    released = 0 if dry_run else release_expired_reservations()
+    object_sizes = {}
+    for prefix in UPLOAD_PREFIXES:
+        object_sizes.update(s3.list_object_sizes(s3.object_key(prefix)))
+
+    # 유저 값을 먼저 읽어 두어야 이후에 바뀐 유저가 compare-and-set 에서 걸러진다
+    snapshot = {
+        user_id: (usage, reserved)
+        for user_id, usage, reserved in UserInfo.objects.values_list('user_id', 'storage_usage', 'storage_reserved')
+    }
+
+    usage_kb = defaultdict(int)
+    unknown = set()  # 크기를 알 수 없는 파일이 있는 유저는 사용량을 고치지 않는다
+    size_fixes = []
+    files = UserUploadVideo.objects.filter(use_yn=True).values_list(
+        'user_id', 'upload_file_id', 'upload_file__file_path', 'upload_file__file_size',
+    )
+    for user_id, file_id, name, recorded in files.iterator(chunk_size=2000):
+        actual = object_sizes.get(s3.object_key(name))
+        if actual is None:
+            if recorded is None:
+                unknown.add(user_id)
+                continue
+            actual = recorded  # 목록 조회 이후에 등록된 파일
+        elif actual != recorded:
+            size_fixes.append(FileInfo(file_id=file_id, file_size=actual))
+        usage_kb[user_id] += size_to_kb(actual)
+
+    reserved_kb = dict(
+        StorageReservation.objects.values('user_id').annotate(total=Sum('size_kb')).values_list('user_id', 'total')
+    )
+
+    fixed_users = 0
+    for user_id, (usage, reserved) in snapshot.items():
+        new_usage = usage if user_id in unknown else usage_kb.get(user_id, 0)
+        new_reserved = reserved_kb.get(user_id, 0)
+        if (usage, reserved) == (new_usage, new_reserved):
+            continue
+        logger.info(f"🧮 저장공간 보정 {user_id}: 사용량 {usage} -> {new_usage}KB, 예약 {reserved} -> {new_reserved}KB")
+        if dry_run:
+            fixed_users += 1
+            continue
+        fixed_users += UserInfo.objects.filter(
+            user_id=user_id, storage_usage=usage, storage_reserved=reserved,
+        ).update(storage_usage=new_usage, storage_reserved=new_reserved)
+        invalidate_user_context(user_id)
+
+    if size_fixes and not dry_run:
+        FileInfo.objects.bulk_update(size_fixes, ['file_size'], batch_size=1000)
+
+    return {'released': released, 'files': len(size_fixes), 'users': fixed_users}
+
+
+def increment_download_count(video_id, limit=DOWNLOAD_LIMIT):
+    """다운로드 횟수를 1 늘리고 늘어난 횟수를 반환 (한도에 도달했으면 PermissionError)"""
+    with transaction.atomic():
+        updated = UserUploadVideo.objects.filter(
+            pk=video_id, download_count__lt=limit,
+        ).update(download_count=F('download_count') + 1)
+        if not updated:
+            raise PermissionError("LIMIT_EXCEEDED")
+        return UserUploadVideo.objects.filter(pk=video_id).values_list('download_count', flat=True).get()
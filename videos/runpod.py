@@ -1,18 +1,18 @@
 import boto3
 import requests
-import time
-import json
+import uuid
 import logging
 import os
-import tempfile
 import sys
 from botocore.config import Config
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 from django.conf import settings
-from users.models import CommonCode
+from SKN17_FINAL_3TEAM.instrumentation import external_call
+from users.codes import codes, GROUP_STATUS
 from .models import SubtitleInfo
+from . import subtitles, subtitle_ingest
 
 logger = logging.getLogger(__name__)
 handler = logging.StreamHandler(sys.stdout)
@@ -51,37 +51,54 @@ class RunPodClient:
         return session
 
     def _get_common_code(self, code_val, group_name):
-        try:
-            return CommonCode.objects.get(common_code=code_val, common_code_grp=group_name)
-        except CommonCode.DoesNotExist:
-            return None
+        return codes.in_group(code_val, group_name)
         
     def _update_status(self, user_upload_instance, code_val):
-        code_obj = self._get_common_code(code_val, 'STATUS')
+        code_obj = self._get_common_code(code_val, GROUP_STATUS)
         if code_obj:
             user_upload_instance.upload_status_code = code_obj
-            user_upload_instance.save()
+            user_upload_instance.save(update_fields=['upload_status_code'])
             logger.info(f"💾 DB 상태 업데이트: {code_val} (ID: {user_upload_instance.pk})")
 
+    def _existing_s3_key(self, django_file_field):
+        """파일이 이미 같은 버킷에 저장되어 있으면 해당 객체 키를 반환"""
+        storage = getattr(django_file_field, 'storage', None)
+        if not self.bucket_name or getattr(storage, 'bucket_name', None) != self.bucket_name:
+            return None
+        location = (getattr(storage, 'location', '') or '').strip('/')
+        return f"{location}/{django_file_field.name}" if location else django_file_field.name
+
     def upload_video_to_s3(self, django_file_field):
+        """
+        RunPod 입력으로 쓸 S3 키를 반환한다.
+        원본이 이미 버킷에 있으면 다시 올리지 않고 그 키를 그대로 사용(presigned GET)하고,
+        다른 스토리지에 있을 때만 임시 파일 없이 스트리밍으로 inputs/ 에 업로드한다.
+        """
+        existing_key = self._existing_s3_key(django_file_field)
+        if existing_key:
+            logger.info(f"♻️ 기존 S3 객체 재사용 (Key: {existing_key}, 전송량: 0 bytes)")
+            return existing_key
+
         try:
             filename = os.path.basename(django_file_field.name)
         except Exception:
-            filename = f"video_{int(time.time())}.mp4"
+            filename = f"video_{uuid.uuid4().hex}.mp4"
             
         s3_key = f"inputs/{filename}"
         logger.info(f"📤 S3 업로드 시작 (Key: {s3_key})...")
 
-        with tempfile.NamedTemporaryFile(delete=True) as tmp:
-            for chunk in django_file_field.chunks():
-                tmp.write(chunk)
-            tmp.flush()
-            tmp.seek(0)
-            self.s3_client.upload_file(
-                tmp.name, self.bucket_name, s3_key,
-                ExtraArgs={'ContentType': 'video/mp4'}
+        transferred = {'bytes': 0}
+
+        def _count(n):
+            transferred['bytes'] += n
+
+        with django_file_field.open('rb') as f:
+            self.s3_client.upload_fileobj(
+                f, self.bucket_name, s3_key,
+                ExtraArgs={'ContentType': 'video/mp4'},
+                Callback=_count,
             )
-        logger.info(f"✅ S3 업로드 완료: s3://{self.bucket_name}/{s3_key}")
+        logger.info(f"✅ S3 업로드 완료: s3://{self.bucket_name}/{s3_key} (전송량: {transferred['bytes']:,} bytes)")
         return s3_key
 
     def generate_public_urls(self, input_s3_key):
@@ -89,9 +106,10 @@ class RunPodClient:
             'get_object', Params={'Bucket': self.bucket_name, 'Key': input_s3_key}, ExpiresIn=3600
         )
         
-        timestamp = int(time.time())
-        output_key = f"outputs/result_{timestamp}.mp4"
-        output_script_key = f"outputs/script_{timestamp}.json"
+        # 여러 작업이 같은 초에 제출될 수 있으므로 작업마다 고유한 키를 쓴다 (다른 유저 결과 덮어쓰기 방지)
+        token = uuid.uuid4().hex
+        output_key = f"outputs/result_{token}.mp4"
+        output_script_key = f"outputs/script_{token}.json"
         
         upload_url = self.s3_client.generate_presigned_url(
             'put_object', Params={'Bucket': self.bucket_name, 'Key': output_key}, ExpiresIn=3600
@@ -119,7 +137,8 @@ class RunPodClient:
         endpoint = f"{self.runpod_url}/process_video"
         logger.info(f"🚀 RunPod 작업 제출 중... (Analyst: {analyst_id})")
         
-        response = self.session.post(endpoint, json=payload, timeout=30)
+        with external_call('runpod'):
+            response = self.session.post(endpoint, json=payload, timeout=30)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -130,133 +149,70 @@ class RunPodClient:
         logger.info(f"✅ 작업 제출 완료 (Job ID: {job_id})")
         return job_id
 
-    def process_and_monitor(self, user_upload_instance, _, db_analyst_id):
-        try:
-            self._update_status(user_upload_instance, 21)
-            runpod_analyst_id = self.ANALYST_MAPPING.get(db_analyst_id, 1)
+    def submit_processing(self, user_upload_instance, db_analyst_id):
+        """S3 업로드 ~ RunPod 작업 제출까지 수행하고 모니터링에 필요한 정보를 반환"""
+        self._update_status(user_upload_instance, 21)
+        runpod_analyst_id = self.ANALYST_MAPPING.get(db_analyst_id, 1)
 
-            s3_input_key = self.upload_video_to_s3(user_upload_instance.upload_file.file_path)
-            urls = self.generate_public_urls(s3_input_key)
-            
-            job_id = self.submit_job(
-                urls['download_url'], 
-                urls['upload_url'], 
-                urls['script_upload_url'], 
-                runpod_analyst_id
-            )
-            
-            self._monitor_loop(
-                user_upload_instance, 
-                job_id, 
-                db_analyst_id, 
-                urls['output_key'], 
-                urls['script_key']
-            )
-
-        except Exception as e:
-            logger.error(f"❌ 프로세스 실패: {e}")
-            self._update_status(user_upload_instance, 23)
+        s3_input_key = self.upload_video_to_s3(user_upload_instance.upload_file.file_path)
+        urls = self.generate_public_urls(s3_input_key)
 
-    def _monitor_loop(self, user_upload_instance, job_id, db_analyst_id, output_s3_key, expected_script_key):
-        poll_interval = 5
-        max_wait_time = 20 * 60 
-        start_time = time.time()
-
-        while True:
-            elapsed_time = time.time() - start_time
-            if elapsed_time > max_wait_time:
-                logger.error(f"⏰ 타임아웃 발생! ({max_wait_time}초 초과)")
-                self._update_status(user_upload_instance, 23)
-                break
+        job_id = self.submit_job(
+            urls['download_url'], 
+            urls['upload_url'], 
+            urls['script_upload_url'], 
+            runpod_analyst_id
+        )
+        return {
+            'job_id': job_id,
+            'output_key': urls['output_key'],
+            'script_key': urls['script_key'],
+        }
 
+    def handle_completed(self, user_upload_instance, db_analyst_id, output_s3_key, expected_script_key):
+        """RunPod 작업 완료 후 결과 영상 경로 연결 및 자막 저장. Returns: 성공 여부"""
+        try:
+            file_info = user_upload_instance.upload_file
+            file_info.file_path.name = output_s3_key 
+            file_info.save()
+            logger.info(f"💾 영상 경로 연결 완료: {output_s3_key}")
+            
+            logger.info(f"📜 자막 파일 강제 조회 시도: {expected_script_key}")
+            
             try:
-                response = self.session.get(f"{self.runpod_url}/status/{job_id}", timeout=15)
-                status_data = response.json()
-                raw_status = status_data.get('status', '').upper()
-                
-                step = status_data.get('step', '')
-                if step:
-                     progress = status_data.get('progress', 0)
-                     logger.info(f"Job Status: {raw_status} | Progress: {progress}% | Step: {step}")
-
-                if raw_status in ['COMPLETED', 'SUCCESS']:
-                    logger.info("✅ RunPod 작업 완료! 결과 처리 시작...")
-                    
-                    try:
-                        file_info = user_upload_instance.upload_file
-                        file_info.file_path.name = output_s3_key 
-                        file_info.save()
-                        logger.info(f"💾 영상 경로 연결 완료: {output_s3_key}")
-                        
-                        logger.info(f"📜 자막 파일 강제 조회 시도: {expected_script_key}")
-                        
-                        try:
-                            s3_obj = self.s3_client.get_object(Bucket=self.bucket_name, Key=expected_script_key)
-                            raw_content = s3_obj['Body'].read().decode('utf-8')
-                            raw_data = json.loads(raw_content) 
-
-                            processed_data = []
-
-                            if isinstance(raw_data, list):
-                                for item in raw_data:
-                                    start = round(float(item.get('set_start_sec', 0)), 2)
-                                    end = round(float(item.get('set_end_sec', 0)), 2)
-                                    
-                                    text_parts = []
-                                    if item.get('caster_text'):
-                                        text_parts.append(f"{item['caster_text']}")
-                                    
-                                    if item.get('analyst_text'):
-                                        text_parts.append(f"{item['analyst_text']}")
-                                    
-                                    full_text = " ".join(text_parts)
-
-                                    if full_text.strip():
-                                        processed_data.append({
-                                            "start": start,
-                                            "end": end,
-                                            "text": full_text
-                                        })
-                            else:
-                                logger.warning("⚠️ 원본 자막 데이터가 리스트 형식이 아닙니다.")
-                            
-                            clean_json_str = json.dumps(processed_data, ensure_ascii=False)
-                            script_bytes = clean_json_str.encode('utf-8')
-                            
-                            commentator_code_obj = self._get_common_code(db_analyst_id, 'COMMENTATOR')
-
-                            subtitle_info, created = SubtitleInfo.objects.update_or_create(
-                                upload_file=user_upload_instance,
-                                commentator_code=commentator_code_obj,
-                                defaults={
-                                    'subtitle': script_bytes,
-                                    'video_file': None
-                                }
-                            )
-                            logger.info(f"💾 자막 데이터 가공 및 저장 완료 ({'생성' if created else '수정'})")
-
-                        except self.s3_client.exceptions.NoSuchKey:
-                            logger.error(f"❌ 자막 파일이 S3에 생성되지 않았습니다: {expected_script_key}")
-                        except Exception as script_error:
-                            logger.error(f"❌ 자막 처리 중 에러: {script_error}")
-                        
-                        self._update_status(user_upload_instance, 22)
-                        
-                    except Exception as e:
-                        logger.error(f"❌ DB 저장/처리 중 치명적 오류: {e}")
-                        self._update_status(user_upload_instance, 23)
-                    
-                    break 
+                s3_obj = self.s3_client.get_object(Bucket=self.bucket_name, Key=expected_script_key)
+                try:
+                    script_bytes, stats = subtitle_ingest.ingest(s3_obj['Body'])
+                    logger.info(f"📜 자막 변환: {stats}")
+                except subtitle_ingest.SubtitleFormatError as e:
+                    logger.warning(f"⚠️ {e}")
+                    script_bytes = subtitles.encode([])
+                finally:
+                    s3_obj['Body'].close()
                 
-                elif raw_status == 'FAILED':
-                    logger.error(f"❌ RunPod 작업 실패: {status_data.get('error')}")
-                    self._update_status(user_upload_instance, 23)
-                    break
-                
-                time.sleep(poll_interval)
+                commentator_code_obj = self._get_common_code(db_analyst_id, 'COMMENTATOR')
+
+                subtitle_info, created = SubtitleInfo.objects.update_or_create(
+                    upload_file=user_upload_instance,
+                    commentator_code=commentator_code_obj,
+                    defaults={
+                        'subtitle': script_bytes,
+                        'video_file': None
+                    }
+                )
+                logger.info(f"💾 자막 데이터 가공 및 저장 완료 ({'생성' if created else '수정'})")
+
+            except self.s3_client.exceptions.NoSuchKey:
+                logger.error(f"❌ 자막 파일이 S3에 생성되지 않았습니다: {expected_script_key}")
+            except Exception as script_error:
+                logger.error(f"❌ 자막 처리 중 에러: {script_error}")
+            
+            self._update_status(user_upload_instance, 22)
+            return True
             
-            except Exception as e:
-                logger.error(f"⚠️ 모니터링 중 에러 발생: {e}")
-                time.sleep(poll_interval)
+        except Exception as e:
+            logger.error(f"❌ DB 저장/처리 중 치명적 오류: {e}")
+            self._update_status(user_upload_instance, 23)
+            return False
 
 runpod_client = RunPodClient()
\ No newline at end of file
@@ -0,0 +1,129 @@
+import math
+import uuid
+import functools
+import boto3
+from botocore.config import Config
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from SKN17_FINAL_3TEAM.instrumentation import external_call
+
+MIN_PART_SIZE = 8 * 1024 * 1024     # S3 최소 5MB, 여유 있게 8MB
+MAX_PARTS = 10000                    # S3 멀티파트 최대 파트 수
+PRESIGNED_EXPIRES = 60 * 60 * 6
+
+
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """프로세스 단위로 재사용하는 S3 클라이언트"""
+    return boto3.client(
+        's3',
+        region_name=settings.AWS_S3_REGION_NAME,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(signature_version='s3v4', retries={'max_attempts': 10, 'mode': 'adaptive'}),
+    )
+
+
+def build_upload_key(filename):
+    """FileInfo.file_path(upload_to='videos/%Y/%m/%d/')와 같은 규칙의 객체 키 생성"""
+    safe_name = filename.replace('/', '_').replace('\\', '_')
+    return f"{timezone.now():videos/%Y/%m/%d}/{uuid.uuid4().hex}_{safe_name}"
+
+
+def part_size_for(total_size):
+    return max(MIN_PART_SIZE, math.ceil(total_size / MAX_PARTS))
+
+
+def start_multipart_upload(key):
+    """멀티파트 업로드 생성 -> upload_id"""
+    with external_call('s3'):
+        res = get_s3_client().create_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, ContentType='video/mp4', ACL=settings.AWS_DEFAULT_ACL,
+        )
+    return res['UploadId']
+
+
+def upload_part(key, upload_id, part_number, body):
+    """파트 하나 업로드 -> complete_multipart_upload 에 넘길 {'part_number', 'etag'}"""
+    with external_call('s3'):
+        res = get_s3_client().upload_part(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body,
+        )
+    return {'part_number': part_number, 'etag': res['ETag']}
+
+
+def create_multipart_upload(key, total_size):
+    """
+    브라우저 직접 업로드용 멀티파트 업로드 생성
+    Returns: upload_id, part_size, 파트별 presigned PUT URL 목록
+    """
+    client = get_s3_client()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    upload_id = start_multipart_upload(key)
+
+    part_size = part_size_for(total_size)
+    part_count = max(1, math.ceil(total_size / part_size))
+    parts = [
+        {
+            'part_number': n,
+            'url': client.generate_presigned_url(
+                'upload_part',
+                Params={'Bucket': bucket, 'Key': key, 'UploadId': upload_id, 'PartNumber': n},
+                ExpiresIn=PRESIGNED_EXPIRES,
+            ),
+        }
+        for n in range(1, part_count + 1)
+    ]
+    return upload_id, part_size, parts
+
+
+def complete_multipart_upload(key, upload_id, parts):
+    """
+    parts: [{'part_number': 1, 'etag': '"..."'}, ...]
+    Returns: 완료된 객체 크기(bytes)
+    """
+    client = get_s3_client()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    with external_call('s3'):
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={'Parts': [
+                {'PartNumber': int(p['part_number']), 'ETag': p['etag']}
+                for p in sorted(parts, key=lambda p: int(p['part_number']))
+            ]},
+        )
+        return client.head_object(Bucket=bucket, Key=key)['ContentLength']
+
+
+def read_object_head(key, size):
+    """객체 앞부분 size 바이트 (Range GET)"""
+    with external_call('s3'):
+        res = get_s3_client().get_object(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, Range=f'bytes=0-{size - 1}',
+        )
+        return res['Body'].read()
+
+
+def abort_multipart_upload(key, upload_id):
+    with external_call('s3'):
+        get_s3_client().abort_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, UploadId=upload_id,
+        )
+
+
+def object_key(name):
+    """FileField 이름 -> 버킷 객체 키 (스토리지 location 반영)"""
+    location = (getattr(default_storage, 'location', '') or '').strip('/')
+    return f"{location}/{name}" if location else name
+
+
+def list_object_sizes(prefix):
+    """prefix 아래 모든 객체의 {키: 크기(bytes)} (list_objects_v2 한 번에 1000개씩)"""
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    sizes = {}
+    with external_call('s3'):
+        for page in paginator.paginate(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                sizes[obj['Key']] = obj['Size']
+    return sizes
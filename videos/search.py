@@ -0,0 +1,125 @@
+import re
+from django.db.models import Count
+from .models import HighlightVideo, UserUploadVideo, SearchIndex
+
+NGRAM_SIZE = 2
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize(text):
+    """검색용 정규화: 대소문자 무시, 연속 공백 축약"""
+    return _WHITESPACE_RE.sub(' ', (text or '').casefold()).strip()
+
+
+def tokenize(text):
+    """정규화된 문자열의 2-gram 집합 (한글은 형태소 분석 없이 음절 단위로 색인)"""
+    text = normalize(text)
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+# --- [색인 유지] ---
+def _sync_tokens(doc_type, doc_id, title, user_id=None):
+    """문서 하나의 토큰을 현재 제목 기준으로 맞춘다 (바뀐 토큰만 추가/삭제)"""
+    new_tokens = tokenize(title)
+    rows = SearchIndex.objects.filter(doc_type=doc_type, doc_id=doc_id)
+    old_tokens = set(rows.values_list('token', flat=True))
+
+    stale = old_tokens - new_tokens
+    if stale:
+        rows.filter(token__in=stale).delete()
+
+    SearchIndex.objects.bulk_create([
+        SearchIndex(token=token, doc_type=doc_type, doc_id=doc_id, user_id=user_id)
+        for token in new_tokens - old_tokens
+    ])
+
+
+def index_highlight(video):
+    _sync_tokens(SearchIndex.DOC_HIGHLIGHT, video.pk, video.highlight_title)
+
+
+def index_upload(video):
+    _sync_tokens(SearchIndex.DOC_UPLOAD, video.pk, video.upload_title, user_id=video.user_id)
+
+
+def remove_document(doc_type, doc_id):
+    SearchIndex.objects.filter(doc_type=doc_type, doc_id=doc_id).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """전체 색인 재생성. Returns: (하이라이트 수, 업로드 수)"""
+    SearchIndex.objects.all().delete()
+
+    counts = []
+    sources = [
+        (SearchIndex.DOC_HIGHLIGHT, HighlightVideo.objects.values_list('pk', 'highlight_title')),
+        (SearchIndex.DOC_UPLOAD, UserUploadVideo.objects.values_list('pk', 'upload_title', 'user_id')),
+    ]
+    for doc_type, rows in sources:
+        buffer = []
+        count = 0
+        for row in rows.iterator(chunk_size=batch_size):
+            doc_id, title = row[0], row[1]
+            user_id = row[2] if len(row) > 2 else None
+            buffer.extend(
+                SearchIndex(token=token, doc_type=doc_type, doc_id=doc_id, user_id=user_id)
+                for token in tokenize(title)
+            )
+            count += 1
+            if len(buffer) >= batch_size:
+                SearchIndex.objects.bulk_create(buffer, batch_size=batch_size)
+                buffer = []
+        SearchIndex.objects.bulk_create(buffer, batch_size=batch_size)
+        counts.append(count)
+    return tuple(counts)
+
+
+# --- [검색] ---
+def _candidate_ids(doc_type, tokens, user_id=None):
+    """모든 질의 토큰을 가진 문서 id (부분 문자열 후보)"""
+    return SearchIndex.objects.filter(
+        doc_type=doc_type, user_id=user_id, token__in=tokens
+    ).values('doc_id').annotate(hits=Count('token')).filter(hits=len(tokens)).values('doc_id')
+
+
+def _relevance(title, query):
+    """정확 일치 > 접두 일치 > 단어 시작 일치 > 부분 일치"""
+    title = normalize(title)
+    if title == query:
+        return 3
+    if title.startswith(query):
+        return 2
+    if f' {query}' in title:
+        return 1
+    return 0
+
+
+def search_highlights(search_query):
+    """하이라이트 영상 제목 검색 (관련도, 최신순)"""
+    query = normalize(search_query)
+    qs = HighlightVideo.objects.select_related('video_file')
+    tokens = tokenize(query)
+    if tokens:
+        qs = qs.filter(video_file_id__in=_candidate_ids(SearchIndex.DOC_HIGHLIGHT, tokens))
+    else:
+        qs = qs.filter(highlight_title__icontains=query)
+
+    # 2-gram 후보에서 실제 부분 문자열 일치만 남긴 뒤 정렬
+    videos = [v for v in qs.order_by('-match_date', '-video_file_id') if query in normalize(v.highlight_title)]
+    videos.sort(key=lambda v: _relevance(v.highlight_title, query), reverse=True)
+    return videos
+
+
+def search_uploads(user, search_query):
+    """유저 업로드 영상 제목 검색 (관련도, 최신순)"""
+    query = normalize(search_query)
+    qs = UserUploadVideo.objects.filter(user=user, use_yn=True).select_related('upload_file')
+    tokens = tokenize(query)
+    if tokens:
+        qs = qs.filter(upload_file_id__in=_candidate_ids(SearchIndex.DOC_UPLOAD, tokens, user_id=user.pk))
+    else:
+        qs = qs.filter(upload_title__icontains=query)
+
+    videos = [v for v in qs.order_by('-upload_date', '-pk') if query in normalize(v.upload_title)]
+    videos.sort(key=lambda v: _relevance(v.upload_title, query), reverse=True)
+    return videos
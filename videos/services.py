@@ -1,44 +1,26 @@
-import math
-import json
 import logging
-import threading
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.utils import timezone
 from django.db.models import Q, Prefetch
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404
-from django.core.serializers.json import DjangoJSONEncoder
 from django.http import JsonResponse
-from .runpod import runpod_client
-from payments.models import SubscribeHistory
-from .models import UserInfo, HighlightVideo, UserUploadVideo, FileInfo, CommonCode, SubtitleInfo
+from .jobs import enqueue_upload_job
+from . import s3, search, subtitles, quota, uploads
+from .catalog import get_catalog, encode_cursor, decode_cursor, rows_after
+from .models import UserInfo, HighlightVideo, UserUploadVideo, FileInfo, SubtitleInfo
+from users.codes import codes, team_key, team_meta, STATUS_UPLOADED, DEFAULT_COMMENTATOR_ID
+from users.context import invalidate_user_context
 
 logger = logging.getLogger(__name__)
 
-# --- [상수 데이터] ---
-TEAM_META_DATA = {
-    'LG': {'full': 'LG 트윈스', 'mascot': '수타'},
-    'HANWHA': {'full': '한화 이글스', 'mascot': '술이'},
-    'SSG': {'full': 'SSG 랜더스', 'mascot': '란디'},
-    'SAMSUNG': {'full': '삼성 라이온즈', 'mascot': '볼래요'},
-    'NC': {'full': 'NC 다이노스', 'mascot': '반비'},
-    'KT': {'full': 'KT 위즈', 'mascot': '똘이'},
-    'LOTTE': {'full': '롯데 자이언츠', 'mascot': '눌이'},
-    'KIA': {'full': 'KIA 타이거즈', 'mascot': '호거리'},
-    'DOOSAN': {'full': '두산 베어스', 'mascot': '철'},
-    'KIWOOM': {'full': '키움 히어로즈', 'mascot': '턱도리'},
-}
-
 # --- [Helper Functions] ---
 def get_team_meta(user):
     """헤더 툴팁용 구단 정보 반환"""
-    context = {'team_full_name': "KBO 리그", 'team_mascot': "마스코트"}
-    if user and user.favorite_code:
-        raw_code = user.favorite_code.common_code_value
-        code_key = raw_code.replace('FAVORITE - ', '').replace('FAVORITE-', '').strip().upper()
-        if code_key in TEAM_META_DATA:
-            context['team_full_name'] = TEAM_META_DATA[code_key]['full']
-            context['team_mascot'] = TEAM_META_DATA[code_key]['mascot']
-    return context
+    key = team_key(user.favorite_code.common_code_value) if user and user.favorite_code else None
+    meta = team_meta(key)
+    return {'team_full_name': meta['full'], 'team_mascot': meta['mascot']}
 
 def format_bytes(size):
     """바이트 단위 변환"""
@@ -50,88 +32,28 @@ def format_bytes(size):
         n += 1
     return f"{size:.2f} {power_labels[n]}"
 
-def _deduplicate_videos(queryset):
-    queryset = queryset.prefetch_related(
-        'subtitleinfo_set__commentator_code'
-    )
-    video_map = {}
-    for video in queryset:
-        title = video.highlight_title
-        sub_info = video.subtitleinfo_set.first()
-        commentator_name = ""
-        if sub_info and sub_info.commentator_code:
-            commentator_name = sub_info.commentator_code.common_code_value
-
-        if title not in video_map:
-            video_map[title] = video
-        
-        else:
-            if "박찬호" in commentator_name:
-                video_map[title] = video
-    return list(video_map.values())
-
-def _get_video_querysets(target_code, search_query='', sort_option='latest'):
-    """(내부함수) 조건에 따른 영상 쿼리셋 생성"""
-    TEAM_KOREA_MAP = {
-        'K-BASEBALL': {'id': 12, 'name': '2025 K-BASEBALL SERIES'},
-        'ASIAN': {'id': 13, 'name': 'ASIAN GAMES'},
-        'OLYMPIC': {'id': 14, 'name': 'OLYMPICS'},
-        'PREMIER': {'id': 15, 'name': 'WBSC PREMIER 12'},
-        'WBC': {'id': 16, 'name': 'WORLD BASEBALL CLASSIC'},
-    }
-    KBO_TEAM_MAP = {
-        'LG': 'LG', 'HANWHA': '한화', 'SSG': 'SSG', 'SAMSUNG': '삼성',
-        'NC': 'NC', 'KT': 'KT', 'LOTTE': '롯데', 'KIA': 'KIA',
-        'DOOSAN': '두산', 'KIWOOM': '키움'
-    }
+def _fetch_videos(video_ids):
+    """카탈로그 id 목록 순서대로 HighlightVideo 인스턴스 조회"""
+    videos = HighlightVideo.objects.select_related('video_file').in_bulk(video_ids)
+    return [videos[vid] for vid in video_ids if vid in videos]
 
-    my_team_qs = HighlightVideo.objects.none()
-    other_qs = HighlightVideo.objects.all()
-    current_display_name = ''
-    is_team_korea = False
-
-    if target_code in TEAM_KOREA_MAP:
-        info = TEAM_KOREA_MAP[target_code]
-        current_display_name = info['name']
-        is_team_korea = True
-        my_team_qs = HighlightVideo.objects.filter(video_category_id=info['id']).select_related('video_file').order_by('-match_date')
-        other_qs = HighlightVideo.objects.none()
-    else:
-        korean_name = KBO_TEAM_MAP.get(target_code, '삼성')
-        current_display_name = f"{korean_name}"
-        is_team_korea = False
-        
-        my_team_qs = HighlightVideo.objects.filter(
-            video_category_id=11,
-            highlight_title__icontains=korean_name
-        ).select_related('video_file').order_by('-match_date')
-
-        other_qs = HighlightVideo.objects.filter(video_category_id=11).exclude(
-            video_file_id__in=my_team_qs.values_list('video_file_id', flat=True)
-        ).select_related('video_file')
-
-    if not is_team_korea:
-        if search_query:
-            other_qs = other_qs.filter(highlight_title__icontains=search_query)
-        
-        if sort_option == 'oldest':
-            other_qs = other_qs.order_by('match_date')
-        elif sort_option == 'name':
-            other_qs = other_qs.order_by('highlight_title')
-        else:
-            other_qs = other_qs.order_by('-match_date')
-
-    my_team_list = _deduplicate_videos(my_team_qs)
-    other_list = _deduplicate_videos(other_qs)
-
-    return my_team_list, other_list, is_team_korea, current_display_name
+def _get_video_catalog(target_code, search_query='', sort_option='latest'):
+    """(내부함수) 캐시된 카탈로그에서 조건에 맞는 영상 목록 반환"""
+    catalog = get_catalog(target_code, sort_option)
+
+    other_rows = catalog['other']
+    if search_query and not catalog['is_team_korea']:
+        keyword = search_query.casefold()
+        other_rows = [row for row in other_rows if keyword in row[1].casefold()]
+
+    return catalog['my_team'], other_rows, catalog['is_team_korea'], catalog['display_name'], catalog['other_sort']
 
 
 # --- [Business Logics] ---
-def get_home_context(user_id, search_query, req_team, sort_option='latest'):
-    """홈 화면 데이터 구성 로직"""
-    user = UserInfo.objects.get(user_id=user_id)
-    has_history = SubscribeHistory.objects.filter(user=user).exists()
+def get_home_context(user_ctx, search_query, req_team, sort_option='latest'):
+    """홈 화면 데이터 구성 로직 (user_ctx: users.context.UserContext)"""
+    user = user_ctx.user
+    has_history = user_ctx.has_history
     meta_context = get_team_meta(user)
     
     context = {
@@ -144,13 +66,8 @@ def get_home_context(user_id, search_query, req_team, sort_option='latest'):
 
     # 1. 검색 모드
     if search_query:
-        search_highlights = HighlightVideo.objects.filter(
-            highlight_title__icontains=search_query
-        ).select_related('video_file').order_by('-match_date')
-
-        search_uploads = UserUploadVideo.objects.filter(
-            user=user, use_yn=True, upload_title__icontains=search_query
-        ).select_related('upload_file').order_by('-upload_date')
+        search_highlights = search.search_highlights(search_query)
+        search_uploads = search.search_uploads(user, search_query)
 
         context.update({
             'is_search_mode': True,
@@ -162,16 +79,17 @@ def get_home_context(user_id, search_query, req_team, sort_option='latest'):
     
     # 2. 일반 모드
     else:
-        if not req_team and user.favorite_code:
-            req_team = user.favorite_code.common_code_value.replace('FAVORITE - ', '').replace('FAVORITE-', '').strip().upper()
+        if not req_team and user_ctx.team_code:
+            req_team = user_ctx.team_code
         target_code = req_team if req_team else 'LG'
 
-        my_team_qs, other_qs, is_team_korea, current_display_name = _get_video_querysets(target_code, '', sort_option)
+        my_team_rows, other_rows, is_team_korea, current_display_name, _ = _get_video_catalog(target_code, '', sort_option)
 
         context.update({
             'is_search_mode': False,
-            'my_team_videos': my_team_qs[:3],
-            'other_videos': other_qs[:8],
+            'my_team_videos': _fetch_videos([row[0] for row in my_team_rows[:3]]),
+            'other_videos': _fetch_videos([row[0] for row in other_rows[:8]]),
+            'other_next_cursor': encode_cursor(other_rows[7][2]) if len(other_rows) > 8 else '',
             'current_team_name': current_display_name,
             'current_team_code': target_code,
             'is_team_korea': is_team_korea,
@@ -180,85 +98,122 @@ def get_home_context(user_id, search_query, req_team, sort_option='latest'):
     return context
 
 
+def _serialize_video_list(videos):
+    data = []
+    for v in videos:
+        data.append({
+            'id': v.video_file_id, 
+            'title': v.highlight_title,
+            'date': v.match_date.strftime('%Y년 %m월 %d일'),
+            'url': v.video_file.file_path.url,
+        })
+    return data
+
+
 def get_video_list_api_logic(section_type, page, target_code, search_query, sort_option):
     """영상 더보기 API 로직"""
-    my_team_qs, other_qs, _, _ = _get_video_querysets(target_code, search_query, sort_option)
+    my_team_rows, other_rows, _, _, _ = _get_video_catalog(target_code, search_query, sort_option)
 
     if section_type == 'my_team':
         limit = 3
-        queryset = my_team_qs
+        rows = my_team_rows
     else: 
         limit = 8
-        queryset = other_qs
+        rows = other_rows
 
-    paginator = Paginator(queryset, limit)
+    paginator = Paginator(rows, limit)
     
     if page > paginator.num_pages:
         return [], False
 
     videos_page = paginator.get_page(page)
-    
-    data = []
-    for v in videos_page:
-        data.append({
-            'id': v.video_file_id, 
-            'title': v.highlight_title,
-            'date': v.match_date.strftime('%Y년 %m월 %d일'),
-            'url': v.video_file.file_path.url,
-        })
+    data = _serialize_video_list(_fetch_videos([row[0] for row in videos_page]))
     
     return data, videos_page.has_next()
 
 
-def get_play_context(user_id, video_id):
+def get_video_list_cursor_logic(section_type, cursor, target_code, search_query, sort_option):
+    """영상 더보기 API 로직 (커서 기반 - 무한 스크롤용)"""
+    my_team_rows, other_rows, _, _, other_sort = _get_video_catalog(target_code, search_query, sort_option)
+
+    if section_type == 'my_team':
+        limit = 3
+        rows, row_sort = my_team_rows, 'latest'
+    else:
+        limit = 8
+        rows, row_sort = other_rows, other_sort
+
+    start = rows_after(rows, decode_cursor(cursor), row_sort)
+    page_rows = rows[start:start + limit]
+    has_next = start + limit < len(rows)
+    next_cursor = encode_cursor(page_rows[-1][2]) if page_rows and has_next else None
+
+    data = _serialize_video_list(_fetch_videos([row[0] for row in page_rows]))
+    return data, has_next, next_cursor
+
+
+def check_highlight_access(user_ctx, video_id, trial_video_id=None):
+    """
+    하이라이트 시청 권한 확인 (구독 이력이 있거나 무료 체험 1회)
+    무료 체험을 아직 쓰지 않았으면 이번 영상으로 사용 처리하고 True(체험 시청)를 반환한다.
+    체험으로 보고 있는 영상(trial_video_id)은 다시 열 수 있고, 그 외에는 PermissionError("TRIAL_EXPIRED")
+    """
+    if user_ctx.has_history:
+        return False
+    user = user_ctx.user
+    if trial_video_id is not None and trial_video_id == video_id:
+        return True
+    # 동시에 연 두 영상이 모두 체험으로 통과하지 않도록 조건부 UPDATE 로 사용 처리
+    if user.free_use_yn or not UserInfo.objects.filter(user_id=user.user_id, free_use_yn=False).update(free_use_yn=True):
+        raise PermissionError("TRIAL_EXPIRED")
+    user_id = user.user_id
+    transaction.on_commit(lambda: invalidate_user_context(user_id))
+    return True
+
+
+def get_play_context(user_ctx, video_id, trial_video_id=None):
     """하이라이트 영상 재생 컨텍스트 (무료체험 로직 포함)"""
-    user = UserInfo.objects.get(user_id=user_id)
-    has_history = SubscribeHistory.objects.filter(user=user).exists()
+    user = user_ctx.user
+    has_history = user_ctx.has_history
+    is_trial = check_highlight_access(user_ctx, video_id, trial_video_id)
 
-    if not has_history: 
-        if not user.free_use_yn:
-            user.free_use_yn = True
-            user.save()
-        else:
-            raise PermissionError("TRIAL_EXPIRED") 
+    video = get_object_or_404(HighlightVideo.objects.select_related('video_file'), video_file_id=video_id)
 
-    video = get_object_or_404(HighlightVideo, video_file_id=video_id)
-    siblings = HighlightVideo.objects.filter(
-        highlight_title=video.highlight_title,
-        match_date=video.match_date
-    ).prefetch_related('subtitleinfo_set__commentator_code')
+    # 같은 경기의 해설자별 버전: 영상마다 첫 번째 자막의 해설자 (자막 본문은 읽지 않고 쿼리 1번)
+    sibling_commentators = {}
+    for sib_id, code_id in SubtitleInfo.objects.filter(
+        video_file__highlight_title=video.highlight_title,
+        video_file__match_date=video.match_date,
+    ).order_by('pk').values_list('video_file_id', 'commentator_code_id'):
+        sibling_commentators.setdefault(sib_id, code_id)
 
     versions = {}
     current_commentator = "기본"
 
-    for sib in siblings:
-        sub = sib.subtitleinfo_set.first()
-        if sub and sub.commentator_code:
-            c_name = sub.commentator_code.common_code_value
+    for sib_id, code_id in sibling_commentators.items():
+        commentator_code = codes.get(code_id)
+        if commentator_code:
+            c_name = commentator_code.common_code_value
             
             if "박찬호" in c_name: key = "박찬오"
             elif "이순칠" in c_name: key = "이순칠"
             elif "김선오" in c_name: key = "김선오"
             else: key = c_name
 
-            versions[key] = sib.video_file_id
+            versions[key] = sib_id
             
-            if sib.video_file_id == video.video_file_id:
+            if sib_id == video.video_file_id:
                 current_commentator = key
 
     subtitle_data = "[]"
     try:
-        sub_info = SubtitleInfo.objects.filter(video_file_id=video_id).first()
-        if sub_info and sub_info.subtitle:
-            subtitle_list = json.loads(sub_info.subtitle.decode('utf-8'))
-            subtitle_data = json.dumps(subtitle_list, ensure_ascii=False)
+        sub_blob = SubtitleInfo.objects.filter(video_file_id=video_id).values_list('subtitle', flat=True).first()
+        subtitle_data = subtitles.to_json_bytes(sub_blob).decode('utf-8')
     except Exception:
         pass 
 
     meta_context = get_team_meta(user)
-    current_team_code = 'LG'
-    if user.favorite_code:
-        current_team_code = user.favorite_code.common_code_value.replace('FAVORITE - ', '').replace('FAVORITE-', '').strip().upper()
+    current_team_code = user_ctx.team_code or 'LG'
 
     return {
         'user': user,
@@ -266,30 +221,25 @@ def get_play_context(user_id, video_id):
         'subtitle_data': subtitle_data,
         'current_team_code': current_team_code,
         'has_history': has_history,
+        'is_trial': is_trial,
         'versions': versions,       
         'current_commentator': current_commentator,
         **meta_context
     }
 
 
-def get_my_videos_context(user_id):
+def get_my_videos_context(user_ctx):
     """내 보관함 데이터 구성"""
-    user = UserInfo.objects.get(user_id=user_id)
+    user = user_ctx.user
     
-    if not SubscribeHistory.objects.filter(user=user).exists():
+    if not user_ctx.has_history:
         raise PermissionError("NO_SUBSCRIPTION")
 
     meta_context = get_team_meta(user)
     
-    active_sub = SubscribeHistory.objects.select_related('plan').filter(
-        user=user
-    ).filter(
-        Q(subscribe_end_dt__gte=timezone.now()) | Q(subscribe_end_dt__isnull=True)
-    ).order_by('-subscribe_start_dt').first()
-
-    limit_bytes = active_sub.plan.storage_limit * 1024 if active_sub else 0
+    limit_bytes = user_ctx.storage_limit_bytes
     used_bytes = user.storage_usage * 1024
-    remaining_bytes = max(0, limit_bytes - used_bytes)
+    remaining_bytes = max(0, limit_bytes - used_bytes - user.storage_reserved * 1024)
     
     storage_display = f"{format_bytes(used_bytes)} / {format_bytes(limit_bytes)}"
     used_percentage = (used_bytes / limit_bytes * 100) if limit_bytes > 0 else 100
@@ -310,54 +260,142 @@ def get_my_videos_context(user_id):
     }
 
 
-def process_upload_video(user_id, uploaded_file, title, commentator_name):
+def _register_upload(user, file_name, file_size, title, commentator_name, reservation_id):
+    """
+    저장이 끝난 영상 파일을 DB에 등록하고 처리 작업을 큐에 넣는다.
+    저장공간 예약을 실제 크기로 확정하며, 실패하면 저장된 파일을 지우고 예약을 해제한다.
+    """
+    status_code_20 = codes.status(STATUS_UPLOADED)
+    commentator_code_obj = codes.commentator(commentator_name)
+    db_analyst_id = commentator_code_obj.common_code if commentator_code_obj else DEFAULT_COMMENTATOR_ID
+    limit_kb = quota.storage_limit_kb(user.pk)
+
+    try:
+        with transaction.atomic():
+            quota.commit_reservation(reservation_id, user.pk, file_size, limit_kb)
+
+            new_file_info = FileInfo.objects.create(file_path=file_name, file_size=file_size)
+            new_upload = UserUploadVideo.objects.create(
+                upload_file=new_file_info,
+                user=user,
+                upload_status_code=status_code_20,
+                upload_title=title,
+                upload_date=timezone.now(),
+                download_count=0,
+                use_yn=True
+            )
+
+            SubtitleInfo.objects.create(
+                upload_file=new_upload,
+                video_file=None,
+                commentator_code=commentator_code_obj,
+                subtitle=b''
+            )
+
+            enqueue_upload_job(new_upload, db_analyst_id)
+    except Exception:
+        default_storage.delete(file_name)
+        quota.release_reservation(reservation_id)
+        raise
+    
+    return {
+        'file_id': new_upload.pk,
+        'status': 'success'
+    }
+
+
+def reserve_upload_logic(user_id, content_length):
+    """폼 업로드 본문을 받기 전에 Content-Length 만큼 저장공간 예약 -> 예약"""
+    if not UserInfo.objects.filter(user_id=user_id).exists():
+        raise ValueError("유효하지 않은 사용자입니다.")
+    if not content_length or content_length <= 0:
+        raise ValueError('파일 크기 정보가 올바르지 않습니다.')
+    return quota.reserve_storage(user_id, content_length, quota.storage_limit_kb(user_id))
+
+
+def release_upload_logic(reservation_id):
+    """업로드 실패/중단 시 저장공간 예약 해제 (이미 확정된 예약이면 아무 일도 하지 않음)"""
+    quota.release_reservation(reservation_id)
+
+
+def process_upload_video(user_id, uploaded_file, title, commentator_name, reservation_id):
     try:
         user = UserInfo.objects.get(user_id=user_id)
     except UserInfo.DoesNotExist:
         raise ValueError("유효하지 않은 사용자입니다.")
 
-    if not uploaded_file.name.lower().endswith('.mp4'):
+    if isinstance(uploaded_file, uploads.S3UploadedFile):
+        # S3StreamingUploadHandler 가 받는 동안 이미 저장하고 MP4 시그니처도 확인했다
+        return _register_upload(user, uploaded_file.key, uploaded_file.size, title, commentator_name, reservation_id)
+
+    if not uploads.is_mp4(uploads.read_head(uploaded_file)):
         raise ValueError('MP4 형식의 파일만 업로드 가능합니다.')
 
-    new_file_info = FileInfo.objects.create(file_path=uploaded_file)
-    
-    status_code_20 = CommonCode.objects.get(common_code=20, common_code_grp='STATUS')
-    commentator_code_obj = CommonCode.objects.filter(common_code_value=commentator_name, common_code_grp='COMMENTATOR').first()
-    db_analyst_id = commentator_code_obj.common_code if commentator_code_obj else 17
-    
-    new_upload = UserUploadVideo.objects.create(
-        upload_file=new_file_info,
-        user=user,
-        upload_status_code=status_code_20,
-        upload_title=title,
-        upload_date=timezone.now(),
-        download_count=0,
-        use_yn=True
-    )
-    
-    SubtitleInfo.objects.create(
-        upload_file=new_upload,
-        video_file=None,
-        commentator_code=commentator_code_obj,
-        subtitle=b''
-    )
+    new_file_info = FileInfo(file_path=uploaded_file)
+    new_file_info.file_path.save(uploaded_file.name, uploaded_file, save=False)
 
-    file_size_kb = math.ceil(uploaded_file.size / 1024)
-    user.storage_usage += file_size_kb
-    user.save()
+    return _register_upload(user, new_file_info.file_path.name, uploaded_file.size, title, commentator_name, reservation_id)
+
+
+def initiate_direct_upload_logic(user_id, filename, file_size):
+    """
+    브라우저 → S3 직접 업로드 시작
+    선언된 크기만큼 저장공간을 예약한 뒤 멀티파트 업로드 생성 + 파트별 presigned URL 발급
+    """
+    if not UserInfo.objects.filter(user_id=user_id).exists():
+        raise ValueError("유효하지 않은 사용자입니다.")
+
+    if not filename or not filename.lower().endswith('.mp4'):
+        raise ValueError('MP4 형식의 파일만 업로드 가능합니다.')
+    if not file_size or file_size <= 0:
+        raise ValueError('파일 크기 정보가 올바르지 않습니다.')
+
+    key = s3.build_upload_key(filename)
+    reservation = quota.reserve_storage(user_id, file_size, quota.storage_limit_kb(user_id), object_key=key)
+    try:
+        upload_id, part_size, parts = s3.create_multipart_upload(key, file_size)
+    except Exception:
+        quota.release_reservation(reservation.pk)
+        raise
+    quota.set_reservation_upload(reservation.pk, upload_id)
 
-    thread = threading.Thread(
-        target=runpod_client.process_and_monitor,
-        args=(new_upload, None, db_analyst_id)
-    )
-    thread.start()
-    
     return {
-        'file_id': new_upload.pk,
-        'status': 'success'
+        'key': key,
+        'upload_id': upload_id,
+        'reservation_id': reservation.pk,
+        'part_size': part_size,
+        'parts': parts,
     }
 
 
+def complete_direct_upload_logic(user_id, pending, parts, title, commentator_name):
+    """
+    브라우저 직접 업로드 완료 처리
+    pending: 업로드 시작 시 세션에 저장해 둔 {'key', 'upload_id', 'reservation_id'}
+    """
+    try:
+        user = UserInfo.objects.get(user_id=user_id)
+    except UserInfo.DoesNotExist:
+        raise ValueError("유효하지 않은 사용자입니다.")
+
+    if not parts:
+        raise ValueError('업로드된 파트 정보가 없습니다.')
+
+    file_size = s3.complete_multipart_upload(pending['key'], pending['upload_id'], parts)
+    # 파일명만 믿지 않고 폼 업로드(S3StreamingUploadHandler)와 같은 MP4 시그니처 확인
+    if not uploads.is_mp4(s3.read_object_head(pending['key'], uploads.MP4_HEAD_SIZE)):
+        default_storage.delete(pending['key'])
+        quota.release_reservation(pending.get('reservation_id'))
+        raise ValueError('MP4 형식의 파일만 업로드 가능합니다.')
+    return _register_upload(user, pending['key'], file_size, title, commentator_name, pending.get('reservation_id'))
+
+
+def abort_direct_upload_logic(pending):
+    """브라우저 직접 업로드 취소 (예약 해제 + 업로드된 파트 정리)"""
+    quota.release_reservation(pending.get('reservation_id'))
+    s3.abort_multipart_upload(pending['key'], pending['upload_id'])
+
+
 def process_download_logic(user_id, video_id):
     """다운로드 처리 로직 (카운트 증가)"""
     user = UserInfo.objects.get(user_id=user_id)
@@ -367,34 +405,42 @@ def process_download_logic(user_id, video_id):
         use_yn=True
     )
 
-    if video.download_count >= 10:
-        raise PermissionError("LIMIT_EXCEEDED")
-
-    video.download_count += 1
-    video.save()
+    current_count = quota.increment_download_count(video.pk)
 
     return {
         'file_url': video.upload_file.file_path.url,
-        'current_count': video.download_count,
-        'remaining_count': 10 - video.download_count
+        'current_count': current_count,
+        'remaining_count': quota.DOWNLOAD_LIMIT - current_count
     }
 
 
-def delete_video_logic(user_id, video_id):
-    """영상 삭제 (Soft Delete)"""
-    user = UserInfo.objects.get(user_id=user_id)
-    video = UserUploadVideo.objects.get(
-        upload_file__file_id=video_id, 
-        user=user,
-        use_yn=True
-    )
-    video.use_yn = False
-    video.save()
+def _stored_file_size(file_info):
+    """저장된 파일 크기(bytes). 크기를 기록하기 전에 올라온 파일은 스토리지에 조회"""
+    if file_info.file_size is not None:
+        return file_info.file_size
+    try:
+        return file_info.file_path.size
+    except Exception as e:
+        logger.warning(f"⚠️ 파일 크기 조회 실패 ({file_info.file_path.name}): {e}")
+        return 0
 
 
-def get_user_play_context(user_id, video_id):
+def delete_video_logic(user_id, video_id):
+    """영상 삭제 (Soft Delete) + 저장공간 사용량 반환"""
+    with transaction.atomic():
+        video = UserUploadVideo.objects.select_for_update(of=('self',)).select_related('upload_file').get(
+            upload_file__file_id=video_id, 
+            user_id=user_id,
+            use_yn=True
+        )
+        video.use_yn = False
+        video.save(update_fields=['use_yn'])
+        quota.release_storage_usage(user_id, quota.size_to_kb(_stored_file_size(video.upload_file)))
+
+
+def get_user_play_context(user_ctx, video_id):
     """유저 업로드 영상 재생 컨텍스트"""
-    user = UserInfo.objects.get(user_id=user_id)
+    user = user_ctx.user
     meta_context = get_team_meta(user)
     
     video_obj = get_object_or_404(UserUploadVideo, upload_file__file_id=video_id, user=user, use_yn=True)
@@ -402,14 +448,14 @@ def get_user_play_context(user_id, video_id):
     subtitle_info = SubtitleInfo.objects.filter(upload_file=video_obj).select_related('commentator_code').first()
     
     commentator_name = "미지정"
-    subtitle_data = []
+    subtitle_data = "[]"
     
     if subtitle_info:
         if subtitle_info.commentator_code:
             commentator_name = subtitle_info.commentator_code.common_code_value
         if subtitle_info.subtitle:
             try:
-                subtitle_data = json.loads(subtitle_info.subtitle.decode('utf-8'))
+                subtitle_data = subtitles.to_json_bytes(subtitle_info.subtitle).decode('utf-8')
             except:
                 pass
 
@@ -424,8 +470,28 @@ def get_user_play_context(user_id, video_id):
     return {
         'user': user,
         'video': mapped_video,        
-        'subtitle_data': json.dumps(subtitle_data, cls=DjangoJSONEncoder),
+        'subtitle_data': subtitle_data,
         'current_commentator': commentator_name,
         'is_user_upload': True,  
         **meta_context
-    }
\ No newline at end of file
+    }
+
+
+def get_subtitle_logic(user_ctx, subtitle_id, trial_video_id=None):
+    """
+    자막 JSON 조회 (브라우저 캐시용 엔드포인트)
+    하이라이트 자막은 재생과 같은 시청 권한(check_highlight_access, 체험 사용 처리는 하지 않음)이 있어야 하고,
+    업로드 영상 자막은 본인 것만 조회할 수 있다. 권한이 없으면 PermissionError("TRIAL_EXPIRED")
+    Returns: (저장된 자막 bytes, ETag)
+    """
+    row = SubtitleInfo.objects.filter(
+        Q(video_file__isnull=False) | Q(upload_file__user_id=user_ctx.user_id, upload_file__use_yn=True),
+        subtitle_id=subtitle_id,
+    ).values_list('subtitle', 'video_file_id').first()
+    if row is None:
+        raise SubtitleInfo.DoesNotExist
+    blob, video_id = row
+    if video_id is not None and not user_ctx.has_history and video_id != trial_video_id:
+        raise PermissionError("TRIAL_EXPIRED")
+    blob = bytes(blob)
+    return blob, subtitles.etag(blob)
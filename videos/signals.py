@@ -0,0 +1,46 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import HighlightVideo, SubtitleInfo, UserUploadVideo, SearchIndex
+from .catalog import invalidate_catalog
+from . import search
+
+
+@receiver([post_save, post_delete], sender=HighlightVideo)
+def highlight_video_changed(sender, **kwargs):
+    """하이라이트 영상 변경 시 카탈로그 캐시 무효화"""
+    invalidate_catalog()
+
+
+@receiver([post_save, post_delete], sender=SubtitleInfo)
+def highlight_subtitle_changed(sender, instance, **kwargs):
+    """하이라이트 자막(해설자) 변경 시 카탈로그 캐시 무효화 - 유저 업로드 자막은 제외"""
+    if instance.video_file_id:
+        invalidate_catalog()
+
+
+def _title_changed(update_fields, title_field):
+    return update_fields is None or title_field in update_fields
+
+
+@receiver(post_save, sender=HighlightVideo)
+def index_highlight_video(sender, instance, update_fields=None, **kwargs):
+    """하이라이트 제목 검색 색인 갱신"""
+    if _title_changed(update_fields, 'highlight_title'):
+        search.index_highlight(instance)
+
+
+@receiver(post_save, sender=UserUploadVideo)
+def index_user_upload_video(sender, instance, update_fields=None, **kwargs):
+    """업로드 영상 제목 검색 색인 갱신"""
+    if _title_changed(update_fields, 'upload_title'):
+        search.index_upload(instance)
+
+
+@receiver(post_delete, sender=HighlightVideo)
+def unindex_highlight_video(sender, instance, **kwargs):
+    search.remove_document(SearchIndex.DOC_HIGHLIGHT, instance.pk)
+
+
+@receiver(post_delete, sender=UserUploadVideo)
+def unindex_user_upload_video(sender, instance, **kwargs):
+    search.remove_document(SearchIndex.DOC_UPLOAD, instance.pk)
@@ -0,0 +1,179 @@
+"""
+자막 원본(RunPod/관리자 업로드 타임라인 JSON) -> 저장용 자막 변환 파이프라인
+
+원본 형식: [{"set_start_sec", "set_end_sec", "caster_text", "analyst_text"}, ...]
+저장 형식: [{"start", "end", "text"}, ...] (videos.subtitles 압축 포맷)
+
+파일 전체를 읽지 않고 최상위 배열을 항목 단위로 파싱 -> 검증 -> 겹치는 구간 병합 -> 압축까지
+제너레이터로 이어서 처리하므로, 몇 시간짜리 타임라인도 메모리 사용량이 원본 크기와 무관하다.
+"""
+import re
+import json
+import math
+import codecs
+from . import subtitles
+
+READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE_RE = re.compile(r'[\s\ufeff]*')
+
+
+class SubtitleFormatError(ValueError):
+    """원본 자막이 JSON 배열 형식이 아닌 경우"""
+
+
+class IngestStats:
+    __slots__ = ('items', 'segments', 'skipped', 'merged', 'duration', 'end')
+
+    def __init__(self):
+        self.items = 0       # 원본 항목 수
+        self.segments = 0    # 저장된 자막 수
+        self.skipped = 0     # 시간 값이 잘못되었거나 텍스트가 비어 제외된 항목 수
+        self.merged = 0      # 앞 자막과 겹쳐서 합쳐진 항목 수
+        self.duration = 0.0  # 자막이 표시되는 총 시간(초)
+        self.end = 0.0       # 마지막 자막 종료 시각(초)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return (f"원본 {self.items}개 -> 자막 {self.segments}개 "
+                f"(제외 {self.skipped}, 병합 {self.merged}, 표시 {self.duration:.1f}초 / 종료 {self.end:.1f}초)")
+
+
+def iter_json_array(fp, chunk_size=READ_CHUNK_SIZE):
+    """
+    file-like 객체(S3 StreamingBody, UploadedFile 등)의 최상위 JSON 배열을 항목 단위로 yield
+    버퍼에는 아직 처리하지 않은 부분(읽기 단위 + 항목 하나)만 유지한다.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buf, pos, eof = '', 0, False
+
+    def fill(size):
+        nonlocal buf, pos, eof
+        chunk = fp.read(size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + utf8.decode(chunk or b'', final=eof)
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE_RE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return
+            fill(chunk_size)
+
+    skip_whitespace()
+    if pos >= len(buf):
+        raise SubtitleFormatError("자막 파일이 비어 있습니다.")
+    if buf[pos] != '[':
+        raise SubtitleFormatError("자막 데이터가 리스트 형식이 아닙니다.")
+    pos += 1
+
+    first = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise ValueError("자막 JSON이 중간에 끝났습니다.")
+        if buf[pos] == ']':
+            return
+        if not first:
+            if buf[pos] != ',':
+                raise ValueError(f"자막 JSON 형식 오류 (위치 {pos}: {buf[pos]!r})")
+            pos += 1
+            skip_whitespace()
+
+        # 항목이 읽기 단위보다 크면 읽기 크기를 두 배씩 늘려서 재시도 횟수를 줄인다.
+        read_size = chunk_size
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                if end < len(buf) or eof:
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            fill(read_size)
+            read_size *= 2
+
+        pos = end
+        first = False
+        yield item
+
+
+def normalize_item(item):
+    """원본 항목 하나 -> {start, end, text}. 사용할 수 없는 항목이면 None"""
+    if not isinstance(item, dict):
+        return None
+    try:
+        start = round(float(item.get('set_start_sec', 0)), 2)
+        end = round(float(item.get('set_end_sec', 0)), 2)
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(start) and math.isfinite(end)) or start < 0 or end < start:
+        return None
+
+    text_parts = []
+    if item.get('caster_text'):
+        text_parts.append(f"{item['caster_text']}")
+    if item.get('analyst_text'):
+        text_parts.append(f"{item['analyst_text']}")
+
+    full_text = " ".join(text_parts)
+    if not full_text.strip():
+        return None
+    return {"start": start, "end": end, "text": full_text}
+
+
+def _normalized(items, stats):
+    for item in items:
+        stats.items += 1
+        segment = normalize_item(item)
+        if segment is None:
+            stats.skipped += 1
+            continue
+        yield segment
+
+
+def merge_overlaps(segments, stats):
+    """
+    앞 자막과 시간이 겹치는 자막은 하나로 합친다.
+    (재생 화면은 현재 시각에 해당하는 첫 자막만 보여주므로 겹치면 뒤 자막이 가려진다)
+    """
+    prev = None
+    for segment in segments:
+        if prev is not None and segment['start'] < prev['end']:
+            prev['start'] = min(prev['start'], segment['start'])
+            prev['end'] = max(prev['end'], segment['end'])
+            prev['text'] = f"{prev['text']} {segment['text']}"
+            stats.merged += 1
+            continue
+        if prev is not None:
+            yield prev
+        prev = segment
+    if prev is not None:
+        yield prev
+
+
+def _counted(segments, stats):
+    for segment in segments:
+        stats.segments += 1
+        stats.duration += segment['end'] - segment['start']
+        stats.end = max(stats.end, segment['end'])
+        yield segment
+
+
+def ingest(fp, chunk_size=READ_CHUNK_SIZE):
+    """
+    원본 자막 스트림 -> (저장용 자막 bytes, IngestStats)
+    fp: read(size)를 지원하는 file-like 객체
+    """
+    stats = IngestStats()
+    segments = merge_overlaps(_normalized(iter_json_array(fp, chunk_size), stats), stats)
+    blob = subtitles.encode(_counted(segments, stats))
+    stats.duration = round(stats.duration, 2)
+    return blob, stats
@@ -0,0 +1,97 @@
+"""
+자막 저장 포맷
+- SUBTITLE_INFO.SUBTITLE 에는 [{"start","end","text"}, ...] 를 압축 JSON(gzip)으로 저장한다.
+- 직렬화된 JSON은 HTML 특수문자가 이스케이프되어 있어 템플릿/응답에 파싱 없이 바로 사용한다.
+- 이전 포맷(압축하지 않은 JSON)도 읽을 수 있으며, compress_subtitles 명령으로 일괄 변환한다.
+"""
+import io
+import gzip
+import json
+import zlib
+import hashlib
+
+GZIP_MAGIC = b'\x1f\x8b'
+EMPTY_JSON = b'[]'
+PREVIEW_PEEK_BYTES = 4096
+
+# <script> 안에 그대로 넣어도 안전하도록 HTML 특수문자를 유니코드 이스케이프 (django json_script와 동일)
+_JSON_SCRIPT_ESCAPES = {ord('<'): '\\u003C', ord('>'): '\\u003E', ord('&'): '\\u0026'}
+
+
+def is_compressed(blob):
+    return bytes(blob[:2]) == GZIP_MAGIC
+
+
+def serialize(segments):
+    """자막 목록 -> 템플릿에 바로 넣을 수 있는 JSON bytes"""
+    text = json.dumps(segments, ensure_ascii=False, separators=(',', ':'))
+    return text.translate(_JSON_SCRIPT_ESCAPES).encode('utf-8')
+
+
+def encode(segments):
+    """
+    자막 목록(iterable) -> 저장용 bytes (압축 JSON)
+    항목 단위로 직렬화해서 바로 압축하므로 제너레이터를 넘기면 압축 결과만 메모리에 남는다.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6, mtime=0) as gz:
+        gz.write(b'[')
+        for i, segment in enumerate(segments):
+            if i:
+                gz.write(b',')
+            gz.write(serialize(segment))
+        gz.write(b']')
+    return buffer.getvalue()
+
+
+def to_json_bytes(blob):
+    """
+    저장된 자막 -> 직렬화된 JSON bytes
+    압축 포맷은 압축 해제만 하고, 이전 포맷만 파싱 후 다시 직렬화한다.
+    """
+    if not blob:
+        return EMPTY_JSON
+    blob = bytes(blob)
+    if is_compressed(blob):
+        return gzip.decompress(blob)
+    return serialize(json.loads(blob.decode('utf-8')))
+
+
+def load(blob):
+    """저장된 자막 -> 자막 목록"""
+    return json.loads(to_json_bytes(blob))
+
+
+def etag(blob):
+    return hashlib.md5(bytes(blob or b'')).hexdigest()
+
+
+def preview(blob, length=30):
+    """
+    첫 자막 문장 미리보기
+    압축 포맷은 앞부분만 압축 해제해서 첫 항목만 파싱한다. (관리자 목록용)
+    """
+    if not blob:
+        return None
+    blob = bytes(blob)
+    if is_compressed(blob):
+        head = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(blob, PREVIEW_PEEK_BYTES).decode('utf-8', 'ignore')
+        try:
+            first, _ = json.JSONDecoder().raw_decode(head, 1)
+        except ValueError:
+            segments = load(blob)
+            first = segments[0] if segments else None
+    else:
+        segments = load(blob)
+        first = segments[0] if segments else None
+
+    if first is None:
+        return ''
+    return first['text'][:length]
+
+
+def convert(blob):
+    """이전 포맷 자막을 압축 포맷으로 변환. 변환이 필요 없으면 None"""
+    if not blob or is_compressed(blob):
+        return None
+    return encode(json.loads(bytes(blob).decode('utf-8')))
@@ -0,0 +1,52 @@
+from django.test import TransactionTestCase
+from users.models import UserInfo
+from users.tests.fixtures import create_codes, create_user, create_upload, run_parallel, clear_caches
+from videos import quota
+from videos.models import UserUploadVideo, StorageReservation
+
+THREADS = 16
+
+
+class ConcurrentCounterTests(TransactionTestCase):
+    """여러 스레드에서 동시에 늘려도 증가분이 사라지거나 한도를 넘지 않아야 한다. (조건부 UPDATE 한 문장)"""
+
+    def setUp(self):
+        clear_caches()
+        create_codes()
+        self.user = create_user(storage_usage=100)
+        self.video = create_upload(self.user)
+
+    def usage(self):
+        return UserInfo.objects.values_list('storage_usage', 'storage_reserved').get(pk=self.user.pk)
+
+    def test_storage_usage_has_no_lost_updates(self):
+        results = run_parallel(lambda i: quota.add_storage_usage(self.user.pk, 10, limit_kb=10_000), THREADS)
+
+        self.assertFalse([r for r in results if isinstance(r, Exception)], results)
+        self.assertEqual(self.usage(), (100 + 10 * THREADS, 0))
+        # 각 요청이 돌려준 사용량은 서로 다른 증가 시점의 값
+        self.assertEqual(sorted(results), [100 + 10 * (i + 1) for i in range(THREADS)])
+
+    def test_storage_usage_stops_at_limit(self):
+        results = run_parallel(lambda i: quota.add_storage_usage(self.user.pk, 100, limit_kb=600), THREADS)
+
+        succeeded = [r for r in results if not isinstance(r, Exception)]
+        self.assertEqual(len(succeeded), 5)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results if isinstance(r, Exception)), results)
+        self.assertEqual(self.usage(), (600, 0))
+
+    def test_reservations_count_against_limit(self):
+        results = run_parallel(lambda i: quota.reserve_storage(self.user.pk, 100 * 1024, limit_kb=600), THREADS)
+
+        reserved = [r for r in results if isinstance(r, StorageReservation)]
+        self.assertEqual(len(reserved), 5)
+        self.assertEqual(self.usage(), (100, 500))
+        self.assertEqual(StorageReservation.objects.filter(user=self.user).count(), 5)
+
+    def test_download_count_has_no_lost_updates_and_stops_at_limit(self):
+        results = run_parallel(lambda i: quota.increment_download_count(self.video.pk), THREADS)
+
+        counts = sorted(r for r in results if isinstance(r, int))
+        self.assertEqual(counts, list(range(1, quota.DOWNLOAD_LIMIT + 1)))
+        self.assertTrue(all(isinstance(r, PermissionError) for r in results if not isinstance(r, int)), results)
+        self.assertEqual(UserUploadVideo.objects.get(pk=self.video.pk).download_count, quota.DOWNLOAD_LIMIT)
@@ -0,0 +1,85 @@
+from datetime import date
+from django.test import TestCase
+from users.models import UserInfo
+from videos import search
+from videos.models import FileInfo, HighlightVideo, UserUploadVideo, SearchIndex
+
+
+def create_highlight(title, match_date=date(2025, 10, 1)):
+    file_info = FileInfo.objects.create(file_path='videos/highlight.mp4')
+    return HighlightVideo.objects.create(video_file=file_info, highlight_title=title, match_date=match_date)
+
+
+def create_upload(user, title, use_yn=True):
+    file_info = FileInfo.objects.create(file_path='videos/upload.mp4')
+    return UserUploadVideo.objects.create(
+        upload_file=file_info, user=user, upload_title=title, upload_date=date(2025, 10, 1), use_yn=use_yn,
+    )
+
+
+class TokenizeTests(TestCase):
+    def test_bigrams_are_case_and_space_normalized(self):
+        self.assertEqual(search.tokenize('  LG  트윈스 '), {'lg', 'g ', ' 트', '트윈', '윈스'})
+        self.assertEqual(search.tokenize('a'), set())
+
+
+class HighlightSearchTests(TestCase):
+    def test_index_follows_save_and_delete(self):
+        video = create_highlight('한화 이글스 하이라이트')
+        self.assertEqual([v.pk for v in search.search_highlights('이글스')], [video.pk])
+
+        video.highlight_title = 'LG 트윈스 하이라이트'
+        video.save()
+        self.assertEqual(search.search_highlights('이글스'), [])
+        self.assertEqual([v.pk for v in search.search_highlights('트윈스')], [video.pk])
+
+        video.delete()
+        self.assertFalse(SearchIndex.objects.filter(doc_type=SearchIndex.DOC_HIGHLIGHT).exists())
+
+    def test_title_unchanged_save_keeps_index(self):
+        video = create_highlight('두산 베어스 명장면')
+        before = set(SearchIndex.objects.values_list('pk', flat=True))
+        video.match_date = date(2025, 10, 2)
+        video.save(update_fields=['match_date'])
+        self.assertEqual(set(SearchIndex.objects.values_list('pk', flat=True)), before)
+
+    def test_results_are_substring_matches_ranked_by_relevance(self):
+        substring = create_highlight('오늘의KIA전 요약', date(2025, 10, 5))
+        word_start = create_highlight('명장면 KIA 타이거즈', date(2025, 10, 4))
+        prefix = create_highlight('KIA 타이거즈 하이라이트', date(2025, 10, 3))
+        exact = create_highlight('kia', date(2025, 10, 2))
+        create_highlight('KT 위즈 하이라이트')  # 'ki' 토큰은 없고 'ia' 도 없음
+
+        self.assertEqual(
+            [v.pk for v in search.search_highlights('KIA')],
+            [exact.pk, prefix.pk, word_start.pk, substring.pk],
+        )
+
+    def test_bigram_candidates_without_substring_are_dropped(self):
+        create_highlight('타이 거즈')  # '타이', '거즈' 토큰은 있지만 '타이거즈' 는 아님
+        self.assertEqual(search.search_highlights('타이거즈'), [])
+
+    def test_single_character_query_falls_back_to_contains(self):
+        video = create_highlight('NC 다이노스')
+        self.assertEqual([v.pk for v in search.search_highlights('노')], [video.pk])
+
+
+class UploadSearchTests(TestCase):
+    def setUp(self):
+        self.user = UserInfo.objects.create(user_id='user-1', email='user1@test.local', password='-')
+        self.other = UserInfo.objects.create(user_id='user-2', email='user2@test.local', password='-')
+
+    def test_scoped_to_user_and_visible_videos(self):
+        mine = create_upload(self.user, '내 직관 영상')
+        create_upload(self.user, '삭제한 직관 영상', use_yn=False)
+        create_upload(self.other, '남의 직관 영상')
+
+        self.assertEqual([v.pk for v in search.search_uploads(self.user, '직관')], [mine.pk])
+
+    def test_rebuild_matches_incremental_index(self):
+        create_highlight('롯데 자이언츠 하이라이트')
+        create_upload(self.user, '사직 직관')
+        incremental = set(SearchIndex.objects.values_list('token', 'doc_type', 'doc_id', 'user_id'))
+
+        self.assertEqual(search.rebuild_index(), (1, 1))
+        self.assertEqual(set(SearchIndex.objects.values_list('token', 'doc_type', 'doc_id', 'user_id')), incremental)
@@ -0,0 +1,89 @@
+import gzip
+from django.test import TestCase, override_settings
+from payments.subscription_state import refresh_subscription_state
+from users.models import UserInfo
+from users.tests.fixtures import (
+    TEST_STORAGES, create_codes, create_user, subscribe, create_highlight_versions, create_upload, login, clear_caches,
+)
+from videos import subtitles
+from videos.models import SubtitleInfo
+
+SEGMENTS = [{'start': 0.0, 'end': 1.5, 'text': '홈런입니다'}]
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class SubtitleEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.subscriber = create_user('subscriber')
+        subscribe(cls.subscriber)
+        cls.free_user = create_user('free-user')
+        cls.highlights = create_highlight_versions('LG vs 한화', commentator_ids=(17, 18))
+        SubtitleInfo.objects.filter(video_file__in=cls.highlights).update(subtitle=subtitles.encode(SEGMENTS))
+        cls.subtitle_ids = [
+            SubtitleInfo.objects.get(video_file=video).pk for video in cls.highlights
+        ]
+
+    def setUp(self):
+        for user in (self.subscriber, self.free_user):
+            refresh_subscription_state(user.pk)
+        clear_caches()
+
+    def get_subtitle(self, subtitle_id, **headers):
+        return self.client.get(f'/videos/subtitles/{subtitle_id}.json', headers=headers)
+
+    def test_subscriber_gets_gzip_and_identity_with_distinct_etags(self):
+        login(self.client, self.subscriber.pk)
+
+        gzipped = self.get_subtitle(self.subtitle_ids[0], accept_encoding='gzip, br')
+        identity = self.get_subtitle(self.subtitle_ids[0])
+
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), identity.content)
+        self.assertTrue(gzipped['ETag'].endswith('-gz"'))
+        self.assertEqual(gzipped['ETag'], identity['ETag'][:-1] + '-gz"')
+
+    def test_etag_revalidates_only_for_the_same_encoding(self):
+        login(self.client, self.subscriber.pk)
+        etag = self.get_subtitle(self.subtitle_ids[0], accept_encoding='gzip')['ETag']
+
+        self.assertEqual(self.get_subtitle(self.subtitle_ids[0], accept_encoding='gzip', if_none_match=etag).status_code, 304)
+        response = self.get_subtitle(self.subtitle_ids[0], if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_user_without_subscription_cannot_fetch_highlight_subtitles(self):
+        UserInfo.objects.filter(pk=self.free_user.pk).update(free_use_yn=True)
+        login(self.client, self.free_user.pk)
+
+        self.assertEqual(self.get_subtitle(self.subtitle_ids[0]).status_code, 403)
+
+    def test_fetching_subtitles_does_not_use_up_the_trial(self):
+        login(self.client, self.free_user.pk)
+
+        self.assertEqual(self.get_subtitle(self.subtitle_ids[0]).status_code, 403)
+        self.assertFalse(UserInfo.objects.get(pk=self.free_user.pk).free_use_yn)
+
+    def test_trial_covers_only_the_trial_video(self):
+        login(self.client, self.free_user.pk)
+
+        trial = self.client.get(f'/videos/play/{self.highlights[0].pk}/')
+        self.assertTrue(trial.context['is_trial'])
+        self.assertEqual(self.get_subtitle(self.subtitle_ids[0]).status_code, 200)
+        self.assertEqual(self.client.get(f'/videos/play/{self.highlights[0].pk}/').status_code, 200)
+
+        self.assertEqual(self.get_subtitle(self.subtitle_ids[1]).status_code, 403)
+        self.assertIn('무료 체험이 종료', self.client.get(f'/videos/play/{self.highlights[1].pk}/').content.decode())
+
+    def test_own_upload_subtitles_do_not_need_subscription(self):
+        upload = create_upload(self.free_user)
+        subtitle = SubtitleInfo.objects.create(upload_file=upload, commentator_code_id=17, subtitle=subtitles.encode(SEGMENTS))
+        login(self.client, self.free_user.pk)
+
+        self.assertEqual(self.get_subtitle(subtitle.pk).status_code, 200)
+        self.assertEqual(self.get_subtitle_of_other_user(subtitle).status_code, 404)
+
+    def get_subtitle_of_other_user(self, subtitle):
+        login(self.client, self.subscriber.pk)
+        return self.get_subtitle(subtitle.pk)
@@ -0,0 +1,135 @@
+import json
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from users.models import UserInfo
+from users.tests.fixtures import TEST_STORAGES, create_codes, create_user, subscribe, create_upload, login, clear_caches
+from payments.subscription_state import refresh_subscription_state
+from videos import quota, s3
+from videos.models import FileInfo, StorageReservation
+
+MP4 = b'\x00\x00\x00\x18ftypmp42' + b'\x00' * 2048
+
+
+@override_settings(STORAGES=TEST_STORAGES, USE_S3_UPLOADS=False)
+class FormUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.user = create_user()
+        subscribe(cls.user, storage_limit=64)
+
+    def setUp(self):
+        refresh_subscription_state(self.user.pk)
+        clear_caches()
+        login(self.client, self.user.pk)
+
+    def upload(self, content):
+        return self.client.post('/videos/upload', {
+            'video_file': SimpleUploadedFile('play.mp4', content, content_type='video/mp4'),
+            'video_title': '직관', 'commentator': '김선오',
+        })
+
+    def test_upload_commits_reservation_as_usage(self):
+        response = self.upload(MP4)
+
+        self.assertEqual(response.json()['status'], 'success')
+        self.assertEqual(UserInfo.objects.values_list('storage_usage', 'storage_reserved').get(pk=self.user.pk), (3, 0))
+        self.assertFalse(StorageReservation.objects.exists())
+
+    def test_body_larger_than_quota_is_rejected_before_reading(self):
+        response = self.upload(MP4 + b'\x00' * 100 * 1024)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], '저장공간이 부족합니다.')
+        self.assertEqual(UserInfo.objects.values_list('storage_usage', 'storage_reserved').get(pk=self.user.pk), (0, 0))
+        self.assertFalse(FileInfo.objects.exists())
+
+    def test_unexpected_error_is_logged_not_leaked(self):
+        with mock.patch('videos.services.process_upload_video', side_effect=RuntimeError('db password=secret')):
+            with self.assertLogs('videos.views', 'ERROR') as logs:
+                response = self.upload(MP4)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertNotIn('secret', response.json()['message'])
+        self.assertIn('Traceback', logs.output[0])
+        self.assertFalse(StorageReservation.objects.exists())
+
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class DirectUploadTests(TestCase):
+    """브라우저 → S3 직접 업로드 (S3 호출은 mock, 완료된 객체는 메모리 스토리지에 둔다)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_codes()
+        cls.user = create_user()
+        subscribe(cls.user, storage_limit=64)
+
+    def setUp(self):
+        refresh_subscription_state(self.user.pk)
+        clear_caches()
+        login(self.client, self.user.pk)
+
+    def post(self, url, data):
+        return self.client.post(url, json.dumps(data), content_type='application/json')
+
+    def upload(self, content):
+        with mock.patch.object(s3, 'create_multipart_upload', return_value=('upload-1', s3.MIN_PART_SIZE, [])):
+            initiated = self.post('/videos/upload/initiate', {'filename': 'play.mp4', 'size': len(content)}).json()
+        key = initiated['key']
+
+        def complete(key, upload_id, parts):
+            default_storage.save(key, ContentFile(content))
+            return len(content)
+
+        with mock.patch.object(s3, 'complete_multipart_upload', side_effect=complete), \
+                mock.patch.object(s3, 'read_object_head', side_effect=lambda key, size: content[:size]) as head, \
+                mock.patch('videos.services.enqueue_upload_job'):
+            response = self.post('/videos/upload/complete', {
+                'upload_id': 'upload-1', 'parts': [{'part_number': 1, 'etag': '"e1"'}],
+                'video_title': '직관', 'commentator': '김선오',
+            })
+        head.assert_called_once_with(key, 12)
+        return key, response
+
+    def test_mp4_is_registered(self):
+        key, response = self.upload(MP4)
+
+        self.assertEqual(response.json()['status'], 'success')
+        self.assertTrue(default_storage.exists(key))
+        self.assertEqual(UserInfo.objects.values_list('storage_usage', 'storage_reserved').get(pk=self.user.pk), (3, 0))
+
+    def test_renamed_non_mp4_is_deleted_and_reservation_released(self):
+        key, response = self.upload(b'<html>not a video</html>' + b'\x00' * 2048)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'MP4 형식의 파일만 업로드 가능합니다.')
+        self.assertFalse(default_storage.exists(key))
+        self.assertEqual(UserInfo.objects.values_list('storage_usage', 'storage_reserved').get(pk=self.user.pk), (0, 0))
+        self.assertFalse(StorageReservation.objects.exists())
+        self.assertFalse(FileInfo.objects.exists())
+
+class ReconcileStorageUsageTests(TestCase):
+    def setUp(self):
+        create_codes()
+        self.user = create_user(storage_usage=999)
+        self.original = create_upload(self.user, '원본')
+        self.processed = create_upload(self.user, '처리 완료')
+        FileInfo.objects.filter(pk=self.processed.upload_file_id).update(file_path='outputs/result_abc.mp4')
+
+    def test_counts_uploaded_and_processed_objects(self):
+        listings = {
+            'videos/': {self.original.upload_file.file_path.name: 2048},
+            'outputs/': {'outputs/result_abc.mp4': 4096},
+        }
+        with mock.patch.object(quota.s3, 'list_object_sizes', side_effect=lambda prefix: listings[prefix]) as listed:
+            result = quota.reconcile_storage_usage()
+
+        self.assertEqual(sorted(call.args[0] for call in listed.call_args_list), ['outputs/', 'videos/'])
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(UserInfo.objects.get(pk=self.user.pk).storage_usage, 2 + 4)
+        self.assertEqual(FileInfo.objects.get(pk=self.processed.upload_file_id).file_size, 4096)
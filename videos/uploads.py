@@ -0,0 +1,152 @@
+"""
+업로드 요청 본문 처리 (Django FileUploadHandler)
+
+- S3StreamingUploadHandler: 영상 파일 바이트를 받는 즉시 S3 멀티파트 업로드로 보낸다.
+  기본 핸들러처럼 2.5MB 넘는 파일을 컨테이너 임시 파일에 쓴 뒤 다시 올리지 않으므로
+  디스크를 쓰지 않고, 요청 시간은 대략 네트워크 전송 시간이 된다.
+
+요청 본문은 request.FILES / request.POST 에 처음 접근할 때 읽히므로,
+뷰에서 핸들러를 upload_handlers 앞쪽에 넣은 뒤에 접근해야 한다. (CSRF 검사도 그 뒤에 수행)
+저장공간 한도는 본문을 읽기 전에 Content-Length 만큼 예약해서 지킨다.
+본문은 Content-Length 에서 잘리므로(LimitedStream) 예약보다 많은 바이트가 들어올 수 없다.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+from . import s3
+
+logger = logging.getLogger(__name__)
+
+MP4_HEAD_SIZE = 12
+
+
+def is_mp4(head):
+    """ISO BMFF(MP4) 시그니처: 첫 박스가 ftyp"""
+    return len(head) >= 8 and head[4:8] == b'ftyp'
+
+
+def read_head(uploaded_file):
+    """업로드 파일의 앞부분 (위치는 처음으로 되돌린다)"""
+    uploaded_file.seek(0)
+    head = uploaded_file.read(MP4_HEAD_SIZE)
+    uploaded_file.seek(0)
+    return head
+
+
+class S3UploadedFile(UploadedFile):
+    """S3에 저장이 끝난 업로드 파일 (key: 객체 키 = FileInfo.file_path 이름)"""
+
+    def __init__(self, key, name, content_type, size):
+        super().__init__(file=None, name=name, content_type=content_type, size=size)
+        self.key = key
+
+
+class S3StreamingUploadHandler(FileUploadHandler):
+    """
+    field_name 파일을 S3 멀티파트 업로드로 바로 전송한다.
+    - 파트 하나를 채우는 동안 직전 파트는 백그라운드 스레드에서 전송 (메모리는 파트 2개 이내)
+    - 첫 바이트의 MP4 시그니처를 확인해서 아니면 바로 중단
+    - 업로드가 중단되거나 실패하면 멀티파트 업로드를 취소한다. (abort 는 여러 번 호출해도 안전)
+    """
+
+    def __init__(self, request, field_name):
+        super().__init__(request)
+        self.field_name = field_name
+        self.error = None
+        self.key = None
+        self._active = False
+        self._upload_id = None
+        self._part_size = s3.MIN_PART_SIZE
+        self._buffer = bytearray()
+        self._validated = False
+        self._parts = []
+        self._pending = None
+        self._executor = None
+        self._completed = False
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        self._active = field_name == self.field_name and self.key is None
+        if not self._active:
+            return
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self._part_size = s3.part_size_for(int(self.request.META.get('CONTENT_LENGTH') or 0))
+        self.key = s3.build_upload_key(file_name)
+        self._upload_id = s3.start_multipart_upload(self.key)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='s3-upload')
+        raise StopFutureHandlers()
+
+    def _validate(self):
+        """MP4 시그니처 확인. 아니면 업로드를 취소하고 False"""
+        self._validated = True
+        if is_mp4(bytes(self._buffer[:MP4_HEAD_SIZE])):
+            return True
+        self.error = 'MP4 형식의 파일만 업로드 가능합니다.'
+        self.abort()
+        return False
+
+    def _wait_pending(self):
+        if self._pending is not None:
+            self._parts.append(self._pending.result())
+            self._pending = None
+
+    def _flush(self):
+        """채운 파트를 전송 (직전 파트 전송이 끝날 때까지 기다린 뒤 제출)"""
+        self._wait_pending()
+        body, self._buffer = bytes(self._buffer), bytearray()
+        part_number = len(self._parts) + 1
+        self._pending = self._executor.submit(s3.upload_part, self.key, self._upload_id, part_number, body)
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self._active:
+            return raw_data
+        self._buffer += raw_data
+        try:
+            if not self._validated and len(self._buffer) >= MP4_HEAD_SIZE and not self._validate():
+                raise StopUpload(connection_reset=True)
+            if len(self._buffer) >= self._part_size:
+                self._flush()
+        except StopUpload:
+            raise
+        except Exception:
+            self.abort()
+            raise
+        return None
+
+    def file_complete(self, file_size):
+        if not self._active:
+            return None
+        self._active = False
+        if not self._validated and not self._validate():
+            # None 을 반환하면 new_file 을 받지 못한 다음 핸들러에 file_complete 가 넘어가므로 중단
+            raise StopUpload()
+        try:
+            if self._buffer or not (self._parts or self._pending):
+                self._flush()
+            self._wait_pending()
+            size = s3.complete_multipart_upload(self.key, self._upload_id, self._parts)
+        except Exception:
+            self.abort()
+            raise
+        self._completed = True
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        logger.info(f"✅ S3 스트리밍 업로드 완료: {self.key} ({size:,} bytes, {len(self._parts)}개 파트)")
+        return S3UploadedFile(self.key, self.file_name, self.content_type, size)
+
+    def upload_complete(self):
+        # StopUpload 로 중단된 경우에도 호출된다
+        if not self._completed:
+            self.abort()
+
+    def abort(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._upload_id and not self._completed:
+            upload_id, self._upload_id = self._upload_id, None
+            try:
+                s3.abort_multipart_upload(self.key, upload_id)
+            except Exception as e:
+                logger.warning(f"⚠️ 멀티파트 업로드 취소 실패 ({self.key}): {e}")
+        self._buffer = bytearray()
@@ -12,7 +12,13 @@ urlpatterns = [
     # 내 영상
     path('myvideos', views.my_videos, name='myvideos'),
     path('upload', views.upload_video, name='upload'),
+    path('upload/initiate', views.upload_initiate, name='upload_initiate'),
+    path('upload/complete', views.upload_complete, name='upload_complete'),
+    path('upload/abort', views.upload_abort, name='upload_abort'),
     path('myvideos/download/<int:video_id>/', views.process_download, name='download'),
     path('myvideos/delete/<int:video_id>/', views.delete_video, name='delete'),
     path('play/user/<int:video_id>/', views.play_user_video, name='play_user_video'),
+
+    # 자막
+    path('subtitles/<int:subtitle_id>.json', views.subtitle_json, name='subtitle_json'),
 ]
\ No newline at end of file
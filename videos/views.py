@@ -1,10 +1,17 @@
 import json
+import logging
 import traceback
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.http import JsonResponse, HttpResponse
-from django.views.decorators.http import require_POST
-from . import services
-from .models import UserInfo, UserUploadVideo 
+from django.views.decorators.http import require_POST, require_GET
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from . import services, subtitles
+from .uploads import S3StreamingUploadHandler
+from .models import UserInfo, UserUploadVideo, SubtitleInfo
+
+logger = logging.getLogger(__name__)
 
 def home(request):
     user_id = request.session.get('user_id')
@@ -15,7 +22,7 @@ def home(request):
         req_team = request.GET.get('team', '').strip().upper()
         
         sort_option = request.GET.get('sort', 'latest')
-        context = services.get_home_context(user_id, search_query, req_team, sort_option)
+        context = services.get_home_context(request.user_context, search_query, req_team, sort_option)
         
         return render(request, 'home.html', context)
 
@@ -31,20 +38,34 @@ def get_video_list_api(request):
         search_query = request.GET.get('q', '')
         sort_option = request.GET.get('sort', 'latest')
 
+        # cursor 파라미터가 있으면 커서 기반 페이지네이션 (첫 페이지는 빈 값)
+        if 'cursor' in request.GET:
+            videos, has_next, next_cursor = services.get_video_list_cursor_logic(
+                section_type, request.GET.get('cursor'), target_code, search_query, sort_option
+            )
+            return JsonResponse({'videos': videos, 'has_next': has_next, 'next_cursor': next_cursor})
+
         videos, has_next = services.get_video_list_api_logic(
             section_type, page, target_code, search_query, sort_option
         )
 
         return JsonResponse({'videos': videos, 'has_next': has_next})
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+TRIAL_VIDEO_SESSION_KEY = 'trial_video_id'
+
 def play(request, video_id):
     user_id = request.session.get('user_id')
     if not user_id: return redirect('/')
     
     try:
-        context = services.get_play_context(user_id, video_id)
+        context = services.get_play_context(request.user_context, video_id, request.session.get(TRIAL_VIDEO_SESSION_KEY))
+        if context['is_trial']:
+            # 체험으로 연 영상은 새로고침/자막 조회를 허용
+            request.session[TRIAL_VIDEO_SESSION_KEY] = video_id
         return render(request, 'play.html', context)
 
     except PermissionError:
@@ -64,7 +85,7 @@ def my_videos(request):
     if not user_id: return redirect('/')
     
     try:
-        context = services.get_my_videos_context(user_id)
+        context = services.get_my_videos_context(request.user_context)
         return render(request, 'my_videos.html', context)
 
     except PermissionError:
@@ -80,39 +101,133 @@ def my_videos(request):
         print("="*50 + "\n")
         raise e
 
+@csrf_exempt
 def upload_video(request):
+    """
+    [POST] 폼 업로드
+    본문을 읽기 전에 Content-Length 만큼 저장공간을 예약한다. (본문은 Content-Length 에서 잘리므로 예약을 넘지 않음)
+    (본문을 읽는 CSRF 검사는 업로드 핸들러를 등록한 뒤 _upload_video 에서 수행)
+    """
     user_id = request.session.get('user_id')
 
     if request.method == 'POST' and user_id:
         try:
-            uploaded_file = request.FILES.get('video_file')
-            title = request.POST.get('video_title')
-            commentator = request.POST.get('commentator')
-            
-            if not uploaded_file:
-                return JsonResponse({'status': 'error', 'message': '파일이 없습니다.'}, status=400)
-
-            result = services.process_upload_video(
-                user_id=user_id, 
-                uploaded_file=uploaded_file, 
-                title=title, 
-                commentator_name=commentator
-            )
-
-            return JsonResponse({
-                'status': 'success', 
-                'message': '업로드 완료!',
-                'file_id': result.get('file_id')
-            })
-            
+            reservation = services.reserve_upload_logic(user_id, int(request.META.get('CONTENT_LENGTH') or 0))
         except ValueError as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
-        except Exception as e:
-            print(f"업로드 에러: {e}")
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+
+        handlers = []
+        if settings.USE_S3_UPLOADS:
+            # 영상 파일은 임시 파일 없이 받는 즉시 S3 멀티파트 업로드로 전송
+            handlers.append(S3StreamingUploadHandler(request, 'video_file'))
+        request.upload_handlers[:0] = handlers
+        try:
+            return _upload_video(request, user_id, reservation.pk, handlers)
+        finally:
+            # 정상 완료된 경우 예약은 이미 확정되어 있으므로 아무 일도 하지 않는다
+            services.release_upload_logic(reservation.pk)
+            for handler in handlers:
+                handler.abort()
             
     return JsonResponse({'status': 'error', 'message': '잘못된 접근입니다.'}, status=400)
 
+@csrf_protect
+def _upload_video(request, user_id, reservation_id, handlers):
+    try:
+        uploaded_file = request.FILES.get('video_file')
+        title = request.POST.get('video_title')
+        commentator = request.POST.get('commentator')
+
+        for handler in handlers:
+            if handler.error:
+                return JsonResponse({'status': 'error', 'message': handler.error}, status=400)
+        if not uploaded_file:
+            return JsonResponse({'status': 'error', 'message': '파일이 없습니다.'}, status=400)
+
+        result = services.process_upload_video(
+            user_id=user_id, 
+            uploaded_file=uploaded_file, 
+            title=title, 
+            commentator_name=commentator,
+            reservation_id=reservation_id
+        )
+
+        return JsonResponse({
+            'status': 'success', 
+            'message': '업로드 완료!',
+            'file_id': result.get('file_id')
+        })
+        
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception:
+        logger.exception(f"❌ 폼 업로드 에러 ({user_id})")
+        return JsonResponse({'status': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
+
+DIRECT_UPLOAD_SESSION_KEY = 'direct_upload'
+
+@require_POST
+def upload_initiate(request):
+    """[POST] S3 직접 업로드 시작 - 파트별 presigned URL 발급"""
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return JsonResponse({'status': 'error', 'message': '로그인이 필요합니다.'}, status=401)
+
+    try:
+        data = json.loads(request.body)
+        result = services.initiate_direct_upload_logic(user_id, data.get('filename'), int(data.get('size') or 0))
+        request.session[DIRECT_UPLOAD_SESSION_KEY] = {
+            'key': result['key'], 'upload_id': result['upload_id'], 'reservation_id': result.pop('reservation_id'),
+        }
+        return JsonResponse({'status': 'success', **result})
+
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception:
+        logger.exception(f"❌ 직접 업로드 시작 에러 ({user_id})")
+        return JsonResponse({'status': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
+
+@require_POST
+def upload_complete(request):
+    """[POST] S3 직접 업로드 완료 - 파일 등록 및 처리 작업 등록"""
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return JsonResponse({'status': 'error', 'message': '로그인이 필요합니다.'}, status=401)
+
+    pending = request.session.get(DIRECT_UPLOAD_SESSION_KEY)
+    try:
+        data = json.loads(request.body)
+        if not pending or pending.get('upload_id') != data.get('upload_id'):
+            return JsonResponse({'status': 'error', 'message': '업로드 정보가 만료되었습니다.'}, status=400)
+
+        result = services.complete_direct_upload_logic(
+            user_id, pending, data.get('parts'), data.get('video_title'), data.get('commentator')
+        )
+        del request.session[DIRECT_UPLOAD_SESSION_KEY]
+
+        return JsonResponse({
+            'status': 'success',
+            'message': '업로드 완료!',
+            'file_id': result.get('file_id')
+        })
+
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception:
+        logger.exception(f"❌ 직접 업로드 완료 에러 ({user_id})")
+        return JsonResponse({'status': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
+
+@require_POST
+def upload_abort(request):
+    """[POST] S3 직접 업로드 취소"""
+    pending = request.session.pop(DIRECT_UPLOAD_SESSION_KEY, None)
+    if pending:
+        try:
+            services.abort_direct_upload_logic(pending)
+        except Exception:
+            logger.exception(f"⚠️ 직접 업로드 취소 에러 ({pending.get('key')})")
+    return JsonResponse({'status': 'success'})
+
 @require_POST
 def process_download(request, video_id):
     user_id = request.session.get('user_id')
@@ -154,9 +269,40 @@ def play_user_video(request, video_id):
     if not user_id: return redirect('/')
     
     try:
-        context = services.get_user_play_context(user_id, video_id)
+        context = services.get_user_play_context(request.user_context, video_id)
         return render(request, 'play.html', context)
 
     except UserInfo.DoesNotExist:
         request.session.flush()
-        return redirect('/')
\ No newline at end of file
+        return redirect('/')
+
+@require_GET
+def subtitle_json(request, subtitle_id):
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return JsonResponse({'status': 'error', 'message': '로그인이 필요합니다.'}, status=401)
+
+    try:
+        blob, etag = services.get_subtitle_logic(
+            request.user_context, subtitle_id, request.session.get(TRIAL_VIDEO_SESSION_KEY)
+        )
+    except SubtitleInfo.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': '자막을 찾을 수 없습니다.'}, status=404)
+    except PermissionError:
+        return JsonResponse({'status': 'error', 'message': '무료 체험이 종료되었습니다.'}, status=403)
+
+    # 압축 포맷은 브라우저가 gzip을 받으면 압축 해제 없이 그대로 전송
+    # 본문이 다르므로 인코딩마다 ETag 를 구분한다 (GZipMiddleware 와 같은 방식)
+    use_gzip = subtitles.is_compressed(blob) and 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = f'"{etag}-gz"' if use_gzip else f'"{etag}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if use_gzip:
+            response = HttpResponse(blob, content_type='application/json; charset=utf-8')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(subtitles.to_json_bytes(blob), content_type='application/json; charset=utf-8')
+        response['ETag'] = etag
+    response['Vary'] = 'Accept-Encoding, Cookie'
+    patch_cache_control(response, private=True, no_cache=True)
+    return response